@@ -1,30 +1,60 @@
 """API routes for stock data operations."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Union
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from app.core.batch_writer import WriteQueueFullError
 from app.models.stock_data import (
     StockDataPoint,
     StockDataBatch,
+    ColumnarStockBatch,
+    StockDataQuery,
     TimeRangeQuery,
-    StockDataResponse
+    StockDataResponse,
+    CandleResponse,
+    IndicatorQuery,
+    IndicatorResponse,
+    MarketSnapshotResponse,
+    MultiSymbolQuery,
+    MultiSymbolResponse,
+    SymbolMetadata,
+    OHLCVBar,
+    INTERVAL_SECONDS
 )
+from app.core.config import settings
+from app.models.ticks import PRECISION_NS, validate_tick_columns
+from app.services.arrow_export import encode_table, negotiate_table_media_type
+from app.services.ingest import LineTooLongError, iter_line_chunks, parse_tick_lines
+from app.services.pagination import InvalidCursorError
+from app.services.query_cost import QueryCostError
 from app.services.stock_service import stock_service
+from app.services.tick_hub import SUBSCRIPTION_POLICIES, Subscription, ticks_to_dicts
 
 router = APIRouter(prefix="/api/v1/stocks", tags=["stocks"])
 
+# "columnar" returns parallel t (epoch ms) / p / v arrays instead of data_points
+RESPONSE_FORMATS = ("rows", "columnar")
+
 
 @router.post("/data", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def store_stock_data(data_point: StockDataPoint) -> dict:
     """Store a single stock data point."""
     try:
-        stock_service.store_data_point(data_point)
+        await stock_service.store_data_point_async(data_point)
         return {
             "message": "Data point stored successfully",
             "symbol": data_point.symbol,
             "timestamp": data_point.timestamp.isoformat()
         }
+    except WriteQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to store data point: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -36,7 +66,7 @@ async def store_stock_data(data_point: StockDataPoint) -> dict:
 async def store_stock_data_batch(data_batch: StockDataBatch) -> dict:
     """Store multiple stock data points."""
     try:
-        stock_service.store_data_batch(data_batch.data_points)
+        await stock_service.store_data_batch_async(data_batch.data_points)
         return {
             "message": "Data batch stored successfully",
             "count": len(data_batch.data_points),
@@ -49,23 +79,382 @@ async def store_stock_data_batch(data_batch: StockDataBatch) -> dict:
         )
 
 
+@router.post("/data/columns", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def store_stock_data_columns(data_batch: ColumnarStockBatch) -> dict:
+    """Store a batch of stock data points sent as parallel arrays."""
+    try:
+        columns, rejected = validate_tick_columns(
+            data_batch.symbols,
+            data_batch.prices,
+            data_batch.volumes,
+            data_batch.timestamps,
+            data_batch.precision
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    if len(rejected):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid data points at rows: {rejected[:20].tolist()}"
+        )
+
+    try:
+        await stock_service.store_tick_columns_async(columns)
+        return {
+            "message": "Data batch stored successfully",
+            "count": len(columns),
+            "symbols": list(set(columns.symbols.tolist()))
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to store data batch: {str(e)}"
+        )
+
+
+@router.post("/data/stream", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def store_stock_data_stream(request: Request, precision: str = "ns") -> dict:
+    """Store newline-delimited JSON data points read incrementally from the request body."""
+    if precision not in PRECISION_NS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Precision must be one of: {list(PRECISION_NS)}"
+        )
+
+    chunks = []
+    accepted = rejected = 0
+    try:
+        async for lines in iter_line_chunks(
+            request.stream(),
+            chunk_size=settings.ingest_chunk_size,
+            max_line_bytes=settings.ingest_max_line_bytes
+        ):
+            columns, chunk_rejected = parse_tick_lines(lines, precision)
+            await stock_service.store_tick_columns_async(columns)
+            chunks.append({"accepted": len(columns), "rejected": chunk_rejected})
+            accepted += len(columns)
+            rejected += chunk_rejected
+    except LineTooLongError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Failed to store data stream after {accepted} data points: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to store data stream after {accepted} data points: {str(e)}"
+        )
+
+    return {
+        "message": "Data stream stored successfully",
+        "accepted": accepted,
+        "rejected": rejected,
+        "chunks": chunks
+    }
+
+
+@router.websocket("/ws/ingest")
+async def ingest_stock_data_ws(websocket: WebSocket, precision: str = "ns") -> None:
+    """Store newline-delimited JSON data points pushed over a persistent WebSocket.
+
+    Received ticks are written every ``ingest_chunk_size`` lines or
+    ``ingest_ack_interval_ms``, whichever comes first, and each write is
+    acknowledged with its accepted and rejected counts. Nothing more is read
+    while a write is pending; a failed write is reported and closes the
+    socket with 1011.
+    """
+    if precision not in PRECISION_NS:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    ack_interval = settings.ingest_ack_interval_ms / 1000
+    deadline = loop.time() + ack_interval
+    lines: List[bytes] = []
+    accepted = rejected = 0
+    connected = True
+
+    while connected:
+        try:
+            message = await asyncio.wait_for(websocket.receive(), timeout=max(deadline - loop.time(), 0))
+            if message["type"] == "websocket.disconnect":
+                connected = False
+            else:
+                data = message.get("bytes") or (message.get("text") or "").encode()
+                lines.extend(line for line in data.split(b"\n") if line.strip())
+        except asyncio.TimeoutError:
+            pass
+
+        if len(lines) < settings.ingest_chunk_size and loop.time() < deadline and connected:
+            continue
+
+        deadline = loop.time() + ack_interval
+        if not lines:
+            continue
+
+        try:
+            columns, chunk_rejected = parse_tick_lines(lines, precision)
+            await stock_service.store_tick_columns_async(columns)
+        except Exception as e:
+            if connected:
+                await _close_with_error(
+                    websocket, f"Failed to store data points: {str(e)}", status.WS_1011_INTERNAL_ERROR
+                )
+            return
+
+        lines = []
+        accepted += len(columns)
+        rejected += chunk_rejected
+        if connected:
+            await websocket.send_json({
+                "accepted": len(columns),
+                "rejected": chunk_rejected,
+                "total_accepted": accepted,
+                "total_rejected": rejected
+            })
+
+
+async def _close_with_error(websocket: WebSocket, detail: str, code: int) -> None:
+    """Report an error and close the socket, tolerating a client that has already gone."""
+    try:
+        await websocket.send_json({"error": detail})
+        await websocket.close(code=code)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+
+@router.get("/stream/ticks")
+async def stream_live_ticks(request: Request, symbols: Optional[str] = None, policy: str = "drop_oldest") -> StreamingResponse:
+    """Push live ticks for comma-separated symbols (all when omitted) as server-sent events."""
+    subscription = _subscribe(symbols, policy)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Policy must be one of: {list(SUBSCRIPTION_POLICIES)}"
+        )
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            while not await request.is_disconnected():
+                ticks = await subscription.get(timeout=settings.sse_keepalive_seconds)
+                if not ticks:
+                    yield ": keepalive\n\n"
+                    continue
+                for tick in ticks_to_dicts(ticks):
+                    yield f"data: {json.dumps(tick)}\n\n"
+        finally:
+            stock_service.tick_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws/ticks")
+async def subscribe_live_ticks_ws(websocket: WebSocket, symbols: Optional[str] = None, policy: str = "drop_oldest") -> None:
+    """Push live ticks for comma-separated symbols (all when omitted) over a WebSocket.
+
+    Each message is a JSON list of the ticks that arrived since the last one.
+    """
+    subscription = _subscribe(symbols, policy)
+    if subscription is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    receiver = asyncio.create_task(websocket.receive())
+    getter = asyncio.create_task(subscription.get())
+    try:
+        while True:
+            await asyncio.wait([getter, receiver], return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                ticks = getter.result()
+                if ticks:
+                    await websocket.send_json(ticks_to_dicts(ticks))
+                getter = asyncio.create_task(subscription.get())
+            if receiver.done():
+                # Client messages are ignored; only a disconnect ends the subscription
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                receiver = asyncio.create_task(websocket.receive())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        getter.cancel()
+        receiver.cancel()
+        stock_service.tick_hub.unsubscribe(subscription)
+
+
+def _subscribe(symbols: Optional[str], policy: str) -> Optional[Subscription]:
+    """Subscribe to the live ticks of comma-separated symbols, or None for an unknown policy."""
+    if policy not in SUBSCRIPTION_POLICIES:
+        return None
+
+    symbol_list = [symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()] if symbols else None
+    return stock_service.tick_hub.subscribe(symbol_list, settings.subscriber_queue_size, policy)
+
+
 @router.post("/query", response_model=StockDataResponse)
-async def query_stock_data(query: TimeRangeQuery) -> StockDataResponse:
-    """Query stock data within a specified time range."""
+async def query_stock_data(
+    query: StockDataQuery,
+    response_format: str = Query("rows", alias="format", description=f"One of {list(RESPONSE_FORMATS)}"),
+    accept: Optional[str] = Header(None)
+) -> Union[StockDataResponse, Response]:
+    """Query stock data within a specified time range.
+
+    Clients accepting an Arrow IPC stream or Parquet get a typed table instead of JSON.
+    """
+    if response_format not in RESPONSE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Format must be one of: {list(RESPONSE_FORMATS)}"
+        )
+
+    media_type = negotiate_table_media_type(accept)
+    try:
+        if media_type is not None:
+            table = await stock_service.query_data_table_async(query)
+            return Response(content=encode_table(table, media_type), media_type=media_type)
+        if response_format == "columnar":
+            payload = await stock_service.query_data_columns_async(query)
+            return Response(
+                content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                media_type="application/json"
+            )
+        return await stock_service.query_data_by_time_range_async(query)
+    except (QueryCostError, InvalidCursorError) as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to query data: {str(e)}"
+        )
+
+
+@router.post("/query/stream")
+async def stream_stock_data(query: TimeRangeQuery) -> StreamingResponse:
+    """Stream data points within a time range as NDJSON while they are decoded from InfluxDB.
+
+    Rows are not buffered beyond one chunk, so memory stays bounded for any
+    range. An interval replaced by the cost guard and the start of the next
+    page are reported in response headers. A failure after the first chunk
+    can no longer change the status, so it ends the body with an
+    ``{"error": ...}`` line instead.
+    """
     try:
-        return stock_service.query_data_by_time_range(query)
+        stream = await stock_service.stream_data_by_time_range_async(query)
+    except QueryCostError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    chunks = _ndjson_chunks(stream.points, settings.query_stream_chunk_rows)
+    try:
+        # Run the query before committing to a 200 so failures still get an error status
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = b""
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to query data: {str(e)}"
         )
 
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            yield orjson.dumps({"error": f"Failed to query data: {str(e)}"}) + b"\n"
+
+    headers = {"X-Interval": stream.query.interval}
+    if stream.requested_interval != stream.query.interval:
+        headers["X-Requested-Interval"] = stream.requested_interval
+    if stream.next_start_time is not None:
+        headers["X-Next-Start-Time"] = stream.next_start_time.isoformat()
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
+
+
+async def _ndjson_chunks(points: AsyncIterator[dict], chunk_rows: int) -> AsyncIterator[bytes]:
+    """Encode data points as NDJSON, yielding up to ``chunk_rows`` lines at a time."""
+    lines = []
+    async for point in points:
+        lines.append(orjson.dumps(point))
+        if len(lines) >= chunk_rows:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+@router.post("/query/multi", response_model=MultiSymbolResponse)
+async def query_multi_symbol_data(query: MultiSymbolQuery) -> MultiSymbolResponse:
+    """Query several stock symbols within a specified time range."""
+    try:
+        return await stock_service.query_multi_symbol_async(query)
+    except QueryCostError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to query data: {str(e)}"
+        )
+
+
+@router.post("/candles", response_model=CandleResponse)
+async def query_stock_candles(
+    query: TimeRangeQuery,
+    accept: Optional[str] = Header(None)
+) -> Union[CandleResponse, Response]:
+    """Query OHLC candles with volume and VWAP within a specified time range."""
+    media_type = negotiate_table_media_type(accept)
+    try:
+        if media_type is not None:
+            table = await stock_service.query_candles_table_async(query)
+            return Response(content=encode_table(table, media_type), media_type=media_type)
+        return await stock_service.query_candles_async(query)
+    except QueryCostError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to query candles: {str(e)}"
+        )
+
+
+@router.post("/indicators", response_model=IndicatorResponse)
+async def query_stock_indicators(query: IndicatorQuery) -> IndicatorResponse:
+    """Compute technical indicators within a specified time range."""
+    try:
+        return await stock_service.query_indicators_async(query)
+    except QueryCostError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute indicators: {str(e)}"
+        )
+
+
+def _validate_symbol(symbol: str) -> str:
+    """Validate a path symbol like ``TimeRangeQuery`` does and upper-case it."""
+    if not symbol.isalpha():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Symbol must contain only letters"
+        )
+    return symbol.upper()
+
 
 @router.get("/{symbol}/latest", response_model=StockDataResponse)
 async def get_latest_stock_data(symbol: str, limit: int = 100) -> StockDataResponse:
     """Get the latest stock data for a specific symbol."""
+    symbol = _validate_symbol(symbol)
     try:
-        return stock_service.query_latest_data(symbol, limit)
+        return await stock_service.query_latest_data_async(symbol, limit)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,11 +462,64 @@ async def get_latest_stock_data(symbol: str, limit: int = 100) -> StockDataRespo
         )
 
 
+@router.get("/{symbol}/bar", response_model=OHLCVBar)
+async def get_current_bar(symbol: str, interval: str = "1m") -> OHLCVBar:
+    """Get the live OHLCV bar of the current window for a specific symbol."""
+    symbol = _validate_symbol(symbol)
+    if interval not in INTERVAL_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Interval must be one of: {list(INTERVAL_SECONDS)}"
+        )
+
+    bar = stock_service.get_current_bar(symbol, interval)
+    if bar is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No ticks for {symbol} in the current {interval} window"
+        )
+    return bar
+
+
+@router.get("/{symbol}/metadata", response_model=SymbolMetadata)
+async def get_symbol_metadata(symbol: str) -> SymbolMetadata:
+    """Get registry metadata for a specific symbol."""
+    symbol = _validate_symbol(symbol)
+    try:
+        metadata = await stock_service.get_symbol_metadata_async(symbol)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get symbol metadata: {str(e)}"
+        )
+
+    if metadata is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown symbol: {symbol}"
+        )
+    return metadata
+
+
+@router.get("/snapshot", response_model=MarketSnapshotResponse)
+async def get_market_snapshot(
+    lookback_seconds: int = Query(default=86400, gt=0, le=settings.latest_lookback_days * 86400)
+) -> MarketSnapshotResponse:
+    """Get the latest price, volume and change over a lookback for every symbol."""
+    try:
+        return await stock_service.get_market_snapshot_async(lookback_seconds)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get market snapshot: {str(e)}"
+        )
+
+
 @router.get("/symbols", response_model=List[str])
 async def get_available_symbols() -> List[str]:
     """Get list of available stock symbols."""
     try:
-        return stock_service.get_available_symbols()
+        return await stock_service.get_available_symbols_async()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -89,12 +531,23 @@ async def get_available_symbols() -> List[str]:
 async def health_check() -> dict:
     """Health check endpoint for stock service."""
     try:
-        # Test database connection
-        symbols = stock_service.get_available_symbols()
+        # The symbol list is served from memory, so ping the database separately
+        if not await stock_service.is_database_connected_async():
+            return {
+                "status": "unhealthy",
+                "database_connected": False,
+                "error": "InfluxDB is not reachable",
+                "failed_write_batches": stock_service.batch_writer.failed_batches,
+                "failed_write_items": stock_service.batch_writer.failed_items
+            }
+
+        symbols = await stock_service.get_available_symbols_async()
         return {
             "status": "healthy",
             "database_connected": True,
-            "available_symbols_count": len(symbols)
+            "available_symbols_count": len(symbols),
+            "failed_write_batches": stock_service.batch_writer.failed_batches,
+            "failed_write_items": stock_service.batch_writer.failed_items
         }
     except Exception as e:
         return {
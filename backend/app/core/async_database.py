@@ -0,0 +1,121 @@
+"""Asyncio connection and client management for InfluxDB."""
+
+import asyncio
+from typing import AsyncIterator, Optional
+from influxdb_client import Point
+from influxdb_client.client.flux_table import FluxRecord
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+
+from app.core.config import settings
+
+
+class AsyncInfluxDBManager:
+    """Manager class for non-blocking InfluxDB operations.
+
+    The underlying client binds to the running event loop, so it is created
+    lazily on first use rather than at import time.
+    """
+
+    def __init__(self):
+        """Initialize the manager without connecting."""
+        self.client: Optional[InfluxDBClientAsync] = None
+        self.write_api = None
+        self.query_api = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _connect(self) -> None:
+        """Establish connection to InfluxDB if not already connected."""
+        if self.client is not None:
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self.client is not None:
+                return
+            try:
+                self.client = InfluxDBClientAsync(
+                    url=settings.influxdb_url,
+                    token=settings.influxdb_token,
+                    org=settings.influxdb_org
+                )
+                self.write_api = self.client.write_api()
+                self.query_api = self.client.query_api()
+            except Exception as e:
+                raise ConnectionError(f"Failed to connect to InfluxDB: {e}")
+
+    async def write_point(self, point: Point) -> None:
+        """Write a single data point to InfluxDB."""
+        await self._connect()
+
+        try:
+            await self.write_api.write(
+                bucket=settings.influxdb_bucket,
+                record=point
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to write point to InfluxDB: {e}")
+
+    async def write_points(self, points: list[Point]) -> None:
+        """Write multiple data points to InfluxDB."""
+        await self._connect()
+
+        try:
+            await self.write_api.write(
+                bucket=settings.influxdb_bucket,
+                record=points
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to write points to InfluxDB: {e}")
+
+    async def write_records(self, records: str) -> None:
+        """Write pre-encoded line protocol records to InfluxDB."""
+        await self._connect()
+
+        try:
+            await self.write_api.write(
+                bucket=settings.influxdb_bucket,
+                record=records
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to write records to InfluxDB: {e}")
+
+    async def query(self, query: str) -> list:
+        """Execute a Flux query and return results."""
+        await self._connect()
+
+        try:
+            result = await self.query_api.query(query=query, org=settings.influxdb_org)
+            return list(result)
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute query: {e}")
+
+    async def query_stream(self, query: str) -> AsyncIterator[FluxRecord]:
+        """Execute a Flux query and yield records as they are parsed."""
+        await self._connect()
+
+        try:
+            records = await self.query_api.query_stream(query=query, org=settings.influxdb_org)
+            async for record in records:
+                yield record
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute query: {e}")
+
+    async def ping(self) -> bool:
+        """Check that the InfluxDB server is reachable."""
+        try:
+            await self._connect()
+            return await self.client.ping()
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        """Close the InfluxDB connection."""
+        if self.client:
+            await self.client.close()
+            self.client = None
+
+
+# Global async database manager instance
+async_db_manager = AsyncInfluxDBManager()
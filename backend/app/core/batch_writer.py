@@ -0,0 +1,232 @@
+"""Background micro-batching writer for InfluxDB."""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WriteQueueFullError(RuntimeError):
+    """Raised when the write queue stays full for longer than the enqueue timeout."""
+
+
+_FLUSH = object()
+_STOP = object()
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    """Resolve a producer's wait for queue space, unless it already gave up."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class BatchWriter:
+    """Accumulate items in a bounded queue and write them in batches.
+
+    A daemon thread drains the queue and hands a batch to ``write_fn`` once
+    ``batch_size`` items are pending or the oldest pending item is older than
+    ``flush_interval`` seconds. When the queue is full, ``submit`` blocks for
+    up to ``enqueue_timeout`` seconds and then raises ``WriteQueueFullError``,
+    so a slow database pushes back on producers instead of growing memory.
+
+    A failed write is retried up to ``max_retries`` times with exponential
+    backoff starting at ``retry_backoff`` seconds; batches that still fail
+    are dropped and counted in ``failed_batches`` and ``failed_items``.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[List[Any]], None],
+        batch_size: int = 5000,
+        flush_interval: float = 0.1,
+        max_queue_size: int = 100_000,
+        enqueue_timeout: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5
+    ):
+        """Initialize the writer; the worker thread starts on first submit."""
+        self.write_fn = write_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.failed_batches = 0
+        self.failed_items = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._space_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+        self._waiters_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Approximate number of items waiting to be written."""
+        return self._queue.qsize()
+
+    def submit(self, item: Any) -> None:
+        """Queue a single item for writing."""
+        if self._closed:
+            raise RuntimeError("Batch writer is closed")
+        self._ensure_started()
+
+        try:
+            self._queue.put(item, timeout=self.enqueue_timeout)
+        except queue.Full:
+            raise WriteQueueFullError(
+                f"Write queue is full ({self._queue.maxsize} pending items)"
+            )
+
+    async def submit_async(self, item: Any) -> None:
+        """Queue a single item without blocking the event loop.
+
+        While the queue is full the coroutine waits for the worker to signal
+        that it has taken an item, rather than polling.
+        """
+        if self._closed:
+            raise RuntimeError("Batch writer is closed")
+        self._ensure_started()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.enqueue_timeout
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise WriteQueueFullError(
+                    f"Write queue is full ({self._queue.maxsize} pending items)"
+                )
+
+            waiter = loop.create_future()
+            with self._waiters_lock:
+                self._space_waiters.append((loop, waiter))
+            # The worker may have made room before the waiter was registered
+            if self._queue.full():
+                try:
+                    await asyncio.wait_for(waiter, remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far and wait for it to complete."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending items and stop the worker thread, giving up after ``timeout`` seconds."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is None or not thread.is_alive():
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Write queue still full on close, abandoning %d pending items", self.pending)
+            return
+
+        thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if thread.is_alive():
+            logger.warning("Batch writer did not stop within %.1fs, abandoning %d pending items", timeout, self.pending)
+
+    def _ensure_started(self) -> None:
+        """Start the worker thread if it is not running yet."""
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="influxdb-batch-writer",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Worker loop: collect items into batches and flush by size or age."""
+        batch: List[Any] = []
+        deadline = 0.0
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(batch)
+                batch = []
+                continue
+
+            if self._space_waiters:
+                self._wake_space_waiters()
+
+            if item is _STOP:
+                self._write(batch)
+                return
+
+            if isinstance(item, tuple) and item and item[0] is _FLUSH:
+                self._write(batch)
+                batch = []
+                item[1].set()
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+
+    def _wake_space_waiters(self) -> None:
+        """Tell producers waiting in ``submit_async`` that the queue has room."""
+        with self._waiters_lock:
+            waiters, self._space_waiters = self._space_waiters, []
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The producer's event loop has been closed
+                pass
+
+    def _write(self, batch: List[Any]) -> None:
+        """Hand a batch to the write function, retrying with backoff and counting batches that fail."""
+        if not batch:
+            return
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.write_fn(batch)
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    self.failed_batches += 1
+                    self.failed_items += len(batch)
+                    logger.exception("Dropped batch of %d items after %d attempts", len(batch), attempt + 1)
+                    return
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(
+                    "Failed to write batch of %d items, retrying in %.2fs", len(batch), delay, exc_info=True
+                )
+                # Blocking the worker lets the queue fill, pushing back on producers
+                time.sleep(delay)
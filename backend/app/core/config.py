@@ -18,6 +18,65 @@ class Settings(BaseSettings):
     environment: str = Field(default="development", env="ENVIRONMENT")
     debug: bool = Field(default=False, env="DEBUG")
 
+    # Write Batching Configuration
+    write_batch_size: int = Field(default=5000, env="WRITE_BATCH_SIZE")
+    write_flush_interval_ms: int = Field(default=100, env="WRITE_FLUSH_INTERVAL_MS")
+    write_queue_size: int = Field(default=100_000, env="WRITE_QUEUE_SIZE")
+    write_enqueue_timeout_ms: int = Field(default=1000, env="WRITE_ENQUEUE_TIMEOUT_MS")
+    write_max_retries: int = Field(default=3, env="WRITE_MAX_RETRIES")
+    write_retry_backoff_ms: int = Field(default=500, env="WRITE_RETRY_BACKOFF_MS")
+
+    # Query Cache Configuration
+    query_cache_ttl_seconds: float = Field(default=30.0, env="QUERY_CACHE_TTL_SECONDS")
+    query_cache_max_bytes: int = Field(default=64 * 1024 * 1024, env="QUERY_CACHE_MAX_BYTES")
+
+    # Incremental Window Cache Configuration
+    window_cache_max_bytes: int = Field(default=64 * 1024 * 1024, env="WINDOW_CACHE_MAX_BYTES")
+    window_cache_settle_seconds: float = Field(default=10.0, env="WINDOW_CACHE_SETTLE_SECONDS")
+    window_cache_max_age_seconds: float = Field(default=900.0, env="WINDOW_CACHE_MAX_AGE_SECONDS")
+    window_cache_retention_seconds: float = Field(default=7 * 86400, env="WINDOW_CACHE_RETENTION_SECONDS")
+
+    # Rollup Configuration
+    rollups_enabled: bool = Field(default=False, env="ROLLUPS_ENABLED")
+    rollup_intervals: list[str] = Field(default=["1m", "1h", "1d"], env="ROLLUP_INTERVALS")
+    rollup_settle_seconds: float = Field(default=60.0, env="ROLLUP_SETTLE_SECONDS")
+    rollup_backfill_days: int = Field(default=30, env="ROLLUP_BACKFILL_DAYS")
+    # How often windows touched by late writes are re-aggregated
+    rollup_refresh_seconds: float = Field(default=60.0, env="ROLLUP_REFRESH_SECONDS")
+
+    # Latest Tick Buffer Configuration
+    latest_buffer_capacity: int = Field(default=1000, env="LATEST_BUFFER_CAPACITY")
+    latest_buffer_resync_seconds: float = Field(default=300.0, env="LATEST_BUFFER_RESYNC_SECONDS")
+    latest_lookback_days: int = Field(default=30, env="LATEST_LOOKBACK_DAYS")
+
+    # Symbol Registry Configuration
+    symbol_registry_resync_seconds: float = Field(default=300.0, env="SYMBOL_REGISTRY_RESYNC_SECONDS")
+
+    # Streaming Ingest Configuration
+    ingest_chunk_size: int = Field(default=5000, env="INGEST_CHUNK_SIZE")
+    ingest_max_line_bytes: int = Field(default=64 * 1024, env="INGEST_MAX_LINE_BYTES")
+    ingest_ack_interval_ms: int = Field(default=1000, env="INGEST_ACK_INTERVAL_MS")
+
+    # Market Snapshot Configuration
+    snapshot_resync_seconds: float = Field(default=60.0, env="SNAPSHOT_RESYNC_SECONDS")
+
+    # Query Cost Guard Configuration
+    # Queries estimated above query_max_rows are rejected, coarsened to a wider interval or paginated
+    query_max_rows: int = Field(default=100_000, env="QUERY_MAX_ROWS")
+    query_cost_policy: str = Field(default="coarsen", env="QUERY_COST_POLICY")
+
+    # Query Streaming Configuration
+    # Rows per chunk of a streamed NDJSON query response
+    query_stream_chunk_rows: int = Field(default=1000, env="QUERY_STREAM_CHUNK_ROWS")
+
+    # Live Bar Configuration
+    # Bars only reflect ticks ingested by this process; disable when several workers share ingest
+    live_bars_enabled: bool = Field(default=True, env="LIVE_BARS_ENABLED")
+
+    # Live Subscription Configuration
+    subscriber_queue_size: int = Field(default=1000, env="SUBSCRIBER_QUEUE_SIZE")
+    sse_keepalive_seconds: float = Field(default=15.0, env="SSE_KEEPALIVE_SECONDS")
+
     # API Configuration
     api_title: str = "Stock Trading Data API"
     api_version: str = "1.0.0"
@@ -1,7 +1,8 @@
 """Database connection and client management for InfluxDB."""
 
-from typing import Optional
+from typing import Iterator, Optional
 from influxdb_client import InfluxDBClient, Point
+from influxdb_client.client.flux_table import FluxRecord
 from influxdb_client.client.write_api import SYNCHRONOUS
 from influxdb_client.client.query_api import QueryApi
 
@@ -57,6 +58,19 @@ class InfluxDBManager:
         except Exception as e:
             raise RuntimeError(f"Failed to write points to InfluxDB: {e}")
 
+    def write_records(self, records: str) -> None:
+        """Write pre-encoded line protocol records to InfluxDB."""
+        if not self.write_api:
+            raise RuntimeError("Write API not initialized")
+
+        try:
+            self.write_api.write(
+                bucket=settings.influxdb_bucket,
+                record=records
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to write records to InfluxDB: {e}")
+
     def query(self, query: str) -> list:
         """Execute a Flux query and return results."""
         if not self.query_api:
@@ -68,6 +82,26 @@ class InfluxDBManager:
         except Exception as e:
             raise RuntimeError(f"Failed to execute query: {e}")
 
+    def query_stream(self, query: str) -> Iterator[FluxRecord]:
+        """Execute a Flux query and yield records as they are parsed."""
+        if not self.query_api:
+            raise RuntimeError("Query API not initialized")
+
+        try:
+            yield from self.query_api.query_stream(query=query, org=settings.influxdb_org)
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute query: {e}")
+
+    def ping(self) -> bool:
+        """Check that the InfluxDB server is reachable."""
+        if not self.client:
+            return False
+
+        try:
+            return self.client.ping()
+        except Exception:
+            return False
+
     def close(self) -> None:
         """Close the InfluxDB connection."""
         if self.client:
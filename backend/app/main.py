@@ -1,5 +1,9 @@
 """Main FastAPI application entry point."""
 
+import asyncio
+import logging
+import threading
+import time
 from datetime import datetime
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,6 +11,30 @@ from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.api.stock_routes import router as stock_router
+from app.core.async_database import async_db_manager
+from app.core.database import db_manager
+from app.services.stock_service import stock_service
+
+logger = logging.getLogger(__name__)
+
+
+def _maintain_rollups() -> None:
+    """Create rollup buckets and tasks, then keep re-aggregating windows touched by late writes.
+
+    Routing stays on raw data if setup fails.
+    """
+    try:
+        stock_service.rollups.ensure_rollups(settings.rollup_backfill_days)
+    except Exception:
+        logger.exception("Failed to set up rollups; queries will read raw data")
+        return
+
+    while True:
+        time.sleep(settings.rollup_refresh_seconds)
+        try:
+            stock_service.rollups.refresh_dirty()
+        except Exception:
+            logger.exception("Failed to re-aggregate rollup windows; retrying on the next pass")
 
 
 def create_app() -> FastAPI:
@@ -31,6 +59,20 @@ def create_app() -> FastAPI:
     # Include routers
     app.include_router(stock_router)
 
+    @app.on_event("startup")
+    def startup() -> None:
+        """Set up and maintain rollup buckets and tasks in the background when downsampling is enabled."""
+        if settings.rollups_enabled:
+            threading.Thread(target=_maintain_rollups, name="rollup-maintenance", daemon=True).start()
+
+    @app.on_event("shutdown")
+    async def shutdown() -> None:
+        """Flush buffered writes and close the database connections."""
+        # Flushing blocks on the writer thread, which must not stall the event loop
+        await asyncio.get_running_loop().run_in_executor(None, stock_service.close)
+        db_manager.close()
+        await async_db_manager.close()
+
     return app
 
 
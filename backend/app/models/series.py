@@ -0,0 +1,280 @@
+"""Columnar containers for stock time-series query results."""
+
+import calendar
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+class StockSeries:
+    """Price and volume series held as typed NumPy columns.
+
+    ``timestamps`` are int64 epoch nanoseconds (UTC), ``prices`` are float64
+    and ``volumes`` are int64. All three arrays have the same length and are
+    ordered by timestamp.
+    """
+
+    __slots__ = ("timestamps", "prices", "volumes")
+
+    def __init__(self, timestamps: np.ndarray, prices: np.ndarray, volumes: np.ndarray):
+        """Initialize the series from column arrays."""
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "StockSeries":
+        """Create a series with no rows."""
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        """Number of rows in the series."""
+        return len(self.timestamps)
+
+    def __getitem__(self, index: slice) -> "StockSeries":
+        """Return the rows selected by a slice."""
+        return StockSeries(self.timestamps[index], self.prices[index], self.volumes[index])
+
+    def between(self, after_ns: int, until_ns: int) -> "StockSeries":
+        """Return the rows with ``after_ns < timestamp <= until_ns``."""
+        lo = np.searchsorted(self.timestamps, after_ns, side="right")
+        hi = np.searchsorted(self.timestamps, until_ns, side="right")
+        return self[lo:hi]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        return self.timestamps.nbytes + self.prices.nbytes + self.volumes.nbytes
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """Return the compact columnar representation: epoch milliseconds, prices and volumes."""
+        return {"t": self.timestamps // 1_000_000, "p": self.prices, "v": self.volumes}
+
+    def to_data_points(self) -> List[Dict[str, Any]]:
+        """Serialize the series into the API's list-of-dicts representation."""
+        timestamps = format_timestamps(self.timestamps)
+        return [
+            {"timestamp": timestamp, "price": price, "volume": volume}
+            for timestamp, price, volume in zip(
+                timestamps, self.prices.tolist(), self.volumes.tolist()
+            )
+        ]
+
+
+class StockSeriesBuilder:
+    """Incrementally decode pivoted query records into a ``StockSeries``.
+
+    Records are buffered in small Python lists and converted to NumPy
+    arrays every ``chunk_size`` rows, so the per-record objects are released
+    as the result stream is consumed.
+    """
+
+    def __init__(self, chunk_size: int = 65_536):
+        """Initialize an empty builder."""
+        self.chunk_size = chunk_size
+        self._times: List[Any] = []
+        self._prices: List[float] = []
+        self._volumes: List[int] = []
+        self._chunks: List[StockSeries] = []
+
+    def add_record(self, record: Any) -> None:
+        """Append one pivoted record with ``price`` and ``volume`` columns."""
+        values = record.values
+        self._times.append(record.get_time())
+        self._prices.append(values.get("price") or 0)
+        self._volumes.append(values.get("volume") or 0)
+
+        if len(self._times) >= self.chunk_size:
+            self._seal_chunk()
+
+    def build(self) -> StockSeries:
+        """Return the decoded series."""
+        self._seal_chunk()
+        if not self._chunks:
+            return StockSeries.empty()
+        if len(self._chunks) == 1:
+            return self._chunks[0]
+        return concat_series(self._chunks)
+
+    def _seal_chunk(self) -> None:
+        """Convert the buffered records into column arrays."""
+        if not self._times:
+            return
+
+        self._chunks.append(StockSeries(
+            to_epoch_ns(self._times),
+            np.array(self._prices, dtype=np.float64),
+            np.array(self._volumes, dtype=np.int64)
+        ))
+        self._times, self._prices, self._volumes = [], [], []
+
+
+class CandleSeries:
+    """OHLCV candles with VWAP held as typed NumPy columns.
+
+    ``timestamps`` are int64 epoch nanoseconds (UTC) of each window,
+    ``volumes`` are int64 and every price column is float64.
+    """
+
+    __slots__ = ("timestamps", "opens", "highs", "lows", "closes", "volumes", "vwaps")
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        opens: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        vwaps: np.ndarray
+    ):
+        """Initialize the candles from column arrays."""
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.opens = np.asarray(opens, dtype=np.float64)
+        self.highs = np.asarray(highs, dtype=np.float64)
+        self.lows = np.asarray(lows, dtype=np.float64)
+        self.closes = np.asarray(closes, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.int64)
+        self.vwaps = np.asarray(vwaps, dtype=np.float64)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "CandleSeries":
+        """Decode pivoted candle records with OHLCV and ``vwap`` columns."""
+        builder = CandleSeriesBuilder()
+        for record in records:
+            builder.add_record(record)
+        return builder.build()
+
+    def __len__(self) -> int:
+        """Number of candles."""
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def to_candles(self) -> List[Dict[str, Any]]:
+        """Serialize the candles into the API's list-of-dicts representation."""
+        timestamps = format_timestamps(self.timestamps)
+        return [
+            {
+                "timestamp": timestamp,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+                "vwap": vwap
+            }
+            for timestamp, open_, high, low, close, volume, vwap in zip(
+                timestamps,
+                self.opens.tolist(),
+                self.highs.tolist(),
+                self.lows.tolist(),
+                self.closes.tolist(),
+                self.volumes.tolist(),
+                self.vwaps.tolist()
+            )
+        ]
+
+
+class CandleSeriesBuilder:
+    """Incrementally decode pivoted candle records into a ``CandleSeries``.
+
+    Like ``StockSeriesBuilder``, records are converted to NumPy arrays every
+    ``chunk_size`` rows so the result stream is not held as objects.
+    """
+
+    _FIELDS = ("open", "high", "low", "close", "volume", "vwap")
+
+    def __init__(self, chunk_size: int = 65_536):
+        """Initialize an empty builder."""
+        self.chunk_size = chunk_size
+        self._times: List[Any] = []
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self._FIELDS}
+        self._chunks: List[CandleSeries] = []
+
+    def add_record(self, record: Any) -> None:
+        """Append one pivoted record with OHLCV and ``vwap`` columns."""
+        values = record.values
+        self._times.append(record.get_time())
+        for name, column in self._columns.items():
+            column.append(values.get(name) or 0)
+
+        if len(self._times) >= self.chunk_size:
+            self._seal_chunk()
+
+    def build(self) -> CandleSeries:
+        """Return the decoded candles."""
+        self._seal_chunk()
+        if len(self._chunks) == 1:
+            return self._chunks[0]
+        return CandleSeries(*(
+            np.concatenate([getattr(chunk, name) for chunk in self._chunks])
+            if self._chunks else np.empty(0)
+            for name in CandleSeries.__slots__
+        ))
+
+    def _seal_chunk(self) -> None:
+        """Convert the buffered records into column arrays."""
+        if not self._times:
+            return
+
+        columns = self._columns
+        self._chunks.append(CandleSeries(
+            to_epoch_ns(self._times),
+            columns["open"],
+            columns["high"],
+            columns["low"],
+            columns["close"],
+            columns["volume"],
+            columns["vwap"]
+        ))
+        self._times = []
+        self._columns = {name: [] for name in self._FIELDS}
+
+
+def concat_series(series: List[StockSeries]) -> StockSeries:
+    """Concatenate series in order."""
+    return StockSeries(
+        np.concatenate([s.timestamps for s in series]),
+        np.concatenate([s.prices for s in series]),
+        np.concatenate([s.volumes for s in series])
+    )
+
+
+def to_epoch_ns(times: List[Any]) -> np.ndarray:
+    """Convert datetimes (naive values are taken as UTC) to epoch nanoseconds."""
+    index = pd.to_datetime(times, utc=True)
+    return np.asarray(index.asi8, dtype=np.int64)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """Convert a datetime (naive values are taken as UTC) to epoch nanoseconds."""
+    return calendar.timegm(value.utctimetuple()) * 1_000_000_000 + value.microsecond * 1000
+
+
+def ns_to_datetime(value: int) -> datetime:
+    """Convert epoch nanoseconds to a naive UTC datetime (microsecond precision)."""
+    return datetime(1970, 1, 1) + timedelta(microseconds=value // 1000)
+
+
+def format_timestamps(timestamps: np.ndarray) -> List[str]:
+    """Format epoch nanoseconds as ISO-8601 UTC strings.
+
+    Matches ``datetime.isoformat()`` on UTC datetimes: whole-second series
+    omit the fractional part, anything finer uses microseconds.
+    """
+    if len(timestamps) == 0:
+        return []
+
+    unit = "s" if not np.any(timestamps % 1_000_000_000) else "us"
+    formatted = np.datetime_as_string(timestamps.astype("datetime64[ns]"), unit=unit)
+    return np.char.add(formatted, "+00:00").tolist()
@@ -1,8 +1,24 @@
 """Pydantic models for stock trading data."""
 
+import re
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator, validator
+
+from app.models.ticks import PRECISION_NS
+
+# Supported technical indicators
+INDICATOR_NAMES = ("sma", "ema", "rsi", "bollinger", "volatility", "vwap")
+
+# Fields only honoured by the /query endpoint
+STOCK_DATA_QUERY_FIELDS = ("max_points", "page_size", "cursor")
+
+# Supported aggregation intervals and their length in seconds
+INTERVAL_SECONDS = {
+    '1s': 1, '5s': 5, '10s': 10, '30s': 30,
+    '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '4h': 14400, '1d': 86400,
+}
 
 
 class StockDataPoint(BaseModel):
@@ -48,6 +64,31 @@ class StockDataBatch(BaseModel):
         return v
 
 
+class ColumnarStockBatch(BaseModel):
+    """Model for a batch of stock data points sent as parallel arrays."""
+
+    symbols: list[str] = Field(..., description="Stock symbol of each tick")
+    prices: list[float] = Field(..., description="Price of each tick")
+    volumes: list[int] = Field(..., description="Trading volume of each tick")
+    timestamps: Optional[list[int]] = Field(None, description="Epoch timestamp of each tick")
+    precision: str = Field(default="ns", description="Timestamp unit (s, ms, us or ns)")
+
+    @validator('symbols')
+    def validate_symbols(cls, v: list[str]) -> list[str]:
+        """Validate symbols list is not empty."""
+        if not v:
+            raise ValueError('Symbols list cannot be empty')
+        return v
+
+    @validator('precision')
+    def validate_precision(cls, v: str) -> str:
+        """Validate timestamp precision."""
+        valid_precisions = list(PRECISION_NS)
+        if v not in valid_precisions:
+            raise ValueError(f'Precision must be one of: {valid_precisions}')
+        return v
+
+
 class TimeRangeQuery(BaseModel):
     """Model for time range queries."""
 
@@ -59,6 +100,18 @@ class TimeRangeQuery(BaseModel):
         description="Time interval (e.g., 1s, 1m, 1h, 1d)"
     )
 
+    @root_validator(pre=True)
+    def reject_stock_data_query_fields(cls, values: dict) -> dict:
+        """Reject downsampling and pagination fields on queries that would silently ignore them."""
+        if isinstance(values, dict):
+            unsupported = [
+                name for name in STOCK_DATA_QUERY_FIELDS
+                if values.get(name) is not None and name not in cls.model_fields
+            ]
+            if unsupported:
+                raise ValueError(f'Fields not supported by this query: {unsupported}')
+        return values
+
     @validator('symbol')
     def validate_symbol(cls, v: str) -> str:
         """Validate stock symbol format."""
@@ -69,12 +122,97 @@ class TimeRangeQuery(BaseModel):
     @validator('interval')
     def validate_interval(cls, v: str) -> str:
         """Validate time interval format."""
-        valid_intervals = ['1s', '5s', '10s', '30s', '1m', '5m', '15m', '30m', '1h', '4h', '1d']
+        valid_intervals = list(INTERVAL_SECONDS)
+        if v not in valid_intervals:
+            raise ValueError(f'Interval must be one of: {valid_intervals}')
+        return v
+
+
+class StockDataQuery(TimeRangeQuery):
+    """Model for time range data queries, with downsampling and pagination."""
+
+    max_points: Optional[int] = Field(
+        None,
+        ge=3,
+        description="Downsample the result to at most this many points, e.g. the chart width in pixels"
+    )
+    page_size: Optional[int] = Field(None, ge=1, description="Return the range in pages of at most this many points")
+    cursor: Optional[str] = Field(None, description="Cursor returned as next_cursor by the previous page")
+
+
+class MultiSymbolQuery(BaseModel):
+    """Model for time range queries over several symbols."""
+
+    symbols: Optional[list[str]] = Field(None, description="Stock symbols to query")
+    symbol_pattern: Optional[str] = Field(None, description="Python regular expression matched against known symbols")
+    start_time: Optional[datetime] = Field(None, description="Start time for query")
+    end_time: Optional[datetime] = Field(None, description="End time for query")
+    interval: str = Field(
+        default="1m",
+        description="Time interval (e.g., 1s, 1m, 1h, 1d)"
+    )
+
+    @validator('symbols')
+    def validate_symbols(cls, v: Optional[list[str]]) -> Optional[list[str]]:
+        """Validate stock symbol formats."""
+        if v is None:
+            return v
+        if not v:
+            raise ValueError('Symbols list cannot be empty')
+        if not all(symbol.isalpha() for symbol in v):
+            raise ValueError('Symbol must contain only letters')
+        return list(dict.fromkeys(symbol.upper() for symbol in v))
+
+    @validator('symbol_pattern', always=True)
+    def validate_symbol_pattern(cls, v: Optional[str], values: dict) -> Optional[str]:
+        """Validate that exactly one of symbols and symbol_pattern is given, and the pattern compiles."""
+        if (v is None) == (values.get('symbols') is None):
+            raise ValueError('Provide exactly one of symbols or symbol_pattern')
+        if v is not None:
+            try:
+                re.compile(v)
+            except re.error as e:
+                raise ValueError(f'Invalid symbol pattern: {e}')
+        return v
+
+    @validator('interval')
+    def validate_interval(cls, v: str) -> str:
+        """Validate time interval format."""
+        valid_intervals = list(INTERVAL_SECONDS)
         if v not in valid_intervals:
             raise ValueError(f'Interval must be one of: {valid_intervals}')
         return v
 
 
+class IndicatorSpec(BaseModel):
+    """Model for one requested technical indicator."""
+
+    name: str = Field(..., description="Indicator (sma, ema, rsi, bollinger, volatility, vwap)")
+    period: int = Field(default=20, gt=1, le=1000, description="Lookback in windows")
+    num_std: float = Field(default=2.0, gt=0, description="Band width in standard deviations (bollinger)")
+
+    @validator('name')
+    def validate_name(cls, v: str) -> str:
+        """Validate indicator name."""
+        v = v.lower()
+        if v not in INDICATOR_NAMES:
+            raise ValueError(f'Indicator must be one of: {list(INDICATOR_NAMES)}')
+        return v
+
+
+class IndicatorQuery(TimeRangeQuery):
+    """Model for technical indicator queries."""
+
+    indicators: list[IndicatorSpec] = Field(..., description="Indicators to compute")
+
+    @validator('indicators')
+    def validate_indicators(cls, v: list[IndicatorSpec]) -> list[IndicatorSpec]:
+        """Validate indicators list is not empty."""
+        if not v:
+            raise ValueError('Indicators list cannot be empty')
+        return v
+
+
 class StockDataResponse(BaseModel):
     """Model for stock data query response."""
 
@@ -83,6 +221,90 @@ class StockDataResponse(BaseModel):
     total_points: int
     time_range: dict[str, datetime]
     interval: str
+    requested_interval: Optional[str] = None
+    next_start_time: Optional[datetime] = None
+    next_cursor: Optional[str] = None
+
+
+class MultiSymbolResponse(BaseModel):
+    """Model for multi-symbol query response."""
+
+    results: list[StockDataResponse]
+    total_symbols: int
+    time_range: dict[str, datetime]
+    interval: str
+    requested_interval: Optional[str] = None
+    next_start_time: Optional[datetime] = None
+
+
+class CandleResponse(BaseModel):
+    """Model for OHLC candlestick query response."""
+
+    symbol: str
+    candles: list[dict]
+    total_candles: int
+    time_range: dict[str, datetime]
+    interval: str
+    requested_interval: Optional[str] = None
+    next_start_time: Optional[datetime] = None
+
+
+class IndicatorResponse(BaseModel):
+    """Model for technical indicator query response."""
+
+    symbol: str
+    timestamps: list[str]
+    indicators: dict[str, list[Optional[float]]]
+    time_range: dict[str, datetime]
+    interval: str
+    requested_interval: Optional[str] = None
+    next_start_time: Optional[datetime] = None
+
+
+class SymbolSnapshot(BaseModel):
+    """Model for the latest state of one symbol."""
+
+    symbol: str
+    price: float
+    volume: int
+    timestamp: datetime
+    reference_price: Optional[float] = None
+    change: Optional[float] = None
+    change_percent: Optional[float] = None
+
+
+class MarketSnapshotResponse(BaseModel):
+    """Model for market-wide snapshot response."""
+
+    snapshots: list[SymbolSnapshot]
+    total_symbols: int
+    lookback_seconds: int
+    as_of: datetime
+
+
+class OHLCVBar(BaseModel):
+    """Model for an open-high-low-close-volume bar."""
+
+    symbol: str
+    interval: str
+    start: datetime
+    end: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    trade_count: int
+    complete: bool = Field(..., description="Whether the bar includes every tick of its window so far")
+
+
+class SymbolMetadata(BaseModel):
+    """Model for symbol registry metadata."""
+
+    symbol: str
+    first_timestamp: Optional[datetime] = None
+    last_timestamp: Optional[datetime] = None
+    point_count: int = 0
 
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,135 @@
+"""Columnar containers and vectorized validation for ingested ticks."""
+
+import threading
+import time
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.series import StockSeries
+
+# Nanoseconds per unit of each supported timestamp precision
+PRECISION_NS = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+_INT64 = np.iinfo(np.int64)
+
+_clock_lock = threading.Lock()
+_last_reserved_ns = 0
+
+
+def reserve_timestamps(count: int) -> int:
+    """Reserve ``count`` distinct epoch-nanosecond timestamps from now on and return the first.
+
+    Ticks without a timestamp need one each: rows sharing a symbol and a
+    timestamp overwrite each other in InfluxDB.
+    """
+    global _last_reserved_ns
+    with _clock_lock:
+        first = max(time.time_ns(), _last_reserved_ns + 1)
+        _last_reserved_ns = first + max(count, 1) - 1
+    return first
+
+
+class TickColumns:
+    """Validated ticks held as parallel NumPy columns.
+
+    ``symbols`` is an object array of upper-case symbols, ``timestamps`` are
+    int64 epoch nanoseconds (UTC), ``prices`` are float64 and ``volumes``
+    are int64. Rows keep their arrival order.
+    """
+
+    __slots__ = ("symbols", "timestamps", "prices", "volumes")
+
+    def __init__(self, symbols: np.ndarray, timestamps: np.ndarray, prices: np.ndarray, volumes: np.ndarray):
+        """Initialize the columns from arrays."""
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.int64)
+
+    def __len__(self) -> int:
+        """Number of ticks."""
+        return len(self.timestamps)
+
+    def by_symbol(self) -> Iterator[Tuple[str, StockSeries]]:
+        """Yield each symbol with its ticks, in arrival order."""
+        if not len(self):
+            return
+
+        unique, inverse = np.unique(self.symbols, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+        for index, symbol in enumerate(unique.tolist()):
+            rows = order[bounds[index]:bounds[index + 1]]
+            yield symbol, StockSeries(self.timestamps[rows], self.prices[rows], self.volumes[rows])
+
+    def to_line_protocol(self) -> str:
+        """Encode the ticks as InfluxDB line protocol, one line per tick."""
+        return "\n".join(
+            f"stock_data,symbol={symbol} price={price!r},volume={volume}i {timestamp}"
+            for symbol, price, volume, timestamp in zip(
+                self.symbols.tolist(),
+                self.prices.tolist(),
+                self.volumes.tolist(),
+                self.timestamps.tolist()
+            )
+        )
+
+
+def validate_tick_columns(
+    symbols: Sequence[str],
+    prices: Sequence[float],
+    volumes: Sequence[int],
+    timestamps: Optional[Sequence[int]] = None,
+    precision: str = "ns"
+) -> Tuple[TickColumns, np.ndarray]:
+    """Validate parallel tick arrays with the rules of ``StockDataPoint``.
+
+    Symbols must be alphabetic and are upper-cased, prices must be positive
+    and are rounded to cents, and volumes must be non-negative. Missing
+    timestamps default to the current time, one distinct nanosecond per row.
+    Returns the valid rows and the indices of the rejected ones.
+    """
+    count = len(symbols)
+    if len(prices) != count or len(volumes) != count or (timestamps is not None and len(timestamps) != count):
+        raise ValueError("Column lengths must match")
+
+    price_array = np.asarray(prices, dtype=np.float64)
+    volume_array, valid = _int64_column(volumes)
+    if timestamps is None:
+        timestamp_array = reserve_timestamps(count) + np.arange(count, dtype=np.int64)
+    else:
+        timestamp_array, timestamp_valid = _int64_column(timestamps)
+        # Scaling to nanoseconds must not wrap around
+        limit = _INT64.max // PRECISION_NS[precision]
+        timestamp_valid &= (timestamp_array >= -limit) & (timestamp_array <= limit)
+        timestamp_array = np.where(timestamp_valid, timestamp_array, 0) * PRECISION_NS[precision]
+        valid &= timestamp_valid
+
+    # Feeds repeat a handful of symbols, so check each distinct one once
+    unique, inverse = np.unique(np.asarray(symbols, dtype=object), return_inverse=True)
+    unique_valid = np.array([symbol.isalpha() for symbol in unique.tolist()], dtype=bool)
+    unique_upper = np.array([symbol.upper() for symbol in unique.tolist()], dtype=object)
+
+    valid &= unique_valid[inverse]
+    valid &= np.isfinite(price_array) & (price_array > 0)
+    valid &= volume_array >= 0
+
+    columns = TickColumns(
+        unique_upper[inverse][valid],
+        timestamp_array[valid],
+        np.round(price_array[valid], 2),
+        volume_array[valid]
+    )
+    return columns, np.flatnonzero(~valid)
+
+
+def _int64_column(values: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert integers to an int64 array plus a mask of those that fit; the rest become 0."""
+    try:
+        array = np.asarray(values, dtype=np.int64)
+        return array, np.ones(len(array), dtype=bool)
+    except OverflowError:
+        in_range = np.array([_INT64.min <= value <= _INT64.max for value in values], dtype=bool)
+        array = np.array([value if fits else 0 for value, fits in zip(values, in_range)], dtype=np.int64)
+        return array, in_range
@@ -0,0 +1,68 @@
+"""Arrow IPC and Parquet encoding of columnar query results."""
+
+from typing import Dict, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from app.models.series import CandleSeries, StockSeries
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+TABLE_MEDIA_TYPES = (ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE)
+
+_TIMESTAMP = pa.timestamp("ns", tz="UTC")
+
+
+def negotiate_table_media_type(accept: Optional[str]) -> Optional[str]:
+    """Return the Arrow or Parquet media type an ``Accept`` header asks for, if any.
+
+    Quality values are ignored; the first supported type listed wins.
+    """
+    if not accept:
+        return None
+    for entry in accept.split(","):
+        media_type = entry.split(";", 1)[0].strip().lower()
+        if media_type in TABLE_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+def series_to_table(series: StockSeries, metadata: Dict[str, str]) -> pa.Table:
+    """Wrap a series' columns in an Arrow table without copying prices or volumes."""
+    return pa.table(
+        {
+            "timestamp": pa.array(series.timestamps, type=pa.int64()).cast(_TIMESTAMP),
+            "price": pa.array(series.prices),
+            "volume": pa.array(series.volumes),
+        },
+        metadata=metadata
+    )
+
+
+def candles_to_table(candles: CandleSeries, metadata: Dict[str, str]) -> pa.Table:
+    """Wrap candle columns in an Arrow table."""
+    return pa.table(
+        {
+            "timestamp": pa.array(candles.timestamps, type=pa.int64()).cast(_TIMESTAMP),
+            "open": pa.array(candles.opens),
+            "high": pa.array(candles.highs),
+            "low": pa.array(candles.lows),
+            "close": pa.array(candles.closes),
+            "volume": pa.array(candles.volumes),
+            "vwap": pa.array(candles.vwaps),
+        },
+        metadata=metadata
+    )
+
+
+def encode_table(table: pa.Table, media_type: str) -> bytes:
+    """Serialize a table as an Arrow IPC stream or a Parquet file."""
+    sink = pa.BufferOutputStream()
+    if media_type == PARQUET_MEDIA_TYPE:
+        pq.write_table(table, sink)
+    else:
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
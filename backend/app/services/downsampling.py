@@ -0,0 +1,64 @@
+"""Visual downsampling of price series for charts."""
+
+import numpy as np
+
+from app.models.series import StockSeries
+
+
+def _bucket_edges(n: int, threshold: int) -> np.ndarray:
+    """Start indices of the middle buckets, followed by the index of the last point."""
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    return edges
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Select ``threshold`` points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the mean of the next bucket, so spikes survive.
+    Returns all indices when the series already fits.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = (x - x[0]).astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = _bucket_edges(n, threshold)
+
+    # Mean of every middle bucket; the last bucket looks ahead to the final point
+    sizes = np.diff(edges)
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    next_x = np.append(((x_sums[edges[1:]] - x_sums[edges[:-1]]) / sizes)[1:], x[-1])
+    next_y = np.append(((y_sums[edges[1:]] - y_sums[edges[:-1]]) / sizes)[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = anchor = 0
+    selected[-1] = n - 1
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        areas = np.abs(
+            (x[anchor] - next_x[bucket]) * (y[lo:hi] - y[anchor])
+            - (x[anchor] - x[lo:hi]) * (next_y[bucket] - y[anchor])
+        )
+        anchor = lo + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def downsample_lttb(series: StockSeries, max_points: int) -> StockSeries:
+    """Reduce a series to at most ``max_points`` rows for display.
+
+    Prices and timestamps are those of the selected points; volumes are
+    summed over each bucket so the total traded volume is preserved.
+    """
+    if len(series) <= max_points or max_points < 3:
+        return series
+
+    selected = lttb_indices(series.timestamps, series.prices, max_points)
+    bucket_starts = np.concatenate(([0], _bucket_edges(len(series), max_points)))
+    volumes = np.add.reduceat(series.volumes, bucket_starts)
+    return StockSeries(series.timestamps[selected], series.prices[selected], volumes)
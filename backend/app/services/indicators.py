@@ -0,0 +1,101 @@
+"""Vectorized technical indicators over aggregated price series."""
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.models.series import StockSeries
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average; the first ``period - 1`` values are NaN."""
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        cumulative = np.cumsum(np.insert(values, 0, 0.0))
+        result[period - 1:] = (cumulative[period:] - cumulative[:-period]) / period
+    return result
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value."""
+    if not len(values):
+        return np.empty(0)
+    return pd.Series(values).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Rolling population standard deviation; the first ``period - 1`` values are NaN."""
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        result[period - 1:] = sliding_window_view(values, period).std(axis=1)
+    return result
+
+
+def rsi(values: np.ndarray, period: int) -> np.ndarray:
+    """Relative strength index with Wilder smoothing; the first ``period`` values are NaN."""
+    result = np.full(len(values), np.nan)
+    if len(values) <= period:
+        return result
+
+    changes = np.diff(values)
+    alpha = 1.0 / period
+    gains = pd.Series(np.clip(changes, 0, None)).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    losses = pd.Series(np.clip(-changes, 0, None)).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = 100.0 - 100.0 / (1.0 + gains / losses)
+    strength[losses == 0] = 100.0
+    strength[(gains == 0) & (losses == 0)] = 50.0
+    result[period:] = strength[period - 1:]
+    return result
+
+
+def volatility(values: np.ndarray, period: int) -> np.ndarray:
+    """Rolling standard deviation of log returns over ``period`` windows (not annualized)."""
+    result = np.full(len(values), np.nan)
+    if len(values) > 1:
+        result[1:] = rolling_std(np.diff(np.log(values)), period)
+    return result
+
+
+def rolling_vwap(prices: np.ndarray, volumes: np.ndarray, period: int) -> np.ndarray:
+    """Rolling volume-weighted average of window prices over ``period`` windows."""
+    weighted = sma(prices * volumes, period)
+    total = sma(volumes.astype(np.float64), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, weighted / total, np.nan)
+
+
+_PRICE_KERNELS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    "sma": sma,
+    "ema": ema,
+    "rsi": rsi,
+    "volatility": volatility,
+}
+
+
+def warmup_windows(name: str, period: int) -> int:
+    """Number of windows an indicator needs before its first meaningful value."""
+    if name == "ema":
+        # An EMA seeded with one value takes a few spans to forget the seed
+        return 3 * period
+    if name in ("rsi", "volatility"):
+        return period + 1
+    return period
+
+
+def compute_indicator(name: str, series: StockSeries, period: int, num_std: float) -> Dict[str, np.ndarray]:
+    """Compute one indicator, keyed by output series name."""
+    prices = series.prices
+    if name == "bollinger":
+        middle = sma(prices, period)
+        width = num_std * rolling_std(prices, period)
+        return {
+            f"bollinger_{period}_upper": middle + width,
+            f"bollinger_{period}_middle": middle,
+            f"bollinger_{period}_lower": middle - width,
+        }
+    if name == "vwap":
+        return {f"vwap_{period}": rolling_vwap(prices, series.volumes, period)}
+    return {f"{name}_{period}": _PRICE_KERNELS[name](prices, period)}
@@ -0,0 +1,114 @@
+"""Incremental parsing of newline-delimited tick streams."""
+
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Tuple
+
+from app.models.series import datetime_to_ns
+from app.models.ticks import PRECISION_NS, TickColumns, reserve_timestamps, validate_tick_columns
+
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+class LineTooLongError(ValueError):
+    """Raised when a stream line exceeds the configured maximum length."""
+
+
+async def iter_line_chunks(
+    stream: AsyncIterator[bytes],
+    chunk_size: int,
+    max_line_bytes: int
+) -> AsyncIterator[List[bytes]]:
+    """Split a byte stream into chunks of at most ``chunk_size`` non-empty lines.
+
+    Only the current partial line and one chunk of lines are held in memory.
+    """
+    buffer = b""
+    lines: List[bytes] = []
+    async for data in stream:
+        *complete, buffer = (buffer + data).split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(f"Line exceeds {max_line_bytes} bytes")
+
+        for line in complete:
+            if line.strip():
+                lines.append(line)
+                if len(lines) >= chunk_size:
+                    yield lines
+                    lines = []
+
+    if buffer.strip():
+        lines.append(buffer)
+    if lines:
+        yield lines
+
+
+def parse_tick_lines(lines: List[bytes], precision: str = "ns") -> Tuple[TickColumns, int]:
+    """Parse JSON tick lines into validated columns.
+
+    Each line is an object with ``symbol``, ``price``, ``volume`` and an
+    optional ``timestamp`` (ISO-8601 string or epoch number in
+    ``precision``). Returns the valid ticks and the number of rejected lines.
+    """
+    symbols: List[str] = []
+    prices: List[float] = []
+    volumes: List[int] = []
+    timestamps: List[int] = []
+    # Rows of lines without a timestamp, stamped once the count is known
+    unstamped: List[int] = []
+    malformed = 0
+
+    for line in lines:
+        try:
+            tick = json.loads(line)
+            symbol = tick["symbol"]
+            price = float(tick["price"])
+            volume = _to_int(tick["volume"])
+            timestamp = tick.get("timestamp")
+            timestamp_ns = 0 if timestamp is None else _to_epoch_ns(timestamp, precision)
+            if not isinstance(symbol, str):
+                raise TypeError("Symbol must be a string")
+        except (ValueError, TypeError, KeyError, AttributeError, OverflowError):
+            malformed += 1
+            continue
+
+        if timestamp is None:
+            unstamped.append(len(timestamps))
+        symbols.append(symbol)
+        prices.append(price)
+        volumes.append(volume)
+        timestamps.append(timestamp_ns)
+
+    if unstamped:
+        # One nanosecond each, so InfluxDB does not overwrite ticks sharing a symbol
+        first_ns = reserve_timestamps(len(unstamped))
+        for offset, row in enumerate(unstamped):
+            timestamps[row] = first_ns + offset
+
+    columns, rejected = validate_tick_columns(symbols, prices, volumes, timestamps)
+    return columns, malformed + len(rejected)
+
+
+def _to_int(value: Any) -> int:
+    """Convert a JSON value to an int, refusing fractional numbers and values beyond int64."""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError("Volume must be an integer")
+    return _check_int64(int(value))
+
+
+def _to_epoch_ns(value: Any, precision: str) -> int:
+    """Convert an ISO-8601 string or an epoch number to epoch nanoseconds."""
+    if isinstance(value, str):
+        return _check_int64(datetime_to_ns(datetime.fromisoformat(value)))
+    if isinstance(value, bool):
+        raise TypeError("Timestamp must be a string or a number")
+    return _check_int64(int(value * PRECISION_NS[precision]))
+
+
+def _check_int64(value: int) -> int:
+    """Return ``value``, raising OverflowError if it does not fit an int64 column."""
+    if not _INT64_MIN <= value <= _INT64_MAX:
+        raise OverflowError("Value out of int64 range")
+    return value
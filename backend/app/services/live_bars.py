@@ -0,0 +1,112 @@
+"""Rolling OHLCV bars for the current window of every interval, fed by ingest."""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.models.series import StockSeries
+
+_NS = 1_000_000_000
+
+
+class LiveBar:
+    """OHLCV aggregate of the ticks seen so far in one window."""
+
+    __slots__ = ("start_ns", "open", "high", "low", "close", "volume", "price_sum", "count")
+
+    def __init__(self, start_ns: int, price: float, volume: int):
+        """Open a bar with its first tick."""
+        self.start_ns = start_ns
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.price_sum = price
+        self.count = 1
+
+    def update(self, price: float, volume: int) -> None:
+        """Fold one more tick into the bar."""
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.price_sum += price
+        self.count += 1
+
+    def copy(self) -> "LiveBar":
+        """Return a snapshot of the bar."""
+        bar = LiveBar.__new__(LiveBar)
+        for name in LiveBar.__slots__:
+            setattr(bar, name, getattr(self, name))
+        return bar
+
+    @property
+    def mean_price(self) -> float:
+        """Mean tick price, as ``aggregateWindow(fn: mean)`` computes it."""
+        return self.price_sum / self.count
+
+
+class LiveBarStore:
+    """Current OHLCV bar per symbol and interval, updated in O(1) per tick and interval.
+
+    A tick for a newer window replaces the bar; ticks for older windows are
+    left to the database. A bar is ``complete`` when its window started
+    after this store did, i.e. this process has seen every tick ingested
+    into it.
+    """
+
+    def __init__(self, intervals: Dict[str, int], enabled: bool = True):
+        """Initialize an empty store for intervals given in seconds."""
+        self.enabled = enabled
+        self.intervals: List[Tuple[str, int]] = [(name, seconds * _NS) for name, seconds in intervals.items()]
+        self._interval_ns = dict(self.intervals)
+        self.started_ns = time.time_ns()
+        self._bars: Dict[Tuple[str, str], LiveBar] = {}
+        self._lock = threading.Lock()
+
+    def record(self, symbol: str, timestamp_ns: int, price: float, volume: int) -> None:
+        """Fold an ingested tick into the bars of its symbol."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._record(symbol, timestamp_ns, price, volume)
+
+    def record_series(self, symbol: str, series: StockSeries) -> None:
+        """Fold a run of ingested ticks, in arrival order, into the bars of their symbol."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            for timestamp, price, volume in zip(
+                series.timestamps.tolist(), series.prices.tolist(), series.volumes.tolist()
+            ):
+                self._record(symbol, timestamp, price, volume)
+
+    def current(self, symbol: str, interval: str, now_ns: Optional[int] = None) -> Optional[LiveBar]:
+        """Return a snapshot of the bar of the window containing ``now_ns``, if any tick has landed in it."""
+        if not self.enabled:
+            return None
+
+        now_ns = time.time_ns() if now_ns is None else now_ns
+        interval_ns = self._interval_ns[interval]
+        with self._lock:
+            bar = self._bars.get((symbol, interval))
+            if bar is None or not bar.start_ns <= now_ns < bar.start_ns + interval_ns:
+                return None
+            return bar.copy()
+
+    def is_complete(self, bar: LiveBar) -> bool:
+        """Whether this process has seen every tick of the bar's window."""
+        return bar.start_ns >= self.started_ns
+
+    def _record(self, symbol: str, timestamp_ns: int, price: float, volume: int) -> None:
+        """Update every interval's bar with one tick; the caller holds the lock."""
+        for name, interval_ns in self.intervals:
+            start_ns = timestamp_ns - timestamp_ns % interval_ns
+            key = (symbol, name)
+            bar = self._bars.get(key)
+            if bar is None or start_ns > bar.start_ns:
+                self._bars[key] = LiveBar(start_ns, price, volume)
+            elif start_ns == bar.start_ns:
+                bar.update(price, volume)
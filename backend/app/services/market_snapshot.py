@@ -0,0 +1,73 @@
+"""Ingest-maintained snapshot of the latest tick of every symbol."""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# (epoch nanoseconds, price, volume)
+LastTick = Tuple[int, float, int]
+
+
+class MarketSnapshotStore:
+    """Last tick per symbol plus reference prices per lookback.
+
+    Both are seeded from InfluxDB and expire after ``resync_seconds``; in
+    between, ingested ticks keep the last ticks current, so a snapshot is
+    served without a query. Reference prices (the price at the start of a
+    lookback) are up to ``resync_seconds`` old.
+    """
+
+    def __init__(self, resync_seconds: float):
+        """Initialize an empty store."""
+        self.resync_seconds = resync_seconds
+        self._last: Dict[str, LastTick] = {}
+        self._loaded_at: Optional[float] = None
+        self._references: Dict[int, Tuple[float, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether snapshots are kept in memory at all."""
+        return self.resync_seconds > 0
+
+    def record(self, symbol: str, timestamp_ns: int, price: float, volume: int) -> None:
+        """Account for an ingested tick once the store has been seeded."""
+        if self._loaded_at is None:
+            return
+
+        with self._lock:
+            last = self._last.get(symbol)
+            if last is None or timestamp_ns >= last[0]:
+                self._last[symbol] = (timestamp_ns, price, volume)
+
+    def get(self, lookback_seconds: int) -> Optional[Tuple[Dict[str, LastTick], Dict[str, float]]]:
+        """Return the last ticks and reference prices, or None if either needs a reload."""
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded_at is None or now - self._loaded_at > self.resync_seconds:
+                return None
+            references = self._references.get(lookback_seconds)
+            if references is None or now - references[0] > self.resync_seconds:
+                return None
+            return dict(self._last), references[1]
+
+    def load(self, lookback_seconds: int, last: Dict[str, LastTick], references: Dict[str, float]) -> None:
+        """Seed the store from query results, keeping ticks ingested meanwhile if newer."""
+        if not self.enabled:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            for symbol, tick in last.items():
+                current = self._last.get(symbol)
+                if current is None or tick[0] > current[0]:
+                    self._last[symbol] = tick
+            self._loaded_at = now
+            self._references = {
+                seconds: entry for seconds, entry in self._references.items()
+                if now - entry[0] <= self.resync_seconds
+            }
+            self._references[lookback_seconds] = (now, references)
@@ -0,0 +1,32 @@
+"""Opaque cursors for paging through time range queries."""
+
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or belongs to a different query."""
+
+
+def encode_cursor(symbol: str, interval: str, after_ns: int) -> str:
+    """Encode the position after the last returned window of a query."""
+    payload = json.dumps({"s": symbol, "i": interval, "t": after_ns}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, symbol: str, interval: str) -> int:
+    """Return the epoch nanoseconds a cursor resumes from.
+
+    The cursor must have been issued for the same symbol and interval.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after_ns = int(payload["t"])
+        matches = payload["s"] == symbol and payload["i"] == interval
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if not matches:
+        raise InvalidCursorError("Cursor was issued for a different symbol or interval")
+    return after_ns
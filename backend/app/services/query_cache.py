@@ -0,0 +1,121 @@
+"""Read-through cache for stock data query results."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Set
+
+
+class _CacheEntry(NamedTuple):
+    """A cached value with its owning symbol, size and expiry."""
+
+    value: Any
+    symbol: str
+    size: int
+    expires_at: float
+
+
+class QueryCache:
+    """Thread-safe LRU cache with per-entry TTL, a byte budget and symbol invalidation.
+
+    Every symbol has a generation counter that ``invalidate`` bumps. Callers
+    read the generation before querying the database and pass it to ``put``;
+    results fetched before a concurrent write are then discarded instead of
+    being cached stale.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        """Initialize an empty cache."""
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._keys_by_symbol: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+
+    @property
+    def size(self) -> int:
+        """Approximate bytes held by cached values."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a live cached value and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def generation(self, symbol: str) -> int:
+        """Return the current write generation of a symbol."""
+        with self._lock:
+            return self._generations.get(symbol, 0)
+
+    def put(self, key: Hashable, symbol: str, value: Any, size: int, generation: int) -> bool:
+        """Cache a value unless the symbol was written since ``generation`` was read."""
+        if not self.enabled or size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if self._generations.get(symbol, 0) != generation:
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _CacheEntry(value, symbol, size, time.monotonic() + self.ttl_seconds)
+            self._keys_by_symbol.setdefault(symbol, set()).add(key)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+            return True
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop every entry for a symbol and bump its generation."""
+        with self._lock:
+            self._generations[symbol] = self._generations.get(symbol, 0) + 1
+            for key in self._keys_by_symbol.pop(symbol, ()):
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._size -= entry.size
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            for symbol in self._keys_by_symbol:
+                self._generations[symbol] = self._generations.get(symbol, 0) + 1
+            self._entries.clear()
+            self._keys_by_symbol.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove one entry; the caller holds the lock."""
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        keys = self._keys_by_symbol.get(entry.symbol)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_symbol[entry.symbol]
@@ -0,0 +1,90 @@
+"""Output size estimation and limits for time range queries."""
+
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from app.models.series import datetime_to_ns
+from app.models.stock_data import INTERVAL_SECONDS
+
+QUERY_COST_POLICIES = ("reject", "coarsen", "paginate")
+
+
+class QueryCostError(ValueError):
+    """Raised when a query would return more rows than allowed."""
+
+
+class CostDecision(NamedTuple):
+    """How a query will run after the cost check."""
+
+    interval: str
+    end_time: datetime
+    estimated_rows: int
+    action: Optional[str]
+
+
+def estimate_rows(range_seconds: float, interval_seconds: int, ticks_per_second: Optional[float]) -> int:
+    """Estimate the windows a query returns.
+
+    Empty windows are dropped, so a sparse symbol returns at most one row
+    per tick; without a known tick rate every window is assumed to be filled.
+    """
+    windows = range_seconds / interval_seconds
+    if ticks_per_second is not None:
+        windows = min(windows, ticks_per_second * range_seconds)
+    return int(windows) + 1
+
+
+class QueryCostGuard:
+    """Keeps queries under ``max_rows`` by rejecting, coarsening or paginating them.
+
+    ``coarsen`` picks the finest interval that fits and ``paginate`` cuts the
+    range short at the last whole window that fits; both fall back to
+    rejecting when nothing fits.
+    """
+
+    def __init__(self, max_rows: int, policy: str):
+        """Initialize the guard; a non-positive ``max_rows`` disables it."""
+        if policy not in QUERY_COST_POLICIES:
+            raise ValueError(f"Policy must be one of: {list(QUERY_COST_POLICIES)}")
+        self.max_rows = max_rows
+        self.policy = policy
+
+    def check(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str,
+        ticks_per_second: Optional[float] = None,
+        symbols: int = 1
+    ) -> CostDecision:
+        """Decide how to run a query of ``symbols`` symbols over ``[start_time, end_time)``."""
+        range_seconds = max(datetime_to_ns(end_time) - datetime_to_ns(start_time), 0) / 1_000_000_000
+        estimated = estimate_rows(range_seconds, INTERVAL_SECONDS[interval], ticks_per_second) * symbols
+        if self.max_rows <= 0 or estimated <= self.max_rows:
+            return CostDecision(interval, end_time, estimated, None)
+
+        if self.policy == "coarsen":
+            for candidate, seconds in INTERVAL_SECONDS.items():
+                if seconds <= INTERVAL_SECONDS[interval]:
+                    continue
+                rows = estimate_rows(range_seconds, seconds, ticks_per_second) * symbols
+                if rows <= self.max_rows:
+                    return CostDecision(candidate, end_time, rows, "coarsen")
+
+        elif self.policy == "paginate":
+            interval_seconds = INTERVAL_SECONDS[interval]
+            rows_per_second = 1.0 / interval_seconds
+            if ticks_per_second is not None:
+                rows_per_second = min(rows_per_second, ticks_per_second)
+            windows = int((self.max_rows - symbols) / (rows_per_second * symbols)) // interval_seconds
+            if windows > 0:
+                # Windows are aligned to the epoch, so end the page on a window boundary
+                interval_ns = interval_seconds * 1_000_000_000
+                start_ns = datetime_to_ns(start_time)
+                page_end_ns = (start_ns + windows * interval_ns) // interval_ns * interval_ns
+                page_end = start_time + timedelta(microseconds=(page_end_ns - start_ns) // 1000)
+                return CostDecision(interval, page_end, self.max_rows, "paginate")
+
+        raise QueryCostError(
+            f"Query would return about {estimated} rows, more than the limit of {self.max_rows}"
+        )
@@ -0,0 +1,337 @@
+"""Managed downsampling of raw ticks into rollup buckets, and query routing to them."""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from influxdb_client.domain.bucket_retention_rules import BucketRetentionRules
+from influxdb_client.domain.task_create_request import TaskCreateRequest
+from influxdb_client.domain.task_update_request import TaskUpdateRequest
+
+from app.core.config import settings
+from app.models.series import datetime_to_ns, ns_to_datetime
+from app.models.stock_data import INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_NS = 1_000_000_000
+
+ROLLUP_MEASUREMENT = "stock_rollup"
+
+# Fields stored per rollup window, with the Flux function that merges them
+# into coarser windows. Means are rebuilt from sum and count, VWAP from the
+# price-volume sum and volume.
+ROLLUP_FIELDS = {
+    "price_sum": "sum",
+    "price_count": "sum",
+    "volume": "sum",
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "pv_sum": "sum",
+}
+
+
+class RollupLevel(NamedTuple):
+    """One rollup resolution and where it is stored."""
+
+    name: str
+    seconds: int
+    bucket: str
+    source_bucket: str
+    source_measurement: str
+    offset: str
+
+    @property
+    def task_name(self) -> str:
+        """Name of the InfluxDB task maintaining this level."""
+        return f"{self.bucket}_rollup"
+
+
+class Segment(NamedTuple):
+    """A slice of a query range and the rollup level that serves it (None for raw data)."""
+
+    level: Optional[RollupLevel]
+    start: datetime
+    stop: datetime
+
+
+def build_levels(names: List[str]) -> List[RollupLevel]:
+    """Build rollup levels, finest first, each reading from the previous one."""
+    levels: List[RollupLevel] = []
+    for index, name in enumerate(sorted(names, key=INTERVAL_SECONDS.__getitem__)):
+        source = levels[-1] if levels else None
+        levels.append(RollupLevel(
+            name=name,
+            seconds=INTERVAL_SECONDS[name],
+            bucket=f"{settings.influxdb_bucket}_{name}",
+            source_bucket=source.bucket if source else settings.influxdb_bucket,
+            source_measurement=ROLLUP_MEASUREMENT if source else "stock_data",
+            offset=f"{10 * (index + 1)}s"
+        ))
+    return levels
+
+
+def build_pv_flux(name: str, source: str) -> str:
+    """Build a Flux stream of per-tick price times volume, as field ``pv_sum``."""
+    return f'''{name} = {source}
+    |> filter(fn: (r) => r["_field"] == "price" or r["_field"] == "volume")
+    |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+    |> map(fn: (r) => ({{
+        _time: r._time,
+        _start: r._start,
+        _stop: r._stop,
+        _measurement: r._measurement,
+        symbol: r.symbol,
+        _field: "pv_sum",
+        _value: r.price * float(v: r.volume)
+    }}))
+    |> group(columns: ["_start", "_stop", "_measurement", "symbol", "_field"])
+'''
+
+
+def build_task_flux(level: RollupLevel, range_start: str, range_stop: Optional[str] = None) -> str:
+    """Build the Flux script that aggregates the source of a level into its bucket.
+
+    Rows are stamped with their window start so coarser aggregateWindow
+    calls over the rollup bucket put them in the right window.
+    """
+    time_range = f"start: {range_start}" + (f", stop: {range_stop}" if range_stop else "")
+    if level.source_measurement == ROLLUP_MEASUREMENT:
+        streams = ""
+        fields = "\n".join(
+            f'''    data
+        |> filter(fn: (r) => r["_field"] == "{field}")
+        |> aggregateWindow(every: {level.name}, fn: {fn}, createEmpty: false, timeSrc: "_start"),'''
+            for field, fn in ROLLUP_FIELDS.items()
+        )
+    else:
+        streams = f'''
+price = data |> filter(fn: (r) => r["_field"] == "price")
+volume = data |> filter(fn: (r) => r["_field"] == "volume")
+{build_pv_flux("pv", "data")}'''
+        price_fields = {"price_sum": "sum", "price_count": "count", "open": "first", "high": "max", "low": "min", "close": "last"}
+        fields = "\n".join(
+            f'''    price
+        |> aggregateWindow(every: {level.name}, fn: {fn}, createEmpty: false, timeSrc: "_start")
+        |> set(key: "_field", value: "{field}"),'''
+            for field, fn in price_fields.items()
+        ) + f'''
+    volume
+        |> aggregateWindow(every: {level.name}, fn: sum, createEmpty: false, timeSrc: "_start"),
+    pv
+        |> aggregateWindow(every: {level.name}, fn: sum, createEmpty: false, timeSrc: "_start"),'''
+
+    return f'''data = from(bucket: "{level.source_bucket}")
+    |> range({time_range})
+    |> filter(fn: (r) => r["_measurement"] == "{level.source_measurement}")
+{streams}
+union(tables: [
+{fields}
+])
+    |> set(key: "_measurement", value: "{ROLLUP_MEASUREMENT}")
+    |> to(bucket: "{level.bucket}", org: "{settings.influxdb_org}")
+'''
+
+
+def _format_flux_ns(value: int) -> str:
+    """Format whole-second epoch nanoseconds as an RFC3339 UTC timestamp for Flux."""
+    return ns_to_datetime(value).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_coverage_flux(level: RollupLevel, field: str) -> str:
+    """Build a Flux query for the first rollup window of a field, per symbol."""
+    return f'''from(bucket: "{level.bucket}")
+    |> range(start: 0)
+    |> filter(fn: (r) => r["_measurement"] == "{ROLLUP_MEASUREMENT}" and r["_field"] == "{field}")
+    |> first()
+    |> keep(columns: ["_time", "symbol"])
+'''
+
+
+class RollupManager:
+    """Maintains rollup buckets and tasks and routes queries to them.
+
+    Each level is kept up to date by an InfluxDB task that re-aggregates the
+    last two windows of its source every period. Routing is only active once
+    ``ensure_rollups`` has succeeded, and only covers time from a level's
+    first stored window on; candle fields are tracked separately because
+    levels created before they were added lack them until backfilled.
+
+    Writes older than the windows a task revisits are marked dirty by
+    ``mark_written``; queries read raw data from the earliest dirty window
+    on until ``refresh_dirty`` has re-aggregated it.
+    """
+
+    def __init__(self, db_manager, level_names: List[str], settle_seconds: float):
+        """Initialize the manager without touching the database."""
+        self.db_manager = db_manager
+        self.levels = build_levels(level_names)
+        self.settle_seconds = settle_seconds
+        self.ready = False
+        # Level name -> epoch ns of the first stored window, for mean/volume and candle fields
+        self.coverage: Dict[str, int] = {}
+        self.candle_coverage: Dict[str, int] = {}
+        # Level name -> [start ns, stop ns, monotonic time last marked] of windows needing re-aggregation
+        self._dirty: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def ensure_rollups(self, backfill_days: int = 0) -> None:
+        """Create missing rollup buckets and tasks, backfilling new buckets and changed tasks.
+
+        A task whose script changed (e.g. one that gained fields) is
+        backfilled again so existing windows get the new fields.
+        """
+        client = self.db_manager.client
+        buckets_api = client.buckets_api()
+        tasks_api = client.tasks_api()
+
+        for level in self.levels:
+            created = False
+            if buckets_api.find_bucket_by_name(level.bucket) is None:
+                buckets_api.create_bucket(
+                    bucket_name=level.bucket,
+                    org=settings.influxdb_org,
+                    retention_rules=BucketRetentionRules(type="expire", every_seconds=0)
+                )
+                created = True
+
+            flux = (
+                f'option task = {{name: "{level.task_name}", every: {level.name}, offset: {level.offset}}}\n\n'
+                + build_task_flux(level, f"-{2 * level.seconds}s")
+            )
+            tasks = tasks_api.find_tasks(name=level.task_name)
+            changed = False
+            if not tasks:
+                tasks_api.create_task(task_create_request=TaskCreateRequest(
+                    flux=flux, org=settings.influxdb_org, status="active"
+                ))
+            elif tasks[0].flux != flux:
+                tasks_api.update_task_request(tasks[0].id, TaskUpdateRequest(flux=flux))
+                changed = True
+
+            if (created or changed) and backfill_days > 0:
+                logger.info("Backfilling rollup bucket %s", level.bucket)
+                self.db_manager.query(build_task_flux(level, f"-{backfill_days}d"))
+            self._load_coverage(level)
+
+        self.ready = True
+
+    def _load_coverage(self, level: RollupLevel) -> None:
+        """Record from when a level holds mean/volume and candle fields."""
+        for field, coverage in (("price_count", self.coverage), ("open", self.candle_coverage)):
+            result = self.db_manager.query(build_coverage_flux(level, field))
+            first_ns = [datetime_to_ns(record.get_time()) for table in result for record in table.records]
+            if first_ns:
+                coverage[level.name] = min(first_ns)
+            else:
+                coverage.pop(level.name, None)
+
+    def mark_written(self, first_ns: int, last_ns: int) -> None:
+        """Flag the rollup windows of a write that the level tasks will not revisit.
+
+        A task re-aggregates the current and previous window of its level,
+        so only older windows are marked; once a level is dirty, every
+        coarser level built on it is too.
+        """
+        now_ns = time.time_ns()
+        marked_at = time.monotonic()
+        with self._lock:
+            dirty = False
+            for level in self.levels:
+                level_ns = level.seconds * _NS
+                horizon_ns = now_ns - now_ns % level_ns - level_ns
+                if not dirty and first_ns >= horizon_ns:
+                    continue
+
+                dirty = True
+                start_ns = first_ns - first_ns % level_ns
+                stop_ns = min(last_ns, horizon_ns - 1)
+                stop_ns = max(stop_ns - stop_ns % level_ns + level_ns, start_ns + level_ns)
+                entry = self._dirty.get(level.name)
+                if entry is None:
+                    self._dirty[level.name] = [start_ns, stop_ns, marked_at]
+                else:
+                    entry[0], entry[1], entry[2] = min(entry[0], start_ns), max(entry[1], stop_ns), marked_at
+
+    def refresh_dirty(self) -> None:
+        """Re-aggregate dirty windows, finest level first.
+
+        Only windows last marked ``settle_seconds`` ago are refreshed so
+        queued writes have landed; a coarser level waits for the finer ones.
+        """
+        settled = time.monotonic() - self.settle_seconds
+        for level in self.levels:
+            with self._lock:
+                entry = self._dirty.get(level.name)
+                if entry is not None and entry[2] > settled:
+                    return
+                if entry is None:
+                    continue
+                del self._dirty[level.name]
+
+            start_ns, stop_ns, marked_at = entry
+            try:
+                self.db_manager.query(build_task_flux(
+                    level, _format_flux_ns(int(start_ns)), _format_flux_ns(int(stop_ns))
+                ))
+            except Exception:
+                with self._lock:
+                    current = self._dirty.get(level.name)
+                    if current is None:
+                        self._dirty[level.name] = entry
+                    else:
+                        current[0], current[1] = min(current[0], start_ns), max(current[1], stop_ns)
+                raise
+
+    def select_level(self, interval: str, candles: bool = False) -> Optional[RollupLevel]:
+        """Return the coarsest level with stored data that evenly divides an interval."""
+        if not self.ready:
+            return None
+
+        coverage = self.candle_coverage if candles else self.coverage
+        seconds = INTERVAL_SECONDS[interval]
+        candidates = [level for level in self.levels if seconds % level.seconds == 0 and level.name in coverage]
+        return candidates[-1] if candidates else None
+
+    def plan(self, interval: str, start: datetime, stop: datetime, candles: bool = False) -> List[Segment]:
+        """Split a query range into raw and rollup segments.
+
+        The rollup serves whole query windows between the level's first
+        stored window and its watermark (the last window its task has
+        closed, less a settle lag); older and partial windows and the recent
+        tail read raw data, so results match a raw-only query. ``candles``
+        requires the level to hold the OHLC and price-volume fields.
+        """
+        level = self.select_level(interval, candles)
+        if level is None:
+            return [Segment(None, start, stop)]
+        coverage_ns = (self.candle_coverage if candles else self.coverage)[level.name]
+
+        interval_ns = INTERVAL_SECONDS[interval] * _NS
+        level_ns = level.seconds * _NS
+        watermark_ns = int((time.time() - self.settle_seconds) * _NS)
+        watermark_ns -= watermark_ns % level_ns
+
+        start_ns = datetime_to_ns(start.replace(microsecond=0))
+        stop_ns = datetime_to_ns(stop.replace(microsecond=0))
+        body_start_ns = -(-max(start_ns, coverage_ns) // interval_ns) * interval_ns
+        body_stop_ns = min(stop_ns, watermark_ns)
+        with self._lock:
+            dirty = self._dirty.get(level.name)
+            if dirty is not None:
+                body_stop_ns = min(body_stop_ns, int(dirty[0]))
+        body_stop_ns -= body_stop_ns % interval_ns
+        if body_stop_ns <= body_start_ns:
+            return [Segment(None, start, stop)]
+
+        segments = []
+        if start_ns < body_start_ns:
+            segments.append(Segment(None, start, ns_to_datetime(body_start_ns)))
+        segments.append(Segment(level, ns_to_datetime(body_start_ns), ns_to_datetime(body_stop_ns)))
+        if body_stop_ns < stop_ns:
+            segments.append(Segment(None, ns_to_datetime(body_stop_ns), stop))
+        return segments
@@ -1,11 +1,83 @@
 """Stock data service for handling business logic operations."""
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import re
+import textwrap
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
+import numpy as np
+import pyarrow as pa
 from influxdb_client import Point
 
+from app.core.async_database import async_db_manager
+from app.core.batch_writer import BatchWriter
+from app.core.config import settings
 from app.core.database import db_manager
-from app.models.stock_data import StockDataPoint, TimeRangeQuery, StockDataResponse
+from app.models.series import (
+    CandleSeries,
+    CandleSeriesBuilder,
+    StockSeries,
+    StockSeriesBuilder,
+    concat_series,
+    datetime_to_ns,
+    format_timestamps,
+    ns_to_datetime
+)
+from app.models.ticks import TickColumns
+from app.models.stock_data import (
+    INTERVAL_SECONDS,
+    CandleResponse,
+    IndicatorQuery,
+    IndicatorResponse,
+    MarketSnapshotResponse,
+    MultiSymbolQuery,
+    MultiSymbolResponse,
+    OHLCVBar,
+    StockDataPoint,
+    StockDataQuery,
+    TimeRangeQuery,
+    StockDataResponse,
+    SymbolMetadata,
+    SymbolSnapshot
+)
+from app.services.arrow_export import candles_to_table, series_to_table
+from app.services.downsampling import downsample_lttb
+from app.services.indicators import compute_indicator, warmup_windows
+from app.services.live_bars import LiveBarStore
+from app.services.market_snapshot import MarketSnapshotStore
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.query_cache import QueryCache
+from app.services.query_cost import QueryCostError, QueryCostGuard
+from app.services.rollups import ROLLUP_FIELDS, ROLLUP_MEASUREMENT, RollupManager, Segment, build_pv_flux
+from app.services.symbol_registry import SymbolRegistry
+from app.services.tick_buffer import LatestTickStore
+from app.services.tick_hub import TickHub
+from app.services.window_cache import WindowCache
+
+# Rollup fields read by candle queries
+CANDLE_FIELDS = ("open", "high", "low", "close", "volume", "pv_sum")
+
+# Query models the cost guard can plan
+QueryT = TypeVar("QueryT", TimeRangeQuery, MultiSymbolQuery)
+
+
+class TimeRangeResult(NamedTuple):
+    """A time range query as it was run, with its series and where the next page starts."""
+
+    query: TimeRangeQuery
+    series: StockSeries
+    requested_interval: Optional[str] = None
+    next_start_time: Optional[datetime] = None
+    next_cursor: Optional[str] = None
+
+
+class TimeRangeStream(NamedTuple):
+    """A time range query as it will be run, with its data points decoded lazily."""
+
+    query: TimeRangeQuery
+    points: Union[Iterator[Dict[str, Any]], AsyncIterator[Dict[str, Any]]]
+    requested_interval: Optional[str] = None
+    next_start_time: Optional[datetime] = None
 
 
 class StockDataService:
@@ -14,19 +86,139 @@ class StockDataService:
     def __init__(self):
         """Initialize the stock data service."""
         self.db_manager = db_manager
+        self.async_db_manager = async_db_manager
+        self.batch_writer = BatchWriter(
+            self._write_batch,
+            batch_size=settings.write_batch_size,
+            flush_interval=settings.write_flush_interval_ms / 1000,
+            max_queue_size=settings.write_queue_size,
+            enqueue_timeout=settings.write_enqueue_timeout_ms / 1000,
+            max_retries=settings.write_max_retries,
+            retry_backoff=settings.write_retry_backoff_ms / 1000
+        )
+        self.query_cache = QueryCache(
+            max_bytes=settings.query_cache_max_bytes,
+            ttl_seconds=settings.query_cache_ttl_seconds
+        )
+        self.window_cache = WindowCache(
+            max_bytes=settings.window_cache_max_bytes,
+            settle_seconds=settings.window_cache_settle_seconds,
+            max_age_seconds=settings.window_cache_max_age_seconds,
+            retention_seconds=settings.window_cache_retention_seconds
+        )
+        self.rollups = RollupManager(
+            self.db_manager,
+            level_names=settings.rollup_intervals,
+            settle_seconds=settings.rollup_settle_seconds
+        )
+        self.tick_store = LatestTickStore(
+            capacity=settings.latest_buffer_capacity,
+            resync_seconds=settings.latest_buffer_resync_seconds
+        )
+        self.symbol_registry = SymbolRegistry(resync_seconds=settings.symbol_registry_resync_seconds)
+        self.tick_hub = TickHub()
+        self.live_bars = LiveBarStore(INTERVAL_SECONDS, enabled=settings.live_bars_enabled)
+        self.market_snapshot = MarketSnapshotStore(resync_seconds=settings.snapshot_resync_seconds)
+        self.cost_guard = QueryCostGuard(max_rows=settings.query_max_rows, policy=settings.query_cost_policy)
 
     def store_data_point(self, data_point: StockDataPoint) -> None:
-        """Store a single stock data point in InfluxDB."""
-        point = Point("stock_data") \
-            .tag("symbol", data_point.symbol) \
-            .field("price", data_point.price) \
-            .field("volume", data_point.volume) \
-            .time(data_point.timestamp)
-
-        self.db_manager.write_point(point)
+        """Queue a single stock data point for a batched write to InfluxDB."""
+        self.batch_writer.submit(data_point)
+        self._invalidate_cached([data_point])
+        self._record_ticks([data_point])
 
     def store_data_batch(self, data_points: List[StockDataPoint]) -> None:
         """Store multiple stock data points in InfluxDB."""
+        self.db_manager.write_points(self._build_points(data_points))
+        self._invalidate_cached(data_points)
+        self._record_ticks(data_points)
+
+    async def store_data_point_async(self, data_point: StockDataPoint) -> None:
+        """Queue a single stock data point without blocking the event loop."""
+        await self.batch_writer.submit_async(data_point)
+        self._invalidate_cached([data_point])
+        self._record_ticks([data_point])
+
+    async def store_data_batch_async(self, data_points: List[StockDataPoint]) -> None:
+        """Store multiple stock data points in InfluxDB without blocking."""
+        await self.async_db_manager.write_points(self._build_points(data_points))
+        self._invalidate_cached(data_points)
+        self._record_ticks(data_points)
+
+    def store_tick_columns(self, columns: TickColumns) -> None:
+        """Store validated tick columns in InfluxDB as line protocol."""
+        if not len(columns):
+            return
+        self.db_manager.write_records(columns.to_line_protocol())
+        self._apply_tick_columns(columns)
+
+    async def store_tick_columns_async(self, columns: TickColumns) -> None:
+        """Store validated tick columns in InfluxDB without blocking."""
+        if not len(columns):
+            return
+        await self.async_db_manager.write_records(columns.to_line_protocol())
+        self._apply_tick_columns(columns)
+
+    def flush(self) -> None:
+        """Wait until all queued data points have been written."""
+        self.batch_writer.flush()
+
+    def close(self) -> None:
+        """Flush queued data points and stop the background writer."""
+        self.batch_writer.close()
+
+    def _write_batch(self, data_points: List[StockDataPoint]) -> None:
+        """Write a batch collected by the background writer."""
+        self.db_manager.write_points(self._build_points(data_points))
+        # Invalidate again: a query between enqueue and flush may have cached pre-write data
+        self._invalidate_cached(data_points)
+
+    def _invalidate_cached(self, data_points: List[StockDataPoint]) -> None:
+        """Drop cached results, unseal cached windows and mark rollup windows touched by a write."""
+        earliest: Dict[str, int] = {}
+        latest_ns = None
+        for data_point in data_points:
+            timestamp_ns = datetime_to_ns(data_point.timestamp)
+            if timestamp_ns < earliest.get(data_point.symbol, timestamp_ns + 1):
+                earliest[data_point.symbol] = timestamp_ns
+            if latest_ns is None or timestamp_ns > latest_ns:
+                latest_ns = timestamp_ns
+
+        for symbol, timestamp_ns in earliest.items():
+            self.query_cache.invalidate(symbol)
+            self.window_cache.invalidate(symbol, timestamp_ns)
+
+        if earliest:
+            self.rollups.mark_written(min(earliest.values()), latest_ns)
+
+    def _record_ticks(self, data_points: List[StockDataPoint]) -> None:
+        """Feed ingested ticks into the in-memory state: latest ticks, registry, subscribers and live bars."""
+        for data_point in data_points:
+            timestamp_ns = datetime_to_ns(data_point.timestamp)
+            self.tick_store.record(data_point.symbol, timestamp_ns, data_point.price, data_point.volume)
+            self.symbol_registry.record(data_point.symbol, timestamp_ns)
+            self.tick_hub.publish(data_point.symbol, timestamp_ns, data_point.price, data_point.volume)
+            self.live_bars.record(data_point.symbol, timestamp_ns, data_point.price, data_point.volume)
+            self.market_snapshot.record(data_point.symbol, timestamp_ns, data_point.price, data_point.volume)
+
+    def _apply_tick_columns(self, columns: TickColumns) -> None:
+        """Invalidate caches and update in-memory state for written tick columns."""
+        for symbol, series in columns.by_symbol():
+            first_ns, last_ns = int(series.timestamps.min()), int(series.timestamps.max())
+            self.query_cache.invalidate(symbol)
+            self.window_cache.invalidate(symbol, first_ns)
+            self.rollups.mark_written(first_ns, last_ns)
+            self.tick_store.record_series(symbol, series)
+            self.symbol_registry.record_many(symbol, first_ns, last_ns, len(series))
+            self.tick_hub.publish_series(symbol, series)
+            self.live_bars.record_series(symbol, series)
+            newest = int(np.argmax(series.timestamps))
+            self.market_snapshot.record(
+                symbol, int(series.timestamps[newest]), float(series.prices[newest]), int(series.volumes[newest])
+            )
+
+    def _build_points(self, data_points: List[StockDataPoint]) -> List[Point]:
+        """Convert data points into InfluxDB points."""
         points = []
         for data_point in data_points:
             point = Point("stock_data") \
@@ -35,23 +227,644 @@ class StockDataService:
                 .field("volume", data_point.volume) \
                 .time(data_point.timestamp)
             points.append(point)
+        return points
 
-        self.db_manager.write_points(points)
-
-    def query_data_by_time_range(self, query: TimeRangeQuery) -> StockDataResponse:
+    def query_data_by_time_range(self, query: StockDataQuery) -> StockDataResponse:
         """Query stock data by time range."""
-        # Get price data
-        price_query = self._build_flux_query(query)
-        price_result = self.db_manager.query(price_query)
-        price_data = self._process_price_results(price_result)
+        return self._build_time_range_response(self.query_series(query))
+
+    async def query_data_by_time_range_async(self, query: StockDataQuery) -> StockDataResponse:
+        """Query stock data by time range without blocking the event loop."""
+        return self._build_time_range_response(await self.query_series_async(query))
+
+    def query_data_columns(self, query: StockDataQuery) -> Dict[str, Any]:
+        """Query stock data by time range as a compact columnar payload."""
+        return self._build_columnar_payload(self.query_series(query))
+
+    async def query_data_columns_async(self, query: StockDataQuery) -> Dict[str, Any]:
+        """Query stock data by time range as a compact columnar payload without blocking the event loop."""
+        return self._build_columnar_payload(await self.query_series_async(query))
+
+    def query_data_table(self, query: StockDataQuery) -> pa.Table:
+        """Query stock data by time range as an Arrow table."""
+        result = self.query_series(query)
+        return series_to_table(result.series, self._table_metadata(
+            result.query, result.requested_interval, result.next_start_time, result.next_cursor
+        ))
+
+    async def query_data_table_async(self, query: StockDataQuery) -> pa.Table:
+        """Query stock data by time range as an Arrow table without blocking the event loop."""
+        result = await self.query_series_async(query)
+        return series_to_table(result.series, self._table_metadata(
+            result.query, result.requested_interval, result.next_start_time, result.next_cursor
+        ))
+
+    def query_series(self, query: StockDataQuery) -> TimeRangeResult:
+        """Run a time range query, or one page of it when ``page_size`` is set."""
+        if query.page_size is not None:
+            page_query = self._page_query(query)
+            series = self._read_series(page_query, self._build_page_flux(page_query))
+            return self._page_result(query, page_query, series)
+
+        planned, next_start_time = self._plan_query_cost(query)
+        series = self._merge_live_bar(planned, self._fetch_series(planned))
+        return TimeRangeResult(planned, self._downsample(planned, series), query.interval, next_start_time)
+
+    async def query_series_async(self, query: StockDataQuery) -> TimeRangeResult:
+        """Run a time range query, or one page of it, without blocking the event loop."""
+        if query.page_size is not None:
+            page_query = self._page_query(query)
+            series = await self._read_series_async(page_query, self._build_page_flux(page_query))
+            return self._page_result(query, page_query, series)
+
+        planned, next_start_time = self._plan_query_cost(query)
+        series = self._merge_live_bar(planned, await self._fetch_series_async(planned))
+        return TimeRangeResult(planned, self._downsample(planned, series), query.interval, next_start_time)
+
+    def _page_query(self, query: StockDataQuery) -> StockDataQuery:
+        """Narrow a paginated query to start where its cursor left off.
+
+        Windows are stamped with their stop time and start inclusive, so
+        the window after the cursor's starts exactly at the cursor.
+        """
+        if self.cost_guard.max_rows > 0 and query.page_size > self.cost_guard.max_rows:
+            raise QueryCostError(f"Page size must not exceed {self.cost_guard.max_rows}")
+        if query.cursor is None:
+            return query
+        after_ns = decode_cursor(query.cursor, query.symbol, query.interval)
+        return query.model_copy(update={"start_time": ns_to_datetime(after_ns)})
+
+    def _build_page_flux(self, query: StockDataQuery) -> str:
+        """Build the time range query limited to one page plus a row that tells whether another follows."""
+        return f"""{self._build_flux_query(query).rstrip()}
+            |> limit(n: {query.page_size + 1})
+        """
+
+    def _page_result(self, query: StockDataQuery, page_query: StockDataQuery, series: StockSeries) -> TimeRangeResult:
+        """Trim the look-ahead row of a page and issue the cursor of the next one."""
+        next_cursor = None
+        if len(series) > query.page_size:
+            series = series[:query.page_size]
+            next_cursor = encode_cursor(query.symbol, query.interval, int(series.timestamps[-1]))
+        return TimeRangeResult(page_query, self._downsample(page_query, series), next_cursor=next_cursor)
+
+    def _downsample(self, query: StockDataQuery, series: StockSeries) -> StockSeries:
+        """Reduce a series to the query's ``max_points``, if set."""
+        if query.max_points is None:
+            return series
+        return downsample_lttb(series, query.max_points)
+
+    def _plan_query_cost(
+        self,
+        query: QueryT,
+        symbols: Optional[List[str]] = None
+    ) -> Tuple[QueryT, Optional[datetime]]:
+        """Fit a query under the row limit, returning it with the start of the next page if it was cut short.
+
+        The estimate uses the tick rate the symbol registry has observed,
+        the fastest one for multi-symbol queries, and is scaled by the number
+        of symbols; raises ``QueryCostError`` when the query cannot be made to fit.
+        """
+        start_time, end_time = self._resolve_time_range(query)
+        symbols = symbols or [query.symbol]
+        rates = [stats.ticks_per_second if stats else None for stats in map(self.symbol_registry.get, symbols)]
+        decision = self.cost_guard.check(
+            start_time, end_time, query.interval, None if None in rates else max(rates), len(symbols)
+        )
+        if decision.action == "coarsen":
+            return query.model_copy(update={"interval": decision.interval}), None
+        if decision.action == "paginate":
+            page = query.model_copy(update={"start_time": start_time, "end_time": decision.end_time})
+            return page, decision.end_time
+        return query, None
+
+    def _fetch_series(self, query: TimeRangeQuery) -> StockSeries:
+        """Return the time range series, reading through the query cache."""
+        key = self._range_cache_key(query)
+        series = self.query_cache.get(key)
+        if series is None:
+            generation = self.query_cache.generation(query.symbol)
+            if self._is_incremental(query):
+                series = self._read_series_incremental(query)
+            else:
+                series = self._read_series(query)
+            self.query_cache.put(key, query.symbol, series, series.nbytes, generation)
+        return series
+
+    async def _fetch_series_async(self, query: TimeRangeQuery) -> StockSeries:
+        """Return the time range series asynchronously, reading through the query cache."""
+        key = self._range_cache_key(query)
+        series = self.query_cache.get(key)
+        if series is None:
+            generation = self.query_cache.generation(query.symbol)
+            if self._is_incremental(query):
+                series = await self._read_series_incremental_async(query)
+            else:
+                series = await self._read_series_async(query)
+            self.query_cache.put(key, query.symbol, series, series.nbytes, generation)
+        return series
+
+    def _read_series(self, query: TimeRangeQuery, flux_query: Optional[str] = None) -> StockSeries:
+        """Run the time range query, or ``flux_query`` in its place, and decode it into columnar arrays."""
+        builder = StockSeriesBuilder()
+        for record in self.db_manager.query_stream(flux_query or self._build_flux_query(query)):
+            builder.add_record(record)
+        return builder.build()
+
+    async def _read_series_async(self, query: TimeRangeQuery, flux_query: Optional[str] = None) -> StockSeries:
+        """Run the time range query, or ``flux_query`` in its place, asynchronously into columnar arrays."""
+        builder = StockSeriesBuilder()
+        async for record in self.async_db_manager.query_stream(flux_query or self._build_flux_query(query)):
+            builder.add_record(record)
+        return builder.build()
+
+    def _read_series_incremental(self, query: TimeRangeQuery) -> StockSeries:
+        """Read an open-ended range, fetching only windows after the cached sealed prefix."""
+        interval_ns, start_ns, now = self._incremental_bounds(query)
+        prefix, fetch_from_ns = self.window_cache.lookup(query.symbol, interval_ns, start_ns)
+        if self._live_bar_covers(query, fetch_from_ns):
+            tail = StockSeries.empty()
+        else:
+            tail = self._read_series(self._bounded_query(query, fetch_from_ns, now))
+        return self.window_cache.store(
+            query.symbol, interval_ns, start_ns, fetch_from_ns, prefix, tail, datetime_to_ns(now)
+        )
+
+    async def _read_series_incremental_async(self, query: TimeRangeQuery) -> StockSeries:
+        """Read an open-ended range asynchronously, fetching only the uncached tail."""
+        interval_ns, start_ns, now = self._incremental_bounds(query)
+        prefix, fetch_from_ns = self.window_cache.lookup(query.symbol, interval_ns, start_ns)
+        if self._live_bar_covers(query, fetch_from_ns):
+            tail = StockSeries.empty()
+        else:
+            tail = await self._read_series_async(self._bounded_query(query, fetch_from_ns, now))
+        return self.window_cache.store(
+            query.symbol, interval_ns, start_ns, fetch_from_ns, prefix, tail, datetime_to_ns(now)
+        )
+
+    def _live_bar_covers(self, query: TimeRangeQuery, fetch_from_ns: int) -> bool:
+        """Whether everything after ``fetch_from_ns`` is the current window and its live bar is complete.
+
+        The bar itself is added by ``_merge_live_bar``, so the database read can be skipped.
+        """
+        bar = self.live_bars.current(query.symbol, query.interval)
+        return bar is not None and self.live_bars.is_complete(bar) and fetch_from_ns >= bar.start_ns
+
+    def _merge_live_bar(self, query: TimeRangeQuery, series: StockSeries) -> StockSeries:
+        """Replace the current, partial window of an open-ended query with its live bar.
+
+        Like ``aggregateWindow`` on a range ending now, the row is stamped
+        with the current second. Only complete bars are merged, and only
+        when the query covers their whole window.
+        """
+        if query.end_time is not None:
+            return series
+
+        now_ns = time.time_ns()
+        bar = self.live_bars.current(query.symbol, query.interval, now_ns)
+        if bar is None or not self.live_bars.is_complete(bar):
+            return series
+        if query.start_time is not None and datetime_to_ns(query.start_time) > bar.start_ns:
+            return series
+
+        head_ns = min(bar.start_ns + INTERVAL_SECONDS[query.interval] * 1_000_000_000, now_ns - now_ns % 1_000_000_000)
+        if head_ns <= bar.start_ns:
+            head_ns = now_ns
+        body = series[:int(np.searchsorted(series.timestamps, bar.start_ns, side="right"))]
+        return concat_series([body, StockSeries([head_ns], [bar.mean_price], [bar.volume])])
+
+    def get_current_bar(self, symbol: str, interval: str) -> Optional[OHLCVBar]:
+        """Get the live OHLCV bar of the current window, or None if no tick has landed in it."""
+        bar = self.live_bars.current(symbol, interval)
+        if bar is None:
+            return None
+
+        return OHLCVBar(
+            symbol=symbol,
+            interval=interval,
+            start=ns_to_datetime(bar.start_ns),
+            end=ns_to_datetime(bar.start_ns + INTERVAL_SECONDS[interval] * 1_000_000_000),
+            open=bar.open,
+            high=bar.high,
+            low=bar.low,
+            close=bar.close,
+            volume=bar.volume,
+            trade_count=bar.count,
+            complete=self.live_bars.is_complete(bar)
+        )
+
+    def _is_incremental(self, query: TimeRangeQuery) -> bool:
+        """Whether a query is open-ended and interval-aligned, so sealed windows can be reused."""
+        if not self.window_cache.enabled or query.end_time is not None:
+            return False
+        if query.start_time is None:
+            return True
+        interval_ns = INTERVAL_SECONDS[query.interval] * 1_000_000_000
+        return datetime_to_ns(query.start_time) % interval_ns == 0
+
+    def _incremental_bounds(self, query: TimeRangeQuery) -> Tuple[int, int, datetime]:
+        """Return the interval, aligned start and current time for an incremental read.
+
+        A defaulted start is rounded down to the interval so the first window
+        is complete and can be sealed like every other.
+        """
+        interval_ns = INTERVAL_SECONDS[query.interval] * 1_000_000_000
+        now = datetime.utcnow().replace(microsecond=0)
+        start_time = query.start_time or now - timedelta(days=7)
+        start_ns = WindowCache.align(datetime_to_ns(start_time), interval_ns)
+        return interval_ns, start_ns, now
+
+    def _bounded_query(self, query: TimeRangeQuery, start_ns: int, end_time: datetime) -> TimeRangeQuery:
+        """Copy a query with an explicit start and end."""
+        return query.model_copy(update={"start_time": ns_to_datetime(start_ns), "end_time": end_time})
+
+    def _range_cache_key(self, query: TimeRangeQuery) -> Tuple[Any, ...]:
+        """Build the cache key for a time range query.
+
+        Explicit bounds are normalized to the second-resolution UTC strings
+        sent to Flux; open bounds stay ``None`` and are refreshed by the TTL.
+        """
+        start = self._format_flux_time(query.start_time) if query.start_time else None
+        end = self._format_flux_time(query.end_time) if query.end_time else None
+        return ("range", query.symbol, start, end, query.interval)
+
+    def stream_data_by_time_range(self, query: TimeRangeQuery) -> TimeRangeStream:
+        """Plan a time range query and stream its data points as they are decoded from InfluxDB."""
+        planned, next_start_time = self._plan_query_cost(query)
+        records = self.db_manager.query_stream(self._build_flux_query(planned))
+        return TimeRangeStream(planned, self._iter_data_points(records), query.interval, next_start_time)
+
+    async def stream_data_by_time_range_async(self, query: TimeRangeQuery) -> TimeRangeStream:
+        """Plan a time range query and stream its data points without blocking the event loop."""
+        planned, next_start_time = self._plan_query_cost(query)
+        points = self._iter_data_points_async(self.async_db_manager.query_stream(self._build_flux_query(planned)))
+        return TimeRangeStream(planned, points, query.interval, next_start_time)
+
+    async def _iter_data_points_async(self, records: AsyncIterator[Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Convert an async stream of pivoted records into data points one at a time."""
+        async for record in records:
+            yield self._to_data_point(record)
+
+    def query_multi_symbol(self, query: MultiSymbolQuery) -> MultiSymbolResponse:
+        """Query several symbols by time range with one grouped Flux query."""
+        symbols = query.symbols or self._match_symbol_pattern(query.symbol_pattern, self.get_available_symbols())
+        builders: Dict[str, StockSeriesBuilder] = {}
+        planned, next_start_time = self._plan_query_cost(query, symbols) if symbols else (query, None)
+        if symbols:
+            for record in self.db_manager.query_stream(self._build_multi_symbol_query(planned, symbols)):
+                self._add_symbol_record(builders, record)
+        return self._build_multi_symbol_response(planned, builders, query.interval, next_start_time)
+
+    async def query_multi_symbol_async(self, query: MultiSymbolQuery) -> MultiSymbolResponse:
+        """Query several symbols by time range without blocking the event loop."""
+        symbols = query.symbols or self._match_symbol_pattern(
+            query.symbol_pattern, await self.get_available_symbols_async()
+        )
+        builders: Dict[str, StockSeriesBuilder] = {}
+        planned, next_start_time = self._plan_query_cost(query, symbols) if symbols else (query, None)
+        if symbols:
+            async for record in self.async_db_manager.query_stream(self._build_multi_symbol_query(planned, symbols)):
+                self._add_symbol_record(builders, record)
+        return self._build_multi_symbol_response(planned, builders, query.interval, next_start_time)
+
+    def _match_symbol_pattern(self, pattern: str, known: List[str]) -> List[str]:
+        """Return the known symbols a pattern matches anywhere, as Flux's ``=~`` would.
+
+        Matching happens here rather than in Flux so the pattern is never
+        interpolated into a query.
+        """
+        regex = re.compile(pattern)
+        return [symbol for symbol in known if symbol.isalpha() and regex.search(symbol)]
+
+    def _build_multi_symbol_query(self, query: MultiSymbolQuery, symbols: List[str]) -> str:
+        """Build the grouped Flux query for a multi-symbol request."""
+        return self._build_flux_query(query, self._symbol_filter(symbols))
+
+    def _add_symbol_record(self, builders: Dict[str, StockSeriesBuilder], record: Any) -> None:
+        """Route a pivoted record to the series builder of its symbol."""
+        symbol = record.values.get("symbol")
+        builder = builders.get(symbol)
+        if builder is None:
+            builder = builders[symbol] = StockSeriesBuilder()
+        builder.add_record(record)
+
+    def _build_multi_symbol_response(
+        self,
+        query: MultiSymbolQuery,
+        builders: Dict[str, StockSeriesBuilder],
+        requested_interval: Optional[str] = None,
+        next_start_time: Optional[datetime] = None
+    ) -> MultiSymbolResponse:
+        """Split grouped results into one time range response per symbol.
+
+        Listed symbols without data get an empty response; pattern queries
+        only return the symbols that matched.
+        """
+        symbols = query.symbols or sorted(builders)
+        results = []
+        for symbol in symbols:
+            symbol_query = TimeRangeQuery(
+                symbol=symbol,
+                start_time=query.start_time,
+                end_time=query.end_time,
+                interval=query.interval
+            )
+            builder = builders.get(symbol)
+            series = builder.build() if builder is not None else StockSeries.empty()
+            results.append(self._build_time_range_response(TimeRangeResult(
+                symbol_query, self._merge_live_bar(symbol_query, series), requested_interval, next_start_time
+            )))
+
+        return MultiSymbolResponse(
+            results=results,
+            total_symbols=len(results),
+            time_range=self._determine_time_range(query),
+            interval=query.interval,
+            requested_interval=requested_interval if requested_interval != query.interval else None,
+            next_start_time=next_start_time
+        )
+
+    def query_candles(self, query: TimeRangeQuery) -> CandleResponse:
+        """Query OHLC candles with volume and VWAP by time range."""
+        planned, candles, next_start_time = self.query_candle_series(query)
+        return self._build_candle_response(planned, candles, query.interval, next_start_time)
+
+    async def query_candles_async(self, query: TimeRangeQuery) -> CandleResponse:
+        """Query OHLC candles by time range without blocking the event loop."""
+        planned, candles, next_start_time = await self.query_candle_series_async(query)
+        return self._build_candle_response(planned, candles, query.interval, next_start_time)
+
+    def query_candles_table(self, query: TimeRangeQuery) -> pa.Table:
+        """Query OHLC candles by time range as an Arrow table."""
+        planned, candles, next_start_time = self.query_candle_series(query)
+        return candles_to_table(candles, self._table_metadata(planned, query.interval, next_start_time))
+
+    async def query_candles_table_async(self, query: TimeRangeQuery) -> pa.Table:
+        """Query OHLC candles by time range as an Arrow table without blocking the event loop."""
+        planned, candles, next_start_time = await self.query_candle_series_async(query)
+        return candles_to_table(candles, self._table_metadata(planned, query.interval, next_start_time))
+
+    def query_candle_series(self, query: TimeRangeQuery) -> Tuple[TimeRangeQuery, CandleSeries, Optional[datetime]]:
+        """Run a candle query, returning the query as run, its candles and the start of the next page."""
+        query, next_start_time = self._plan_query_cost(query)
+        key = ("candles",) + self._range_cache_key(query)[1:]
+        candles = self.query_cache.get(key)
+        if candles is None:
+            generation = self.query_cache.generation(query.symbol)
+            builder = CandleSeriesBuilder()
+            for record in self.db_manager.query_stream(self._build_candle_query(query)):
+                builder.add_record(record)
+            candles = builder.build()
+            self.query_cache.put(key, query.symbol, candles, candles.nbytes, generation)
+        return query, candles, next_start_time
+
+    async def query_candle_series_async(
+        self, query: TimeRangeQuery
+    ) -> Tuple[TimeRangeQuery, CandleSeries, Optional[datetime]]:
+        """Run a candle query asynchronously, returning the query as run, its candles and the next page start."""
+        query, next_start_time = self._plan_query_cost(query)
+        key = ("candles",) + self._range_cache_key(query)[1:]
+        candles = self.query_cache.get(key)
+        if candles is None:
+            generation = self.query_cache.generation(query.symbol)
+            builder = CandleSeriesBuilder()
+            async for record in self.async_db_manager.query_stream(self._build_candle_query(query)):
+                builder.add_record(record)
+            candles = builder.build()
+            self.query_cache.put(key, query.symbol, candles, candles.nbytes, generation)
+        return query, candles, next_start_time
+
+    def _build_candle_response(
+        self,
+        query: TimeRangeQuery,
+        candles: CandleSeries,
+        requested_interval: Optional[str] = None,
+        next_start_time: Optional[datetime] = None
+    ) -> CandleResponse:
+        """Build the response for a candle query."""
+        return CandleResponse(
+            symbol=query.symbol,
+            candles=candles.to_candles(),
+            total_candles=len(candles),
+            time_range=self._determine_time_range(query),
+            interval=query.interval,
+            requested_interval=requested_interval if requested_interval != query.interval else None,
+            next_start_time=next_start_time
+        )
+
+    def _build_candle_query(self, query: TimeRangeQuery) -> str:
+        """Build a single Flux query computing OHLC, volume and VWAP per window.
+
+        VWAP is the windowed sum of price times volume over the summed
+        volume (the close when a window traded no volume). Whole windows
+        older than the rollup watermark are read from rollup buckets.
+        """
+        start_time, end_time = self._resolve_time_range(query)
+        segments = self.rollups.plan(query.interval, start_time, end_time, candles=True)
+
+        streams = "".join(
+            self._build_candle_segment_flux(f"segment_{index}", query, segment)
+            for index, segment in enumerate(segments)
+        )
+        names = ", ".join(f"segment_{index}" for index in range(len(segments)))
+
+        return f'''{streams}
+        union(tables: [{names}])
+            |> group(columns: ["symbol"])
+            |> sort(columns: ["_time"])
+            |> map(fn: (r) => ({{r with
+                vwap: if r.volume > 0 then r.pv_sum / float(v: r.volume) else r.close
+            }}))
+        '''
+
+    def _build_candle_segment_flux(self, name: str, query: TimeRangeQuery, segment: Segment) -> str:
+        """Build a named Flux stream of pivoted candle windows for one range segment."""
+        start_str = self._format_flux_time(segment.start)
+        end_str = self._format_flux_time(segment.stop)
+        columns = '"_time", "symbol", ' + ", ".join(f'"{field}"' for field in CANDLE_FIELDS)
+
+        if segment.level is None:
+            prices = "".join(
+                f'''
+                {name}_price
+                    |> aggregateWindow(every: {query.interval}, fn: {ROLLUP_FIELDS[field]}, createEmpty: false)
+                    |> set(key: "_field", value: "{field}"),'''
+                for field in ("open", "high", "low", "close")
+            )
+            return f'''
+        {name}_data = from(bucket: "stock_data")
+            |> range(start: {start_str}, stop: {end_str})
+            |> filter(fn: (r) => r["_measurement"] == "stock_data")
+            |> filter(fn: (r) => r["symbol"] == "{query.symbol}")
+
+        {name}_price = {name}_data |> filter(fn: (r) => r["_field"] == "price")
+
+        {textwrap.indent(build_pv_flux(f"{name}_pv", f"{name}_data"), " " * 8).lstrip()}
+        {name} = union(tables: [{prices}
+                {name}_data
+                    |> filter(fn: (r) => r["_field"] == "volume")
+                    |> aggregateWindow(every: {query.interval}, fn: sum, createEmpty: false),
+                {name}_pv
+                    |> aggregateWindow(every: {query.interval}, fn: sum, createEmpty: false),
+            ])
+            |> group(columns: ["symbol"])
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> keep(columns: [{columns}])
+        '''
+
+        fields = "".join(
+            f'''
+                {name}_data
+                    |> filter(fn: (r) => r["_field"] == "{field}")
+                    |> aggregateWindow(every: {query.interval}, fn: {ROLLUP_FIELDS[field]}, createEmpty: false),'''
+            for field in CANDLE_FIELDS
+        )
+        return f'''
+        {name}_data = from(bucket: "{segment.level.bucket}")
+            |> range(start: {start_str}, stop: {end_str})
+            |> filter(fn: (r) => r["_measurement"] == "{ROLLUP_MEASUREMENT}")
+            |> filter(fn: (r) => r["symbol"] == "{query.symbol}")
+
+        {name} = union(tables: [{fields}
+            ])
+            |> group(columns: ["symbol"])
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> keep(columns: [{columns}])
+        '''
+
+    def query_indicators(self, query: IndicatorQuery) -> IndicatorResponse:
+        """Compute technical indicators over a time range, fetching warm-up windows before it."""
+        planned, warm_query, next_start_time = self._plan_indicator_query(query)
+        series = self._merge_live_bar(warm_query, self._fetch_series(warm_query))
+        return self._build_indicator_response(planned, series, query.interval, next_start_time)
+
+    async def query_indicators_async(self, query: IndicatorQuery) -> IndicatorResponse:
+        """Compute technical indicators without blocking the event loop."""
+        planned, warm_query, next_start_time = self._plan_indicator_query(query)
+        series = self._merge_live_bar(warm_query, await self._fetch_series_async(warm_query))
+        return self._build_indicator_response(planned, series, query.interval, next_start_time)
+
+    def _plan_indicator_query(self, query: IndicatorQuery) -> Tuple[IndicatorQuery, TimeRangeQuery, Optional[datetime]]:
+        """Fit an indicator query, warm-up windows included, under the row limit.
 
-        # Get volume data
-        volume_query = self._build_volume_query(query)
-        volume_result = self.db_manager.query(volume_query)
-        volume_data = self._process_volume_results(volume_result)
+        Returns the indicator query as it will be answered, its price query
+        and the start of the next page if the range was cut short.
+        """
+        warm_query, next_start_time = self._plan_query_cost(self._warmup_query(query))
+        while warm_query.interval != query.interval:
+            # Warm-up spans a number of windows, so it grows with the interval; check it again
+            query = query.model_copy(update={"interval": warm_query.interval})
+            warm_query, next_start_time = self._plan_query_cost(self._warmup_query(query))
 
-        # Combine price and volume data
-        data_points = self._combine_price_and_volume(price_data, volume_data)
+        if next_start_time is not None:
+            start_time, _ = self._resolve_time_range(query)
+            if next_start_time <= start_time:
+                raise QueryCostError("Indicator warm-up alone would exceed the row limit")
+            query = query.model_copy(update={"start_time": start_time, "end_time": next_start_time})
+        return query, warm_query, next_start_time
+
+    def _warmup_query(self, query: IndicatorQuery) -> TimeRangeQuery:
+        """Build the price query for an indicator query, starting early enough to warm up every indicator."""
+        start_time, _ = self._resolve_time_range(query)
+        windows = max(warmup_windows(spec.name, spec.period) for spec in query.indicators)
+        warmup = timedelta(seconds=windows * INTERVAL_SECONDS[query.interval])
+        return TimeRangeQuery(
+            symbol=query.symbol,
+            start_time=start_time - warmup,
+            end_time=query.end_time,
+            interval=query.interval
+        )
+
+    def _build_indicator_response(
+        self,
+        query: IndicatorQuery,
+        series: StockSeries,
+        requested_interval: Optional[str] = None,
+        next_start_time: Optional[datetime] = None
+    ) -> IndicatorResponse:
+        """Compute the requested indicators and keep only the windows inside the query range."""
+        start_time, _ = self._resolve_time_range(query)
+        first = int(np.searchsorted(series.timestamps, datetime_to_ns(start_time), side="right"))
+
+        indicators: Dict[str, List[Optional[float]]] = {}
+        for spec in query.indicators:
+            for name, values in compute_indicator(spec.name, series, spec.period, spec.num_std).items():
+                values = values[first:]
+                indicators[name] = np.where(np.isfinite(values), values, None).tolist()
+
+        return IndicatorResponse(
+            symbol=query.symbol,
+            timestamps=format_timestamps(series.timestamps[first:]),
+            indicators=indicators,
+            time_range=self._determine_time_range(query),
+            interval=query.interval,
+            requested_interval=requested_interval if requested_interval != query.interval else None,
+            next_start_time=next_start_time
+        )
+
+    def query_latest_data(self, symbol: str, limit: int = 100) -> StockDataResponse:
+        """Query the latest stock data for a symbol.
+
+        Served from the in-memory tick buffer, which is backfilled from
+        InfluxDB on first use; limits beyond the buffer capacity query
+        InfluxDB directly.
+        """
+        series = self.tick_store.latest(symbol, limit)
+        if series is None and self.tick_store.enabled and limit <= self.tick_store.capacity:
+            loaded = self._read_latest_series(symbol, self.tick_store.capacity)
+            self.tick_store.backfill(symbol, loaded)
+            series = self.tick_store.latest(symbol, limit)
+            if series is None and not len(loaded):
+                # Nothing is buffered for a symbol without ticks
+                series = loaded
+
+        if series is None:
+            key = ("latest", symbol, limit)
+            series = self.query_cache.get(key)
+            if series is None:
+                generation = self.query_cache.generation(symbol)
+                series = self._read_latest_series(symbol, limit)[::-1]
+                self.query_cache.put(key, symbol, series, series.nbytes, generation)
+        return self._build_latest_response(symbol, series)
+
+    async def query_latest_data_async(self, symbol: str, limit: int = 100) -> StockDataResponse:
+        """Query the latest stock data for a symbol without blocking the event loop."""
+        series = self.tick_store.latest(symbol, limit)
+        if series is None and self.tick_store.enabled and limit <= self.tick_store.capacity:
+            loaded = await self._read_latest_series_async(symbol, self.tick_store.capacity)
+            self.tick_store.backfill(symbol, loaded)
+            series = self.tick_store.latest(symbol, limit)
+            if series is None and not len(loaded):
+                # Nothing is buffered for a symbol without ticks
+                series = loaded
+
+        if series is None:
+            key = ("latest", symbol, limit)
+            series = self.query_cache.get(key)
+            if series is None:
+                generation = self.query_cache.generation(symbol)
+                series = (await self._read_latest_series_async(symbol, limit))[::-1]
+                self.query_cache.put(key, symbol, series, series.nbytes, generation)
+        return self._build_latest_response(symbol, series)
+
+    def _read_latest_series(self, symbol: str, limit: int) -> StockSeries:
+        """Read the newest ``limit`` raw ticks of a symbol, oldest first."""
+        builder = StockSeriesBuilder()
+        for record in self.db_manager.query_stream(self._build_latest_query(symbol, limit)):
+            builder.add_record(record)
+        return builder.build()
+
+    async def _read_latest_series_async(self, symbol: str, limit: int) -> StockSeries:
+        """Read the newest ``limit`` raw ticks of a symbol asynchronously, oldest first."""
+        builder = StockSeriesBuilder()
+        async for record in self.async_db_manager.query_stream(self._build_latest_query(symbol, limit)):
+            builder.add_record(record)
+        return builder.build()
+
+    def _build_time_range_response(self, result: TimeRangeResult) -> StockDataResponse:
+        """Build the response for a time range query, reporting an interval the cost guard replaced."""
+        query = result.query
+        data_points = result.series.to_data_points()
 
         # Determine time range
         time_range = self._determine_time_range(query)
@@ -61,175 +874,447 @@ class StockDataService:
             data_points=data_points,
             total_points=len(data_points),
             time_range=time_range,
-            interval=query.interval
+            interval=query.interval,
+            requested_interval=result.requested_interval if result.requested_interval != query.interval else None,
+            next_start_time=result.next_start_time,
+            next_cursor=result.next_cursor
         )
 
-    def query_latest_data(self, symbol: str, limit: int = 100) -> StockDataResponse:
-        """Query the latest stock data for a symbol."""
-        query = TimeRangeQuery(
-            symbol=symbol,
-            interval="1m"
-        )
+    def _build_columnar_payload(self, result: TimeRangeResult) -> Dict[str, Any]:
+        """Build a time range response with parallel ``t``/``p``/``v`` arrays instead of data points.
 
-        # Build Flux query for latest data
-        flux_query = f'''
+        Values are left as NumPy arrays for the serializer; nothing is validated per element.
+        """
+        query = result.query
+        return {
+            "symbol": query.symbol,
+            **result.series.to_columns(),
+            "total_points": len(result.series),
+            "time_range": self._determine_time_range(query),
+            "interval": query.interval,
+            "requested_interval": result.requested_interval if result.requested_interval != query.interval else None,
+            "next_start_time": result.next_start_time,
+            "next_cursor": result.next_cursor
+        }
+
+    def _table_metadata(
+        self,
+        query: TimeRangeQuery,
+        requested_interval: Optional[str] = None,
+        next_start_time: Optional[datetime] = None,
+        next_cursor: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Describe a query in Arrow schema metadata, mirroring the JSON response fields."""
+        time_range = self._determine_time_range(query)
+        metadata = {
+            "symbol": query.symbol,
+            "interval": query.interval,
+            "start": time_range["start"].isoformat(),
+            "end": time_range["end"].isoformat(),
+        }
+        if requested_interval is not None and requested_interval != query.interval:
+            metadata["requested_interval"] = requested_interval
+        if next_start_time is not None:
+            metadata["next_start_time"] = next_start_time.isoformat()
+        if next_cursor is not None:
+            metadata["next_cursor"] = next_cursor
+        return metadata
+
+    def _build_latest_query(self, symbol: str, limit: int) -> str:
+        """Build Flux query string for the newest raw ticks of a symbol.
+
+        Each field is cut to its last ``limit`` values before the pivot, so
+        only those rows are joined rather than the whole lookback.
+        """
+        return f'''
         from(bucket: "stock_data")
-            |> range(start: -1h)
+            |> range(start: -{settings.latest_lookback_days}d)
             |> filter(fn: (r) => r["_measurement"] == "stock_data")
             |> filter(fn: (r) => r["symbol"] == "{symbol}")
-            |> sort(columns: ["_time"], desc: true)
-            |> limit(n: {limit})
+            |> filter(fn: (r) => r["_field"] == "price" or r["_field"] == "volume")
+            |> tail(n: {limit})
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> sort(columns: ["_time"])
+            |> tail(n: {limit})
         '''
 
-        result = self.db_manager.query(flux_query)
-        data_points = self._process_query_results(result)
+    def _build_latest_response(self, symbol: str, series: StockSeries) -> StockDataResponse:
+        """Build the response for a latest data query from ticks ordered newest first."""
+        if len(series):
+            time_range = {
+                "start": ns_to_datetime(int(series.timestamps[-1])),
+                "end": ns_to_datetime(int(series.timestamps[0]))
+            }
+        else:
+            time_range = {"start": datetime.utcnow() - timedelta(hours=1), "end": datetime.utcnow()}
 
+        data_points = series.to_data_points()
         return StockDataResponse(
             symbol=symbol,
             data_points=data_points,
             total_points=len(data_points),
-            time_range={"start": datetime.utcnow() - timedelta(hours=1), "end": datetime.utcnow()},
+            time_range=time_range,
             interval="1m"
         )
 
-    def _build_flux_query(self, query: TimeRangeQuery) -> str:
-        """Build Flux query string for time range queries."""
-        start_time = query.start_time or datetime.utcnow() - timedelta(days=7)
-        end_time = query.end_time or datetime.utcnow()
+    def _build_flux_query(
+        self,
+        query: Union[TimeRangeQuery, MultiSymbolQuery],
+        symbol_filter: Optional[str] = None
+    ) -> str:
+        """Build a single Flux query aggregating price and volume per window.
 
-        # Format datetime for Flux query (RFC3339 format)
-        start_str = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-        end_str = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        Price is averaged and volume summed over each window, then both
+        fields are pivoted into one row per window timestamp and symbol.
+        When rollups are enabled, whole windows older than the rollup
+        watermark are read from the coarsest suitable rollup bucket instead
+        of raw ticks. ``symbol_filter`` replaces the filter on
+        ``query.symbol``.
+        """
+        symbol_filter = symbol_filter or self._symbol_filter([query.symbol])
+        start_time, end_time = self._resolve_time_range(query)
+        segments = self.rollups.plan(query.interval, start_time, end_time)
 
-        return f'''
-        from(bucket: "stock_data")
+        if len(segments) == 1 and segments[0].level is None:
+            # Format datetime for Flux query (RFC3339 format)
+            start_str = self._format_flux_time(start_time)
+            end_str = self._format_flux_time(end_time)
+
+            return f'''
+        data = from(bucket: "stock_data")
             |> range(start: {start_str}, stop: {end_str})
             |> filter(fn: (r) => r["_measurement"] == "stock_data")
-            |> filter(fn: (r) => r["symbol"] == "{query.symbol}")
+            |> filter(fn: (r) => {symbol_filter})
+
+        price = data
             |> filter(fn: (r) => r["_field"] == "price")
             |> aggregateWindow(every: {query.interval}, fn: mean, createEmpty: false)
+
+        volume = data
+            |> filter(fn: (r) => r["_field"] == "volume")
+            |> aggregateWindow(every: {query.interval}, fn: sum, createEmpty: false)
+
+        union(tables: [price, volume])
+            |> group(columns: ["symbol"])
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
             |> sort(columns: ["_time"])
         '''
 
-    def _build_volume_query(self, query: TimeRangeQuery) -> str:
-        """Build Flux query string for volume data."""
-        start_time = query.start_time or datetime.utcnow() - timedelta(days=7)
-        end_time = query.end_time or datetime.utcnow()
+        streams = "".join(
+            self._build_segment_flux(f"segment_{index}", query, segment, symbol_filter)
+            for index, segment in enumerate(segments)
+        )
+        names = ", ".join(f"segment_{index}" for index in range(len(segments)))
 
-        # Format datetime for Flux query (RFC3339 format)
-        start_str = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-        end_str = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return f'''{streams}
+        union(tables: [{names}])
+            |> group(columns: ["symbol"])
+            |> sort(columns: ["_time"])
+        '''
 
-        return f'''
-        from(bucket: "stock_data")
+    def _build_segment_flux(
+        self,
+        name: str,
+        query: Union[TimeRangeQuery, MultiSymbolQuery],
+        segment: Segment,
+        symbol_filter: str
+    ) -> str:
+        """Build a named Flux stream of pivoted price/volume windows for one range segment."""
+        start_str = self._format_flux_time(segment.start)
+        end_str = self._format_flux_time(segment.stop)
+
+        if segment.level is None:
+            return f'''
+        {name}_data = from(bucket: "stock_data")
             |> range(start: {start_str}, stop: {end_str})
             |> filter(fn: (r) => r["_measurement"] == "stock_data")
-            |> filter(fn: (r) => r["symbol"] == "{query.symbol}")
-            |> filter(fn: (r) => r["_field"] == "volume")
+            |> filter(fn: (r) => {symbol_filter})
+
+        {name} = union(tables: [
+                {name}_data
+                    |> filter(fn: (r) => r["_field"] == "price")
+                    |> aggregateWindow(every: {query.interval}, fn: mean, createEmpty: false),
+                {name}_data
+                    |> filter(fn: (r) => r["_field"] == "volume")
+                    |> aggregateWindow(every: {query.interval}, fn: sum, createEmpty: false),
+            ])
+            |> group(columns: ["symbol"])
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> keep(columns: ["_time", "symbol", "price", "volume"])
+        '''
+
+        return f'''
+        {name} = from(bucket: "{segment.level.bucket}")
+            |> range(start: {start_str}, stop: {end_str})
+            |> filter(fn: (r) => r["_measurement"] == "{ROLLUP_MEASUREMENT}")
+            |> filter(fn: (r) => {symbol_filter})
+            |> filter(fn: (r) => r["_field"] == "price_sum" or r["_field"] == "price_count" or r["_field"] == "volume")
             |> aggregateWindow(every: {query.interval}, fn: sum, createEmpty: false)
-            |> sort(columns: ["_time"])
+            |> group(columns: ["symbol"])
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> map(fn: (r) => ({{
+                _time: r._time,
+                symbol: r.symbol,
+                price: r.price_sum / float(v: r.price_count),
+                volume: r.volume
+            }}))
         '''
 
-    def _process_query_results(self, result: List[Any]) -> List[Dict[str, Any]]:
-        """Process InfluxDB query results into a standardized format."""
-        data_points = []
+    def _symbol_filter(self, symbols: List[str]) -> str:
+        """Build a Flux predicate matching a list of symbols."""
+        return " or ".join(f'r["symbol"] == "{symbol}"' for symbol in symbols)
 
-        for table in result:
-            for record in table.records:
-                # With pivot, we get both price and volume in the same record
-                data_point = {
-                    "timestamp": record.get_time().isoformat(),
-                    "price": record.values.get("price", 0),
-                    "volume": record.values.get("volume", 0)
-                }
-                data_points.append(data_point)
-
-        return data_points
-
-    def _process_price_results(self, result: List[Any]) -> List[Dict[str, Any]]:
-        """Process InfluxDB query results for price data."""
-        price_data = []
-        for table in result:
-            for record in table.records:
-                price_data.append({
-                    "timestamp": record.get_time().isoformat(),
-                    "price": record.get_value()
-                })
-        return price_data
-
-    def _process_volume_results(self, result: List[Any]) -> List[Dict[str, Any]]:
-        """Process InfluxDB query results for volume data."""
-        volume_data = []
-        for table in result:
-            for record in table.records:
-                volume_data.append({
-                    "timestamp": record.get_time().isoformat(),
-                    "volume": record.get_value()
-                })
-        return volume_data
-
-    def _combine_price_and_volume(self, price_data: List[Dict[str, Any]], volume_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Combine price and volume data points based on timestamp."""
-        combined_data = []
-        price_index = 0
-        volume_index = 0
-
-        while price_index < len(price_data) and volume_index < len(volume_data):
-            price_point = price_data[price_index]
-            volume_point = volume_data[volume_index]
-
-            if price_point["timestamp"] == volume_point["timestamp"]:
-                combined_data.append({
-                    "timestamp": price_point["timestamp"],
-                    "price": price_point["price"],
-                    "volume": volume_point["volume"]
-                })
-                price_index += 1
-                volume_index += 1
-            elif price_point["timestamp"] < volume_point["timestamp"]:
-                combined_data.append(price_point)
-                price_index += 1
-            else:
-                combined_data.append(volume_point)
-                volume_index += 1
+    def _resolve_time_range(self, query: Union[TimeRangeQuery, MultiSymbolQuery]) -> Tuple[datetime, datetime]:
+        """Resolve the query time range, defaulting to the last 7 days."""
+        start_time = query.start_time or datetime.utcnow() - timedelta(days=7)
+        end_time = query.end_time or datetime.utcnow()
+        return start_time, end_time
 
-        # Add remaining price points
-        while price_index < len(price_data):
-            combined_data.append(price_data[price_index])
-            price_index += 1
+    def _format_flux_time(self, value: datetime) -> str:
+        """Format a datetime as an RFC3339 UTC timestamp for Flux."""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Add remaining volume points
-        while volume_index < len(volume_data):
-            combined_data.append(volume_data[volume_index])
-            volume_index += 1
+    def _process_query_results(self, result: List[Any]) -> List[Dict[str, Any]]:
+        """Process InfluxDB query results into a standardized format."""
+        return list(self._iter_data_points(
+            record for table in result for record in table.records
+        ))
 
-        return combined_data
+    def _iter_data_points(self, records: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """Convert a stream of pivoted records into data points one at a time."""
+        for record in records:
+            yield self._to_data_point(record)
+
+    def _to_data_point(self, record: Any) -> Dict[str, Any]:
+        """Convert a pivoted record into a data point."""
+        # With pivot, we get both price and volume in the same record
+        return {
+            "timestamp": record.get_time().isoformat(),
+            "price": record.values.get("price", 0),
+            "volume": record.values.get("volume", 0)
+        }
 
-    def _determine_time_range(self, query: TimeRangeQuery) -> Dict[str, datetime]:
+    def _determine_time_range(self, query: Union[TimeRangeQuery, MultiSymbolQuery]) -> Dict[str, datetime]:
         """Determine the actual time range for the query."""
-        start_time = query.start_time or datetime.utcnow() - timedelta(days=7)
-        end_time = query.end_time or datetime.utcnow()
+        start_time, end_time = self._resolve_time_range(query)
 
         return {
             "start": start_time,
             "end": end_time
         }
 
+    def get_market_snapshot(self, lookback_seconds: int) -> MarketSnapshotResponse:
+        """Get the latest price, volume and change over a lookback for every symbol."""
+        state = self.market_snapshot.get(lookback_seconds)
+        if state is None:
+            result = self.db_manager.query(self._build_snapshot_query(lookback_seconds))
+            state = self._load_snapshot(lookback_seconds, result)
+        return self._build_snapshot_response(lookback_seconds, *state)
+
+    async def get_market_snapshot_async(self, lookback_seconds: int) -> MarketSnapshotResponse:
+        """Get the market snapshot without blocking the event loop."""
+        state = self.market_snapshot.get(lookback_seconds)
+        if state is None:
+            result = await self.async_db_manager.query(self._build_snapshot_query(lookback_seconds))
+            state = self._load_snapshot(lookback_seconds, result)
+        return self._build_snapshot_response(lookback_seconds, *state)
+
+    def _build_snapshot_query(self, lookback_seconds: int) -> str:
+        """Build one grouped Flux query for every symbol's last tick and reference price.
+
+        The reference is the last price at or before the lookback start,
+        falling back to the first price after it.
+        """
+        reference_time = self._format_flux_time(datetime.utcnow() - timedelta(seconds=lookback_seconds))
+        return f'''
+        data = from(bucket: "stock_data")
+            |> range(start: -{settings.latest_lookback_days}d)
+            |> filter(fn: (r) => r["_measurement"] == "stock_data")
+
+        latest = data
+            |> filter(fn: (r) => r["_field"] == "price" or r["_field"] == "volume")
+            |> last()
+
+        reference = data
+            |> filter(fn: (r) => r["_field"] == "price" and r["_time"] <= {reference_time})
+            |> last()
+            |> set(key: "_field", value: "reference_price")
+
+        first = data
+            |> filter(fn: (r) => r["_field"] == "price" and r["_time"] > {reference_time})
+            |> first()
+            |> set(key: "_field", value: "first_price")
+
+        union(tables: [latest, reference, first])
+            |> group(columns: ["symbol"])
+        '''
+
+    def _load_snapshot(
+        self,
+        lookback_seconds: int,
+        result: List[Any]
+    ) -> Tuple[Dict[str, Tuple[int, float, int]], Dict[str, float]]:
+        """Decode snapshot query results and seed the in-memory snapshot with them."""
+        fields: Dict[str, Dict[str, Any]] = {}
+        for table in result:
+            for record in table.records:
+                values = fields.setdefault(record.values.get("symbol"), {})
+                values[record.get_field()] = record.get_value()
+                if record.get_field() == "price":
+                    values["timestamp"] = record.get_time()
+
+        last = {}
+        references = {}
+        for symbol, values in fields.items():
+            if "price" in values:
+                timestamp_ns = datetime_to_ns(values["timestamp"])
+                last[symbol] = (timestamp_ns, values["price"], int(values.get("volume") or 0))
+            reference = values.get("reference_price", values.get("first_price"))
+            if reference is not None:
+                references[symbol] = reference
+
+        self.market_snapshot.load(lookback_seconds, last, references)
+        return last, references
+
+    def _build_snapshot_response(
+        self,
+        lookback_seconds: int,
+        last: Dict[str, Tuple[int, float, int]],
+        references: Dict[str, float]
+    ) -> MarketSnapshotResponse:
+        """Build the snapshot response, computing the change against each reference price."""
+        snapshots = []
+        for symbol in sorted(last):
+            timestamp_ns, price, volume = last[symbol]
+            reference = references.get(symbol)
+            change = round(price - reference, 4) if reference else None
+            snapshots.append(SymbolSnapshot(
+                symbol=symbol,
+                price=price,
+                volume=volume,
+                timestamp=ns_to_datetime(timestamp_ns),
+                reference_price=reference,
+                change=change,
+                change_percent=round(100 * (price - reference) / reference, 4) if reference else None
+            ))
+
+        return MarketSnapshotResponse(
+            snapshots=snapshots,
+            total_symbols=len(snapshots),
+            lookback_seconds=lookback_seconds,
+            as_of=datetime.utcnow()
+        )
+
+    def is_database_connected(self) -> bool:
+        """Check that InfluxDB is reachable."""
+        return self.db_manager.ping()
+
+    async def is_database_connected_async(self) -> bool:
+        """Check that InfluxDB is reachable without blocking the event loop."""
+        return await self.async_db_manager.ping()
+
     def get_available_symbols(self) -> List[str]:
-        """Get list of available stock symbols in the database."""
-        flux_query = f'''
-        from(bucket: "stock_data")
-            |> range(start: -30d)
+        """Get list of available stock symbols from the symbol registry."""
+        if self.symbol_registry.needs_load:
+            result = self.db_manager.query(self._build_symbols_query())
+            self.symbol_registry.load(self._process_symbol_results(result))
+        return self.symbol_registry.symbols()
+
+    async def get_available_symbols_async(self) -> List[str]:
+        """Get list of available stock symbols without blocking the event loop."""
+        if self.symbol_registry.needs_load:
+            result = await self.async_db_manager.query(self._build_symbols_query())
+            self.symbol_registry.load(self._process_symbol_results(result))
+        return self.symbol_registry.symbols()
+
+    def get_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Get registry metadata for a symbol, or None if it is unknown."""
+        self.get_available_symbols()
+        stats = self.symbol_registry.get(symbol)
+        if stats is not None and not stats.seeded:
+            result = self.db_manager.query(self._build_symbol_stats_query(symbol))
+            self.symbol_registry.seed(symbol, *self._process_symbol_stats_results(result))
+        return self._build_symbol_metadata(symbol)
+
+    async def get_symbol_metadata_async(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Get registry metadata for a symbol without blocking the event loop."""
+        await self.get_available_symbols_async()
+        stats = self.symbol_registry.get(symbol)
+        if stats is not None and not stats.seeded:
+            result = await self.async_db_manager.query(self._build_symbol_stats_query(symbol))
+            self.symbol_registry.seed(symbol, *self._process_symbol_stats_results(result))
+        return self._build_symbol_metadata(symbol)
+
+    def _build_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Convert registry stats into the metadata model."""
+        stats = self.symbol_registry.get(symbol)
+        if stats is None:
+            return None
+
+        return SymbolMetadata(
+            symbol=stats.symbol,
+            first_timestamp=ns_to_datetime(stats.first_ns) if stats.first_ns is not None else None,
+            last_timestamp=ns_to_datetime(stats.last_ns) if stats.last_ns is not None else None,
+            point_count=stats.point_count
+        )
+
+    def _build_symbols_query(self) -> str:
+        """Build Flux query string listing symbol tag values from the index."""
+        return '''
+        import "influxdata/influxdb/schema"
+
+        schema.tagValues(
+            bucket: "stock_data",
+            tag: "symbol",
+            predicate: (r) => r["_measurement"] == "stock_data",
+            start: -30d
+        )
+        '''
+
+    def _build_symbol_stats_query(self, symbol: str) -> str:
+        """Build Flux query string for the stored first/last timestamps and point count of a symbol."""
+        return f'''
+        data = from(bucket: "stock_data")
+            |> range(start: 0)
             |> filter(fn: (r) => r["_measurement"] == "stock_data")
-            |> distinct(column: "symbol")
+            |> filter(fn: (r) => r["symbol"] == "{symbol}")
+            |> filter(fn: (r) => r["_field"] == "price")
+
+        data |> first() |> yield(name: "first")
+        data |> last() |> yield(name: "last")
+        data |> count() |> yield(name: "count")
         '''
 
-        result = self.db_manager.query(flux_query)
+    def _process_symbol_stats_results(self, result: List[Any]) -> Tuple[Optional[int], Optional[int], int]:
+        """Extract the first/last timestamps and point count from symbol stats results."""
+        first_ns: Optional[int] = None
+        last_ns: Optional[int] = None
+        count = 0
+
+        for table in result:
+            for record in table.records:
+                name = record.values.get("result")
+                if name == "count":
+                    count += int(record.get_value())
+                    continue
+
+                timestamp_ns = datetime_to_ns(record.get_time())
+                if name == "first" and (first_ns is None or timestamp_ns < first_ns):
+                    first_ns = timestamp_ns
+                elif name == "last" and (last_ns is None or timestamp_ns > last_ns):
+                    last_ns = timestamp_ns
+
+        return first_ns, last_ns, count
+
+    def _process_symbol_results(self, result: List[Any]) -> List[str]:
+        """Extract unique symbols from tag value results."""
         symbols = []
 
         for table in result:
             for record in table.records:
-                symbols.append(record.values.get("symbol"))
+                symbols.append(record.values.get("_value"))
 
         return list(set(symbols))
 
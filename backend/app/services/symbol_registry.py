@@ -0,0 +1,109 @@
+"""Ingest-maintained registry of known stock symbols."""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class SymbolStats:
+    """What the registry knows about one symbol.
+
+    Until ``seeded`` is set, ``point_count`` and the timestamps only cover
+    ticks ingested by this process; seeding merges in what InfluxDB stores.
+    """
+
+    __slots__ = ("symbol", "first_ns", "last_ns", "point_count", "seeded")
+
+    def __init__(self, symbol: str):
+        """Initialize empty stats for a symbol."""
+        self.symbol = symbol
+        self.first_ns: Optional[int] = None
+        self.last_ns: Optional[int] = None
+        self.point_count = 0
+        self.seeded = False
+
+    @property
+    def ticks_per_second(self) -> Optional[float]:
+        """Observed tick rate, or None until two distinct timestamps have been seen."""
+        if self.point_count < 2 or self.first_ns is None or self.last_ns == self.first_ns:
+            return None
+        return self.point_count / ((self.last_ns - self.first_ns) / 1_000_000_000)
+
+
+class SymbolRegistry:
+    """Symbols seeded from InfluxDB tag values and kept current by the ingest path.
+
+    The seed expires after ``resync_seconds`` so symbols ingested through
+    other workers eventually show up here too.
+    """
+
+    def __init__(self, resync_seconds: float):
+        """Initialize an empty registry."""
+        self.resync_seconds = resync_seconds
+        self._stats: Dict[str, SymbolStats] = {}
+        self._symbols: Optional[List[str]] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def needs_load(self) -> bool:
+        """Whether the registry should be (re)seeded from InfluxDB."""
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.resync_seconds
+
+    def load(self, symbols: Iterable[str]) -> None:
+        """Seed the registry with symbols known to InfluxDB."""
+        with self._lock:
+            for symbol in symbols:
+                if symbol and symbol not in self._stats:
+                    self._stats[symbol] = SymbolStats(symbol)
+                    self._symbols = None
+            self._loaded_at = time.monotonic()
+
+    def record(self, symbol: str, timestamp_ns: int) -> None:
+        """Account for one ingested tick."""
+        self.record_many(symbol, timestamp_ns, timestamp_ns, 1)
+
+    def record_many(self, symbol: str, first_ns: int, last_ns: int, count: int) -> None:
+        """Account for ``count`` ingested ticks spanning ``first_ns`` to ``last_ns``."""
+        with self._lock:
+            stats = self._stats.get(symbol)
+            if stats is None:
+                stats = self._stats[symbol] = SymbolStats(symbol)
+                self._symbols = None
+
+            stats.point_count += count
+            if stats.first_ns is None or first_ns < stats.first_ns:
+                stats.first_ns = first_ns
+            if stats.last_ns is None or last_ns > stats.last_ns:
+                stats.last_ns = last_ns
+
+    def seed(self, symbol: str, first_ns: Optional[int], last_ns: Optional[int], count: int) -> None:
+        """Merge the stored first/last timestamps and point count of a symbol into its stats."""
+        with self._lock:
+            stats = self._stats.get(symbol)
+            if stats is None:
+                stats = self._stats[symbol] = SymbolStats(symbol)
+                self._symbols = None
+
+            # Ticks ingested by this process are usually stored already
+            stats.point_count = max(stats.point_count, count)
+            if first_ns is not None and (stats.first_ns is None or first_ns < stats.first_ns):
+                stats.first_ns = first_ns
+            if last_ns is not None and (stats.last_ns is None or last_ns > stats.last_ns):
+                stats.last_ns = last_ns
+            stats.seeded = True
+
+    def symbols(self) -> List[str]:
+        """Return all known symbols in sorted order."""
+        with self._lock:
+            if self._symbols is None:
+                self._symbols = sorted(self._stats)
+            return list(self._symbols)
+
+    def get(self, symbol: str) -> Optional[SymbolStats]:
+        """Return the stats of a symbol, if known."""
+        return self._stats.get(symbol)
+
+    def __len__(self) -> int:
+        """Number of known symbols."""
+        return len(self._stats)
@@ -0,0 +1,183 @@
+"""In-memory ring buffers of the most recent ticks per symbol."""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.models.series import StockSeries
+
+
+class TickRingBuffer:
+    """Fixed-capacity ring of the newest ticks, by timestamp, for one symbol.
+
+    Slots are kept in timestamp order from ``_next`` onwards, so in-order
+    ticks are appended in O(1) and evict the oldest tick; the rare
+    out-of-order tick is inserted in place, or dropped when it is older
+    than every tick of a full buffer.
+    """
+
+    __slots__ = ("capacity", "timestamps", "prices", "volumes", "_next", "_count")
+
+    def __init__(self, capacity: int):
+        """Allocate the column arrays."""
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.volumes = np.zeros(capacity, dtype=np.int64)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of ticks held."""
+        return self._count
+
+    def append(self, timestamp_ns: int, price: float, volume: int) -> None:
+        """Add a tick, evicting the oldest one when full."""
+        if self._count and timestamp_ns < self.timestamps[(self._next - 1) % self.capacity]:
+            self._insert(timestamp_ns, price, volume)
+            return
+
+        index = self._next
+        self.timestamps[index] = timestamp_ns
+        self.prices[index] = price
+        self.volumes[index] = volume
+        self._next = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def snapshot(self) -> StockSeries:
+        """Return the held ticks ordered by timestamp, oldest first."""
+        if self._count < self.capacity:
+            return StockSeries(
+                self.timestamps[:self._count].copy(),
+                self.prices[:self._count].copy(),
+                self.volumes[:self._count].copy()
+            )
+
+        order = np.r_[self._next:self.capacity, 0:self._next]
+        return StockSeries(self.timestamps[order], self.prices[order], self.volumes[order])
+
+    def replace(self, series: StockSeries) -> None:
+        """Reset the buffer to the newest ``capacity`` rows of a series ordered by timestamp."""
+        series = series[-self.capacity:]
+        count = len(series)
+        self.timestamps[:count] = series.timestamps
+        self.prices[:count] = series.prices
+        self.volumes[:count] = series.volumes
+        self._count = count
+        self._next = count % self.capacity
+
+    def _insert(self, timestamp_ns: int, price: float, volume: int) -> None:
+        """Insert an out-of-order tick at its timestamp position."""
+        oldest = self.timestamps[self._next if self._count == self.capacity else 0]
+        if self._count == self.capacity and timestamp_ns < oldest:
+            return
+
+        current = self.snapshot()
+        # Ties keep arrival order
+        position = int(np.searchsorted(current.timestamps, timestamp_ns, side="right"))
+        self.replace(StockSeries(
+            np.insert(current.timestamps, position, timestamp_ns),
+            np.insert(current.prices, position, price),
+            np.insert(current.volumes, position, volume)
+        ))
+
+
+class LatestTickStore:
+    """Per-symbol ring buffers filled by the ingest path.
+
+    A buffer only answers latest-data requests once it has been backfilled
+    from InfluxDB, so ticks written before this process started (or by
+    another worker) are included. Backfills expire after ``resync_seconds``,
+    which bounds staleness when several workers share the ingest load.
+    """
+
+    def __init__(self, capacity: int, resync_seconds: float):
+        """Initialize an empty store."""
+        self.capacity = capacity
+        self.resync_seconds = resync_seconds
+        self._buffers: Dict[str, TickRingBuffer] = {}
+        self._backfilled_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether ticks are buffered at all."""
+        return self.capacity > 0
+
+    def record(self, symbol: str, timestamp_ns: int, price: float, volume: int) -> None:
+        """Add an ingested tick to its symbol's buffer."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = self._buffers[symbol] = TickRingBuffer(self.capacity)
+            buffer.append(timestamp_ns, price, volume)
+
+    def record_series(self, symbol: str, series: StockSeries) -> None:
+        """Add a run of ingested ticks to a symbol's buffer."""
+        if not self.enabled or not len(series):
+            return
+
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = self._buffers[symbol] = TickRingBuffer(self.capacity)
+            # Only the newest ``capacity`` ticks by timestamp can survive
+            if np.any(np.diff(series.timestamps) < 0):
+                order = np.argsort(series.timestamps, kind="stable")
+                series = StockSeries(series.timestamps[order], series.prices[order], series.volumes[order])
+            series = series[-self.capacity:]
+            for timestamp, price, volume in zip(
+                series.timestamps.tolist(), series.prices.tolist(), series.volumes.tolist()
+            ):
+                buffer.append(timestamp, price, volume)
+
+    def latest(self, symbol: str, limit: int) -> Optional[StockSeries]:
+        """Return up to ``limit`` newest ticks, newest first, or None if a backfill is needed."""
+        if not self.enabled or limit > self.capacity:
+            return None
+
+        with self._lock:
+            backfilled_at = self._backfilled_at.get(symbol)
+            if backfilled_at is None or time.monotonic() - backfilled_at > self.resync_seconds:
+                return None
+
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                return StockSeries.empty()
+            return buffer.snapshot()[-limit:][::-1] if limit > 0 else StockSeries.empty()
+
+    def backfill(self, symbol: str, series: StockSeries) -> None:
+        """Merge ticks loaded from InfluxDB into a buffer and mark it complete.
+
+        Ticks recorded while the backfill query ran are kept; on duplicate
+        timestamps the buffered tick wins. An empty backfill of a symbol
+        without a buffer leaves no state behind.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                if not len(series):
+                    return
+                buffer = self._buffers[symbol] = TickRingBuffer(self.capacity)
+
+            current = buffer.snapshot()
+            timestamps = np.concatenate([series.timestamps, current.timestamps])
+            prices = np.concatenate([series.prices, current.prices])
+            volumes = np.concatenate([series.volumes, current.volumes])
+
+            # Keep the last occurrence of each timestamp, i.e. the buffered tick
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, prices, volumes = timestamps[order], prices[order], volumes[order]
+            keep = np.append(timestamps[1:] != timestamps[:-1], True) if len(timestamps) else np.empty(0, bool)
+
+            buffer.replace(StockSeries(timestamps[keep], prices[keep], volumes[keep]))
+            self._backfilled_at[symbol] = time.monotonic()
@@ -0,0 +1,145 @@
+"""In-process publish/subscribe hub for live ticks."""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.models.series import StockSeries, format_timestamps
+
+# (symbol, epoch nanoseconds, price, volume)
+Tick = Tuple[str, int, float, int]
+
+SUBSCRIPTION_POLICIES = ("drop_oldest", "coalesce")
+
+
+def ticks_to_dicts(ticks: List[Tick]) -> List[Dict[str, Any]]:
+    """Serialize ticks into the API's data point representation."""
+    timestamps = format_timestamps(np.array([tick[1] for tick in ticks], dtype=np.int64))
+    return [
+        {"symbol": tick[0], "timestamp": timestamp, "price": tick[2], "volume": tick[3]}
+        for tick, timestamp in zip(ticks, timestamps)
+    ]
+
+
+class Subscription:
+    """A subscriber's bounded queue of pending ticks.
+
+    With the ``drop_oldest`` policy the queue holds the newest ``max_size``
+    ticks and discards older ones; with ``coalesce`` it holds only the
+    newest tick per symbol. Either way a slow consumer never blocks the
+    publisher; ``dropped`` counts what it missed.
+    """
+
+    def __init__(self, symbols: Optional[FrozenSet[str]], max_size: int, policy: str):
+        """Initialize the subscription on the running event loop."""
+        if policy not in SUBSCRIPTION_POLICIES:
+            raise ValueError(f"Policy must be one of: {list(SUBSCRIPTION_POLICIES)}")
+
+        self.symbols = symbols
+        self.policy = policy
+        self.dropped = 0
+        self._queue: deque = deque(maxlen=max_size)
+        self._latest: Dict[str, Tick] = {}
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def put(self, tick: Tick) -> None:
+        """Queue a tick without blocking; may be called from any thread."""
+        with self._lock:
+            was_empty = not self._queue and not self._latest
+            if self.policy == "coalesce":
+                if tick[0] in self._latest:
+                    self.dropped += 1
+                self._latest[tick[0]] = tick
+            else:
+                if len(self._queue) == self._queue.maxlen:
+                    self.dropped += 1
+                self._queue.append(tick)
+
+        if was_empty:
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def get(self, timeout: Optional[float] = None) -> List[Tick]:
+        """Wait for pending ticks and return all of them, oldest first.
+
+        Returns an empty list if nothing arrives within ``timeout`` seconds.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        with self._lock:
+            self._ready.clear()
+            if self.policy == "coalesce":
+                ticks = list(self._latest.values())
+                self._latest = {}
+            else:
+                ticks = list(self._queue)
+                self._queue.clear()
+        return ticks
+
+
+class TickHub:
+    """Fans ingested ticks out to subscribers of their symbol."""
+
+    def __init__(self):
+        """Initialize a hub without subscribers."""
+        self._by_symbol: Dict[str, Set[Subscription]] = {}
+        self._wildcard: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, symbols: Optional[List[str]], max_size: int, policy: str) -> Subscription:
+        """Register a subscriber to some symbols, or to all when ``symbols`` is None."""
+        subscription = Subscription(frozenset(symbols) if symbols else None, max_size, policy)
+        with self._lock:
+            if subscription.symbols is None:
+                self._wildcard.add(subscription)
+            else:
+                for symbol in subscription.symbols:
+                    self._by_symbol.setdefault(symbol, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber."""
+        with self._lock:
+            self._wildcard.discard(subscription)
+            for symbol in subscription.symbols or ():
+                subscribers = self._by_symbol.get(symbol)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._by_symbol[symbol]
+
+    def publish(self, symbol: str, timestamp_ns: int, price: float, volume: int) -> None:
+        """Deliver one tick to the subscribers of its symbol."""
+        subscribers = self._subscribers(symbol)
+        if subscribers:
+            tick = (symbol, timestamp_ns, price, volume)
+            for subscription in subscribers:
+                subscription.put(tick)
+
+    def publish_series(self, symbol: str, series: StockSeries) -> None:
+        """Deliver a run of ticks, in arrival order, to the subscribers of their symbol."""
+        subscribers = self._subscribers(symbol)
+        if not subscribers:
+            return
+
+        for timestamp, price, volume in zip(
+            series.timestamps.tolist(), series.prices.tolist(), series.volumes.tolist()
+        ):
+            tick = (symbol, timestamp, price, volume)
+            for subscription in subscribers:
+                subscription.put(tick)
+
+    def _subscribers(self, symbol: str) -> List[Subscription]:
+        """Return the current subscribers of a symbol."""
+        if not self._by_symbol and not self._wildcard:
+            return []
+
+        with self._lock:
+            return list(self._by_symbol.get(symbol, ())) + list(self._wildcard)
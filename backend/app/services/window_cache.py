@@ -0,0 +1,169 @@
+"""Incremental cache of sealed, interval-aligned aggregation windows."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.models.series import StockSeries, concat_series
+
+_NS = 1_000_000_000
+
+
+class _WindowEntry:
+    """Sealed windows for one symbol and interval.
+
+    ``series`` holds aggregated rows whose window stop lies in
+    ``(origin_ns, sealed_ns]``; those windows are complete and will not change
+    unless a late write lands inside them.
+    """
+
+    __slots__ = ("origin_ns", "sealed_ns", "series", "created_at")
+
+    def __init__(self, origin_ns: int, sealed_ns: int, series: StockSeries):
+        self.origin_ns = origin_ns
+        self.sealed_ns = sealed_ns
+        self.series = series
+        self.created_at = time.monotonic()
+
+
+class WindowCache:
+    """Per symbol and interval cache of sealed aggregation windows.
+
+    Aggregation windows are aligned to the epoch, so a result computed from an
+    aligned start splits cleanly at any interval boundary. A window is sealed
+    once its stop is at least ``settle_seconds`` in the past. A repeated
+    open-ended query then only needs to fetch the windows after the sealed
+    boundary and append them to the cached prefix.
+
+    Usage is a two-step protocol around the database read::
+
+        prefix, fetch_from_ns = cache.lookup(symbol, interval_ns, start_ns)
+        tail = <query windows from fetch_from_ns until now>
+        series = cache.store(symbol, interval_ns, start_ns, fetch_from_ns, prefix, tail, now_ns)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        settle_seconds: float,
+        max_age_seconds: float,
+        retention_seconds: float
+    ):
+        """Initialize an empty cache."""
+        self.max_bytes = max_bytes
+        self.settle_ns = int(settle_seconds * _NS)
+        self.max_age_seconds = max_age_seconds
+        self.retention_ns = int(retention_seconds * _NS)
+        self._entries: "OrderedDict[Tuple[str, int], _WindowEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.max_bytes > 0 and self.max_age_seconds > 0
+
+    @staticmethod
+    def align(value_ns: int, interval_ns: int) -> int:
+        """Round an epoch timestamp down to an interval boundary."""
+        return value_ns - value_ns % interval_ns
+
+    def lookup(self, symbol: str, interval_ns: int, start_ns: int) -> Tuple[StockSeries, int]:
+        """Return cached windows after ``start_ns`` and where to resume fetching.
+
+        ``start_ns`` must be aligned to ``interval_ns``. Without a usable
+        entry the prefix is empty and fetching starts at ``start_ns``.
+        """
+        with self._lock:
+            entry = self._live_entry((symbol, interval_ns))
+            if entry is None or entry.origin_ns > start_ns or entry.sealed_ns <= start_ns:
+                return StockSeries.empty(), start_ns
+
+            self._entries.move_to_end((symbol, interval_ns))
+            return entry.series.between(start_ns, entry.sealed_ns), entry.sealed_ns
+
+    def store(
+        self,
+        symbol: str,
+        interval_ns: int,
+        start_ns: int,
+        fetch_from_ns: int,
+        prefix: StockSeries,
+        fetched: StockSeries,
+        now_ns: int
+    ) -> StockSeries:
+        """Seal newly fetched windows into the cache and return the full result."""
+        result = concat_series([prefix, fetched]) if len(prefix) else fetched
+        if not self.enabled:
+            return result
+
+        key = (symbol, interval_ns)
+        sealed_ns = self.align(now_ns - self.settle_ns, interval_ns)
+        if sealed_ns <= fetch_from_ns:
+            return result
+
+        newly_sealed = fetched.between(fetch_from_ns, sealed_ns)
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None and entry.sealed_ns == fetch_from_ns and entry.origin_ns <= start_ns:
+                # Extend the existing entry, dropping rows beyond the retention horizon
+                origin_ns = max(entry.origin_ns, self.align(sealed_ns - self.retention_ns, interval_ns))
+                series = concat_series([entry.series, newly_sealed]).between(origin_ns, sealed_ns)
+            elif fetch_from_ns == start_ns:
+                # A full read: replace whatever was cached
+                origin_ns = start_ns
+                series = newly_sealed
+            else:
+                # The entry changed underneath us (late write or eviction); leave it alone
+                return result
+
+            self._discard(key)
+            if series.nbytes <= self.max_bytes:
+                new_entry = _WindowEntry(origin_ns, sealed_ns, series)
+                if entry is not None and entry.sealed_ns == fetch_from_ns:
+                    new_entry.created_at = entry.created_at
+                self._entries[key] = new_entry
+                self._size += series.nbytes
+                while self._size > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+
+        return result
+
+    def invalidate(self, symbol: str, since_ns: int) -> None:
+        """Unseal every window of a symbol that ends after ``since_ns``."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == symbol]:
+                entry = self._entries[key]
+                if since_ns >= entry.sealed_ns:
+                    continue
+
+                sealed_ns = self.align(since_ns, key[1])
+                if sealed_ns <= entry.origin_ns:
+                    self._discard(key)
+                    continue
+
+                self._size -= entry.series.nbytes
+                entry.series = entry.series.between(entry.origin_ns, sealed_ns)
+                entry.sealed_ns = sealed_ns
+                self._size += entry.series.nbytes
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _live_entry(self, key: Tuple[str, int]) -> Optional[_WindowEntry]:
+        """Return an entry unless it is older than the max age; the caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.created_at > self.max_age_seconds:
+            self._discard(key)
+            return None
+        return entry
+
+    def _discard(self, key: Tuple[str, int]) -> None:
+        """Remove an entry if present; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.series.nbytes
@@ -0,0 +1,45 @@
+"""Unit tests for Arrow IPC and Parquet encoding."""
+
+import io
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from app.models.series import StockSeries
+from app.services.arrow_export import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    encode_table,
+    negotiate_table_media_type,
+    series_to_table,
+)
+
+
+class TestArrowExport:
+    """Test cases for the Arrow export helpers."""
+
+    def test_negotiate_table_media_type(self):
+        """Test only Arrow and Parquet requests are recognised."""
+        # Act / Assert
+        assert negotiate_table_media_type(None) is None
+        assert negotiate_table_media_type("application/json") is None
+        assert negotiate_table_media_type("application/json, application/vnd.apache.parquet;q=0.9") == PARQUET_MEDIA_TYPE
+        assert negotiate_table_media_type("Application/Vnd.Apache.Arrow.Stream") == ARROW_STREAM_MEDIA_TYPE
+
+    def test_series_round_trips_through_both_formats(self):
+        """Test typed columns and metadata survive IPC and Parquet encoding."""
+        # Arrange
+        series = StockSeries([1_704_067_200_000_000_000, 1_704_067_260_000_000_000], [150.5, 151.0], [10, 20])
+        table = series_to_table(series, {"symbol": "AAPL", "interval": "1m"})
+
+        # Act
+        from_stream = ipc.open_stream(encode_table(table, ARROW_STREAM_MEDIA_TYPE)).read_all()
+        from_parquet = pq.read_table(io.BytesIO(encode_table(table, PARQUET_MEDIA_TYPE)))
+
+        # Assert
+        for result in (from_stream, from_parquet):
+            assert result.schema.field("timestamp").type == pa.timestamp("ns", tz="UTC")
+            assert result.column("price").to_pylist() == [150.5, 151.0]
+            assert result.column("volume").to_pylist() == [10, 20]
+            assert result.schema.metadata[b"symbol"] == b"AAPL"
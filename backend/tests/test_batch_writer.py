@@ -0,0 +1,180 @@
+"""Unit tests for the background batch writer."""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from app.core.batch_writer import BatchWriter, WriteQueueFullError
+
+
+class TestBatchWriter:
+    """Test cases for BatchWriter."""
+
+    def test_flush_by_size(self):
+        """Test a full batch is written without waiting for the interval."""
+        # Arrange
+        write_fn = Mock()
+        writer = BatchWriter(write_fn, batch_size=3, flush_interval=60)
+
+        # Act
+        for i in range(3):
+            writer.submit(i)
+        deadline = time.monotonic() + 2
+        while not write_fn.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Assert
+        write_fn.assert_called_once_with([0, 1, 2])
+        writer.close()
+
+    def test_flush_by_age(self):
+        """Test a partial batch is written once the flush interval elapses."""
+        # Arrange
+        write_fn = Mock()
+        writer = BatchWriter(write_fn, batch_size=100, flush_interval=0.05)
+
+        # Act
+        writer.submit("a")
+        time.sleep(0.3)
+
+        # Assert
+        write_fn.assert_called_once_with(["a"])
+        writer.close()
+
+    def test_close_flushes_pending_items(self):
+        """Test closing the writer writes everything still queued."""
+        # Arrange
+        write_fn = Mock()
+        writer = BatchWriter(write_fn, batch_size=100, flush_interval=60)
+        writer.submit("a")
+        writer.submit("b")
+
+        # Act
+        writer.close()
+
+        # Assert
+        write_fn.assert_called_once_with(["a", "b"])
+        with pytest.raises(RuntimeError, match="closed"):
+            writer.submit("c")
+
+    def test_backpressure_when_queue_full(self):
+        """Test submit raises once the queue stays full past the timeout."""
+        # Arrange
+        release = threading.Event()
+        writer = BatchWriter(
+            lambda batch: release.wait(),
+            batch_size=1,
+            flush_interval=0,
+            max_queue_size=1,
+            enqueue_timeout=0.05
+        )
+
+        # Act & Assert
+        with pytest.raises(WriteQueueFullError):
+            for i in range(10):
+                writer.submit(i)
+        release.set()
+        writer.close()
+
+    def test_write_failure_is_counted(self):
+        """Test a failing write does not stop the worker."""
+        # Arrange
+        write_fn = Mock(side_effect=[Exception("boom"), None])
+        writer = BatchWriter(write_fn, batch_size=1, flush_interval=60, max_retries=0)
+
+        # Act
+        writer.submit("a")
+        writer.flush()
+        writer.submit("b")
+        writer.close()
+
+        # Assert
+        assert writer.failed_items == 1
+        assert write_fn.call_count == 2
+
+    def test_write_failure_is_retried_with_backoff(self):
+        """Test a failed write is retried and only counted once retries run out."""
+        # Arrange
+        write_fn = Mock(side_effect=[Exception("boom"), None, Exception("boom"), Exception("boom")])
+        writer = BatchWriter(write_fn, batch_size=1, flush_interval=60, max_retries=1, retry_backoff=0.01)
+
+        # Act
+        writer.submit("a")
+        writer.flush()
+        writer.submit("b")
+        writer.close()
+
+        # Assert
+        assert [call.args[0] for call in write_fn.call_args_list] == [["a"], ["a"], ["b"], ["b"]]
+        assert (writer.failed_batches, writer.failed_items) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_submit_async_waits_for_worker_signal(self):
+        """Test an async producer blocked on a full queue resumes once the worker takes an item."""
+        # Arrange
+        release = threading.Event()
+        written = []
+        writer = BatchWriter(
+            lambda batch: release.wait() and written.extend(batch),
+            batch_size=1,
+            flush_interval=0,
+            max_queue_size=1,
+            enqueue_timeout=5
+        )
+        await writer.submit_async("a")
+        await writer.submit_async("b")
+        threading.Timer(0.05, release.set).start()
+
+        # Act
+        started = time.monotonic()
+        await writer.submit_async("c")
+        waited = time.monotonic() - started
+        writer.close()
+
+        # Assert
+        assert 0.03 < waited < 2
+        assert written == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_submit_async_raises_when_queue_stays_full(self):
+        """Test an async producer gives up once the enqueue timeout passes."""
+        # Arrange
+        release = threading.Event()
+        writer = BatchWriter(
+            lambda batch: release.wait(),
+            batch_size=1,
+            flush_interval=0,
+            max_queue_size=1,
+            enqueue_timeout=0.05
+        )
+
+        # Act & Assert
+        with pytest.raises(WriteQueueFullError):
+            for i in range(10):
+                await writer.submit_async(i)
+        release.set()
+        writer.close()
+
+    def test_close_gives_up_when_writes_hang(self):
+        """Test closing returns after the timeout when the queue is full and the backend hangs."""
+        # Arrange
+        release = threading.Event()
+        writer = BatchWriter(
+            lambda batch: release.wait(),
+            batch_size=1,
+            flush_interval=0,
+            max_queue_size=1,
+            enqueue_timeout=0.05
+        )
+        writer.submit("a")
+        writer.submit("b")
+
+        # Act
+        started = time.monotonic()
+        writer.close(timeout=0.1)
+        elapsed = time.monotonic() - started
+        release.set()
+
+        # Assert
+        assert elapsed < 1
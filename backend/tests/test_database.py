@@ -0,0 +1,69 @@
+"""Unit tests for the InfluxDB managers."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.core.async_database import AsyncInfluxDBManager
+from app.core.database import InfluxDBManager
+
+
+class TestInfluxDBManager:
+    """Test cases for error wrapping in InfluxDBManager and AsyncInfluxDBManager."""
+
+    def test_query_stream_wraps_errors(self):
+        """Test query errors surface as RuntimeError once the stream is consumed."""
+        # Arrange
+        with patch("app.core.database.InfluxDBClient"):
+            manager = InfluxDBManager()
+        manager.query_api.query_stream.side_effect = Exception("Database error")
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Failed to execute query: Database error"):
+            list(manager.query_stream("from(bucket: \"stock_data\")"))
+
+    def test_query_wraps_errors(self):
+        """Test query errors surface as RuntimeError."""
+        # Arrange
+        with patch("app.core.database.InfluxDBClient"):
+            manager = InfluxDBManager()
+        manager.query_api.query.side_effect = Exception("Database error")
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Failed to execute query: Database error"):
+            manager.query("from(bucket: \"stock_data\")")
+
+    @pytest.mark.asyncio
+    async def test_async_query_stream_wraps_errors(self):
+        """Test async query errors surface as RuntimeError."""
+        # Arrange
+        manager = AsyncInfluxDBManager()
+        manager.client = Mock()
+        manager.query_api = Mock(query_stream=AsyncMock(side_effect=Exception("Database error")))
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Failed to execute query: Database error"):
+            async for _ in manager.query_stream("from(bucket: \"stock_data\")"):
+                pass
+
+    def test_ping_reports_unreachable_server(self):
+        """Test ping returns False instead of raising when InfluxDB is down."""
+        # Arrange
+        with patch("app.core.database.InfluxDBClient"):
+            manager = InfluxDBManager()
+        manager.client.ping.side_effect = Exception("Connection refused")
+
+        # Act & Assert
+        assert manager.ping() is False
+
+    @pytest.mark.asyncio
+    async def test_async_ping_reports_server_state(self):
+        """Test the async ping reflects the client's ping."""
+        # Arrange
+        manager = AsyncInfluxDBManager()
+        manager.client = Mock(ping=AsyncMock(return_value=True))
+
+        # Act & Assert
+        assert await manager.ping() is True
+        manager.client.ping.side_effect = Exception("Connection refused")
+        assert await manager.ping() is False
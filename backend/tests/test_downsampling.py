@@ -0,0 +1,55 @@
+"""Unit tests for LTTB downsampling."""
+
+import numpy as np
+
+from app.models.series import StockSeries
+from app.services.downsampling import downsample_lttb, lttb_indices
+
+
+class TestDownsampling:
+    """Test cases for the LTTB reduction."""
+
+    def test_keeps_endpoints_and_spikes(self):
+        """Test the first and last points and an isolated spike survive the reduction."""
+        # Arrange
+        x = np.arange(1000, dtype=np.int64)
+        y = np.ones(1000)
+        y[500] = 50.0
+
+        # Act
+        selected = lttb_indices(x, y, 20)
+
+        # Assert
+        assert len(selected) == 20
+        assert selected[0] == 0 and selected[-1] == 999
+        assert 500 in selected
+        assert np.all(np.diff(selected) > 0)
+
+    def test_small_series_is_unchanged(self):
+        """Test a series that already fits is returned as is."""
+        # Arrange
+        series = StockSeries([1, 2, 3], [1.0, 2.0, 3.0], [1, 1, 1])
+
+        # Act
+        result = downsample_lttb(series, 10)
+
+        # Assert
+        assert result is series
+
+    def test_volume_is_preserved(self):
+        """Test bucket volumes are summed onto the selected points."""
+        # Arrange
+        rng = np.random.default_rng(0)
+        series = StockSeries(
+            np.arange(10_000, dtype=np.int64) * 1_000_000_000,
+            100.0 + rng.standard_normal(10_000).cumsum(),
+            rng.integers(0, 100, 10_000)
+        )
+
+        # Act
+        result = downsample_lttb(series, 500)
+
+        # Assert
+        assert len(result) == 500
+        assert int(result.volumes.sum()) == int(series.volumes.sum())
+        assert np.all(np.diff(result.timestamps) > 0)
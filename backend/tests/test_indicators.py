@@ -0,0 +1,68 @@
+"""Unit tests for the technical indicator kernels."""
+
+import numpy as np
+import pandas as pd
+
+from app.models.series import StockSeries
+from app.services.indicators import compute_indicator, ema, rolling_std, rsi, sma, volatility, warmup_windows
+
+
+class TestIndicators:
+    """Test cases for the indicator kernels."""
+
+    prices = np.array([10.0, 11.0, 10.5, 12.0, 12.5, 11.5, 13.0, 14.0, 13.5, 15.0])
+
+    def test_sma_matches_rolling_mean(self):
+        """Test the SMA kernel matches a pandas rolling mean."""
+        # Act
+        result = sma(self.prices, 3)
+
+        # Assert
+        expected = pd.Series(self.prices).rolling(3).mean().to_numpy()
+        np.testing.assert_allclose(result, expected)
+
+    def test_ema_and_rolling_std_match_pandas(self):
+        """Test the EMA and rolling standard deviation kernels match pandas."""
+        # Act
+        ema_result = ema(self.prices, 4)
+        std_result = rolling_std(self.prices, 4)
+
+        # Assert
+        series = pd.Series(self.prices)
+        np.testing.assert_allclose(ema_result, series.ewm(span=4, adjust=False).mean().to_numpy())
+        np.testing.assert_allclose(std_result, series.rolling(4).std(ddof=0).to_numpy())
+
+    def test_rsi_bounds_and_warmup(self):
+        """Test RSI is NaN during warm-up, 100 for only gains and within bounds otherwise."""
+        # Act
+        rising = rsi(np.arange(1.0, 11.0), 3)
+        mixed = rsi(self.prices, 3)
+
+        # Assert
+        assert np.isnan(rising[:3]).all()
+        assert (rising[3:] == 100.0).all()
+        assert ((mixed[3:] > 0) & (mixed[3:] < 100)).all()
+
+    def test_volatility_of_constant_growth_is_zero(self):
+        """Test constant log returns have zero volatility."""
+        # Act
+        result = volatility(2.0 ** np.arange(6), 3)
+
+        # Assert
+        assert np.isnan(result[:3]).all()
+        np.testing.assert_allclose(result[3:], 0.0, atol=1e-12)
+
+    def test_compute_bollinger_and_vwap(self):
+        """Test multi-series indicators are keyed by band and period."""
+        # Arrange
+        series = StockSeries(np.arange(4), [10.0, 20.0, 30.0, 40.0], [1, 1, 2, 0])
+
+        # Act
+        bands = compute_indicator("bollinger", series, 2, 2.0)
+        vwap = compute_indicator("vwap", series, 2, 2.0)
+
+        # Assert
+        assert bands["bollinger_2_middle"].tolist()[1:] == [15.0, 25.0, 35.0]
+        assert bands["bollinger_2_upper"][1] == 25.0
+        assert vwap["vwap_2"].tolist()[1:] == [15.0, 80.0 / 3, 30.0]
+        assert warmup_windows("ema", 10) == 30
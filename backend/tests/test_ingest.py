@@ -0,0 +1,93 @@
+"""Unit tests for streaming tick ingest parsing."""
+
+import json
+import pytest
+
+from app.services.ingest import LineTooLongError, iter_line_chunks, parse_tick_lines
+
+
+async def byte_stream(*parts):
+    """Yield the given byte strings as an async stream."""
+    for part in parts:
+        yield part
+
+
+class TestIngest:
+    """Test cases for iter_line_chunks and parse_tick_lines."""
+
+    @pytest.mark.asyncio
+    async def test_iter_line_chunks_splits_across_reads(self):
+        """Test lines split over several reads are reassembled and chunked."""
+        # Arrange
+        stream = byte_stream(b"a\nb", b"b\n\nc", b"c\nd")
+
+        # Act
+        chunks = [chunk async for chunk in iter_line_chunks(stream, chunk_size=2, max_line_bytes=100)]
+
+        # Assert
+        assert chunks == [[b"a", b"bb"], [b"cc", b"d"]]
+
+    @pytest.mark.asyncio
+    async def test_iter_line_chunks_rejects_long_lines(self):
+        """Test an unterminated line beyond the limit aborts the stream."""
+        # Arrange
+        stream = byte_stream(b"x" * 10, b"x" * 10)
+
+        # Act & Assert
+        with pytest.raises(LineTooLongError):
+            async for _ in iter_line_chunks(stream, chunk_size=2, max_line_bytes=15):
+                pass
+
+    def test_parse_tick_lines_counts_rejects(self):
+        """Test malformed and invalid lines are rejected and the rest accepted."""
+        # Arrange
+        lines = [
+            json.dumps({"symbol": "aapl", "price": 150.5, "volume": 10, "timestamp": 5}).encode(),
+            json.dumps({"symbol": "MSFT", "price": 300.0, "volume": 1, "timestamp": "2024-01-01T00:00:00Z"}).encode(),
+            json.dumps({"symbol": "GOOG", "price": -1.0, "volume": 1}).encode(),
+            json.dumps({"symbol": "TSLA", "volume": 1}).encode(),
+            b"{not json"
+        ]
+
+        # Act
+        columns, rejected = parse_tick_lines(lines, precision="s")
+
+        # Assert
+        assert rejected == 3
+        assert columns.symbols.tolist() == ["AAPL", "MSFT"]
+        assert columns.timestamps.tolist() == [5_000_000_000, 1704067200 * 1_000_000_000]
+
+    def test_parse_tick_lines_rejects_int64_overflow(self):
+        """Test volumes and timestamps beyond int64 count as rejected lines."""
+        # Arrange
+        lines = [
+            json.dumps({"symbol": "AAPL", "price": 1.0, "volume": 10 ** 20}).encode(),
+            json.dumps({"symbol": "AAPL", "price": 1.0, "volume": 1, "timestamp": 1e30}).encode(),
+            json.dumps({"symbol": "AAPL", "price": 1.0, "volume": 1, "timestamp": 2 * 10 ** 12}).encode(),
+            json.dumps({"symbol": "AAPL", "price": 1.0, "volume": 1, "timestamp": 5}).encode()
+        ]
+
+        # Act
+        columns, rejected = parse_tick_lines(lines, precision="s")
+
+        # Assert
+        assert rejected == 3
+        assert columns.timestamps.tolist() == [5_000_000_000]
+
+    def test_parse_tick_lines_stamps_lines_without_timestamp_distinctly(self):
+        """Test lines without a timestamp get one nanosecond each instead of sharing one."""
+        # Arrange
+        lines = [
+            json.dumps({"symbol": "AAPL", "price": 1.0, "volume": 1}).encode(),
+            json.dumps({"symbol": "AAPL", "price": 1.0, "volume": 1, "timestamp": 5}).encode(),
+            json.dumps({"symbol": "AAPL", "price": 2.0, "volume": 1}).encode()
+        ]
+
+        # Act
+        columns, rejected = parse_tick_lines(lines, precision="s")
+
+        # Assert
+        first, given, last = columns.timestamps.tolist()
+        assert rejected == 0
+        assert given == 5_000_000_000
+        assert last == first + 1
@@ -0,0 +1,63 @@
+"""Unit tests for live OHLCV bars."""
+
+from app.models.series import StockSeries
+from app.services.live_bars import LiveBarStore
+
+_NS = 1_000_000_000
+
+
+class TestLiveBars:
+    """Test cases for LiveBarStore."""
+
+    def test_record_builds_ohlcv(self):
+        """Test ticks in one window fold into a single bar."""
+        # Arrange
+        store = LiveBarStore({"1m": 60})
+
+        # Act
+        store.record_series("AAPL", StockSeries([60 * _NS, 70 * _NS, 80 * _NS], [10.0, 12.0, 9.0], [1, 2, 3]))
+        bar = store.current("AAPL", "1m", now_ns=90 * _NS)
+
+        # Assert
+        assert (bar.start_ns, bar.open, bar.high, bar.low, bar.close) == (60 * _NS, 10.0, 12.0, 9.0, 9.0)
+        assert (bar.volume, bar.count, bar.mean_price) == (6, 3, 31.0 / 3)
+
+    def test_new_window_replaces_bar_and_late_ticks_are_ignored(self):
+        """Test a tick in a newer window starts a new bar and older ticks leave it alone."""
+        # Arrange
+        store = LiveBarStore({"1m": 60, "1h": 3600})
+        store.record("AAPL", 60 * _NS, 10.0, 1)
+
+        # Act
+        store.record("AAPL", 120 * _NS, 20.0, 1)
+        store.record("AAPL", 100 * _NS, 99.0, 1)
+
+        # Assert
+        minute = store.current("AAPL", "1m", now_ns=130 * _NS)
+        hour = store.current("AAPL", "1h", now_ns=130 * _NS)
+        assert (minute.open, minute.high, minute.count) == (20.0, 20.0, 1)
+        assert (hour.open, hour.high, hour.count) == (10.0, 99.0, 3)
+
+    def test_current_ignores_stale_windows(self):
+        """Test no bar is returned once its window has passed."""
+        # Arrange
+        store = LiveBarStore({"1m": 60})
+        store.record("AAPL", 60 * _NS, 10.0, 1)
+
+        # Act & Assert
+        assert store.current("AAPL", "1m", now_ns=121 * _NS) is None
+
+    def test_is_complete_requires_window_after_start(self):
+        """Test only bars of windows opened after the store started are complete."""
+        # Arrange
+        store = LiveBarStore({"1m": 60})
+        store.record("AAPL", store.started_ns - _NS, 10.0, 1)
+        store.record("MSFT", store.started_ns + 60 * _NS, 10.0, 1)
+
+        # Act
+        early = store.current("AAPL", "1m", now_ns=store.started_ns)
+        late = store.current("MSFT", "1m", now_ns=store.started_ns + 60 * _NS)
+
+        # Assert
+        assert store.is_complete(late)
+        assert early is None or not store.is_complete(early)
@@ -0,0 +1,45 @@
+"""Unit tests for the in-memory market snapshot."""
+
+from app.services.market_snapshot import MarketSnapshotStore
+
+
+class TestMarketSnapshot:
+    """Test cases for MarketSnapshotStore."""
+
+    def test_get_requires_load_per_lookback(self):
+        """Test a snapshot is only served for lookbacks that have been loaded."""
+        # Arrange
+        store = MarketSnapshotStore(resync_seconds=60)
+
+        # Act
+        before = store.get(3600)
+        store.load(3600, {"AAPL": (10, 150.0, 1)}, {"AAPL": 140.0})
+
+        # Assert
+        assert before is None
+        assert store.get(3600) == ({"AAPL": (10, 150.0, 1)}, {"AAPL": 140.0})
+        assert store.get(60) is None
+
+    def test_record_keeps_newest_tick(self):
+        """Test ingested ticks update the snapshot unless they are older."""
+        # Arrange
+        store = MarketSnapshotStore(resync_seconds=60)
+        store.record("AAPL", 5, 1.0, 1)
+        store.load(3600, {"AAPL": (10, 150.0, 1)}, {})
+
+        # Act
+        store.record("AAPL", 8, 149.0, 1)
+        store.record("MSFT", 20, 300.0, 2)
+        last, _ = store.get(3600)
+
+        # Assert
+        assert last == {"AAPL": (10, 150.0, 1), "MSFT": (20, 300.0, 2)}
+
+    def test_disabled_store_never_serves(self):
+        """Test a zero resync interval disables the in-memory snapshot."""
+        # Arrange
+        store = MarketSnapshotStore(resync_seconds=0)
+        store.load(3600, {"AAPL": (10, 150.0, 1)}, {})
+
+        # Act & Assert
+        assert store.get(3600) is None
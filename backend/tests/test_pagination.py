@@ -0,0 +1,39 @@
+"""Unit tests for pagination cursors."""
+
+import pytest
+
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+class TestPaginationCursor:
+    """Test cases for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the timestamp it was issued for."""
+        # Arrange
+        cursor = encode_cursor("AAPL", "1m", 1_704_067_260_000_000_000)
+
+        # Act
+        after_ns = decode_cursor(cursor, "AAPL", "1m")
+
+        # Assert
+        assert after_ns == 1_704_067_260_000_000_000
+        assert "=" not in cursor
+
+    def test_rejects_cursor_of_another_query(self):
+        """Test a cursor cannot be replayed against a different symbol or interval."""
+        # Arrange
+        cursor = encode_cursor("AAPL", "1m", 1)
+
+        # Act / Assert
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "MSFT", "1m")
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "AAPL", "1h")
+
+    def test_rejects_garbage(self):
+        """Test malformed cursors raise InvalidCursorError."""
+        # Act / Assert
+        for cursor in ("not-a-cursor", "", "e30"):
+            with pytest.raises(InvalidCursorError):
+                decode_cursor(cursor, "AAPL", "1m")
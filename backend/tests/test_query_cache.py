@@ -0,0 +1,91 @@
+"""Unit tests for the query result cache."""
+
+import time
+
+from app.services.query_cache import QueryCache
+
+
+class TestQueryCache:
+    """Test cases for QueryCache."""
+
+    def test_get_returns_cached_value(self):
+        """Test a stored value is returned until it expires."""
+        # Arrange
+        cache = QueryCache(max_bytes=1000, ttl_seconds=60)
+
+        # Act
+        cache.put("k", "AAPL", [1, 2], 10, cache.generation("AAPL"))
+
+        # Assert
+        assert cache.get("k") == [1, 2]
+        assert cache.hits == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Test entries are dropped once their TTL elapses."""
+        # Arrange
+        cache = QueryCache(max_bytes=1000, ttl_seconds=0.01)
+        cache.put("k", "AAPL", "v", 10, 0)
+
+        # Act
+        time.sleep(0.02)
+
+        # Assert
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_respects_byte_budget(self):
+        """Test least recently used entries are evicted over the byte cap."""
+        # Arrange
+        cache = QueryCache(max_bytes=25, ttl_seconds=60)
+        cache.put("a", "AAPL", "a", 10, 0)
+        cache.put("b", "MSFT", "b", 10, 0)
+        cache.get("a")
+
+        # Act
+        cache.put("c", "TSLA", "c", 10, 0)
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") == "a"
+        assert cache.get("c") == "c"
+        assert cache.size == 20
+
+    def test_invalidate_drops_symbol_entries(self):
+        """Test invalidation only affects the written symbol."""
+        # Arrange
+        cache = QueryCache(max_bytes=1000, ttl_seconds=60)
+        cache.put("a1", "AAPL", 1, 10, 0)
+        cache.put("a2", "AAPL", 2, 10, 0)
+        cache.put("m", "MSFT", 3, 10, 0)
+
+        # Act
+        cache.invalidate("AAPL")
+
+        # Assert
+        assert cache.get("a1") is None
+        assert cache.get("a2") is None
+        assert cache.get("m") == 3
+        assert cache.size == 10
+
+    def test_put_rejects_result_read_before_write(self):
+        """Test a result fetched before a concurrent write is not cached."""
+        # Arrange
+        cache = QueryCache(max_bytes=1000, ttl_seconds=60)
+        generation = cache.generation("AAPL")
+
+        # Act
+        cache.invalidate("AAPL")
+        stored = cache.put("k", "AAPL", "stale", 10, generation)
+
+        # Assert
+        assert stored is False
+        assert cache.get("k") is None
+
+    def test_disabled_cache_stores_nothing(self):
+        """Test a zero TTL disables caching."""
+        # Arrange
+        cache = QueryCache(max_bytes=1000, ttl_seconds=0)
+
+        # Act & Assert
+        assert cache.put("k", "AAPL", "v", 10, 0) is False
+        assert cache.get("k") is None
@@ -0,0 +1,107 @@
+"""Unit tests for the query cost guard."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.query_cost import QueryCostError, QueryCostGuard, estimate_rows
+
+START = datetime(2024, 1, 1)
+
+
+class TestQueryCostGuard:
+    """Test cases for QueryCostGuard."""
+
+    def test_estimate_is_capped_by_tick_rate(self):
+        """Test sparse symbols are estimated at one row per tick rather than per window."""
+        # Act
+        dense = estimate_rows(86400, 1, None)
+        sparse = estimate_rows(86400, 1, 0.01)
+
+        # Assert
+        assert dense == 86401
+        assert sparse == 865
+
+    def test_query_within_limit_is_unchanged(self):
+        """Test a query under the limit runs as requested."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=2000, policy="reject")
+
+        # Act
+        decision = guard.check(START, START + timedelta(days=1), "1m")
+
+        # Assert
+        assert decision.action is None
+        assert decision.interval == "1m"
+
+    def test_coarsen_picks_finest_interval_that_fits(self):
+        """Test an expensive query is widened to the finest interval under the limit."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=1000, policy="coarsen")
+
+        # Act
+        decision = guard.check(START, START + timedelta(days=1), "1m")
+
+        # Assert
+        assert decision.action == "coarsen"
+        assert decision.interval == "5m"
+        assert decision.estimated_rows <= 1000
+
+    def test_paginate_cuts_range_at_whole_windows(self):
+        """Test paginating ends the page on a window boundary within the limit."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=100, policy="paginate")
+
+        # Act
+        decision = guard.check(START, START + timedelta(days=1), "1m")
+
+        # Assert
+        assert decision.action == "paginate"
+        assert decision.end_time == START + timedelta(minutes=99)
+
+    def test_paginate_aligns_page_end_to_epoch_windows(self):
+        """Test a page starting mid-window still ends on an epoch window boundary."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=100, policy="paginate")
+        start = START + timedelta(seconds=30)
+
+        # Act
+        decision = guard.check(start, start + timedelta(days=1), "1m")
+
+        # Assert
+        assert decision.end_time == START + timedelta(minutes=99)
+        assert decision.end_time.second == 0
+
+    def test_estimate_scales_with_symbol_count(self):
+        """Test a multi-symbol query is charged for every symbol it reads."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=2000, policy="coarsen")
+
+        # Act
+        single = guard.check(START, START + timedelta(days=1), "1m")
+        double = guard.check(START, START + timedelta(days=1), "1m", symbols=2)
+
+        # Assert
+        assert single.action is None
+        assert double.interval == "5m"
+        assert double.estimated_rows == 2 * 289
+
+    def test_reject_raises(self):
+        """Test the reject policy refuses expensive queries."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=1000, policy="reject")
+
+        # Act / Assert
+        with pytest.raises(QueryCostError):
+            guard.check(START, START + timedelta(days=1), "1m")
+
+    def test_zero_limit_disables_guard(self):
+        """Test a non-positive limit lets every query through."""
+        # Arrange
+        guard = QueryCostGuard(max_rows=0, policy="reject")
+
+        # Act
+        decision = guard.check(START, START + timedelta(days=365), "1s")
+
+        # Assert
+        assert decision.action is None
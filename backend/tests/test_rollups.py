@@ -0,0 +1,195 @@
+"""Unit tests for rollup maintenance and query routing."""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from app.models.series import datetime_to_ns
+from app.services.rollups import RollupManager, build_levels, build_task_flux
+
+
+def backfills(manager):
+    """Return the backfill scripts the manager ran."""
+    return [call[0][0] for call in manager.db_manager.query.call_args_list if "to(bucket:" in call[0][0]]
+
+
+class TestRollups:
+    """Test cases for RollupManager."""
+
+    def make_manager(self, ready=True):
+        """Create a manager with the default 1m/1h/1d levels."""
+        manager = RollupManager(Mock(), level_names=["1d", "1m", "1h"], settle_seconds=60)
+        manager.ready = ready
+        manager.coverage = {level.name: 0 for level in manager.levels}
+        manager.candle_coverage = dict(manager.coverage)
+        return manager
+
+    def test_levels_chain_finest_first(self):
+        """Test each level reads from the next finer one."""
+        # Act
+        levels = build_levels(["1d", "1m", "1h"])
+
+        # Assert
+        assert [level.name for level in levels] == ["1m", "1h", "1d"]
+        assert levels[0].source_bucket == "stock_data"
+        assert levels[1].source_bucket == levels[0].bucket
+        assert levels[2].source_bucket == levels[1].bucket
+
+    def test_task_flux_writes_to_rollup_bucket(self):
+        """Test task scripts aggregate by window start into the level bucket."""
+        # Arrange
+        raw_level, hourly_level = build_levels(["1m", "1h"])
+
+        # Act
+        raw_flux = build_task_flux(raw_level, "-2m")
+        hourly_flux = build_task_flux(hourly_level, "-2h")
+
+        # Assert
+        assert 'value: "price_count"' in raw_flux
+        assert 'value: "open"' in raw_flux and '_field: "pv_sum"' in raw_flux
+        assert 'timeSrc: "_start"' in raw_flux
+        assert f'to(bucket: "{raw_level.bucket}"' in raw_flux
+        assert f'from(bucket: "{raw_level.bucket}")' in hourly_flux
+
+    def test_select_level_picks_coarsest_divisor(self):
+        """Test intervals route to the coarsest rollup that divides them."""
+        # Arrange
+        manager = self.make_manager()
+
+        # Act & Assert
+        assert manager.select_level("10s") is None
+        assert manager.select_level("15m").name == "1m"
+        assert manager.select_level("4h").name == "1h"
+        assert manager.select_level("1d").name == "1d"
+        assert self.make_manager(ready=False).select_level("1d") is None
+
+    def test_plan_splits_head_body_and_tail(self):
+        """Test a long range reads whole old windows from the rollup and the rest raw."""
+        # Arrange
+        manager = self.make_manager()
+        now = datetime.utcnow()
+        start = datetime(now.year, now.month, now.day, 0, 30) - timedelta(days=10)
+
+        # Act
+        head, body, tail = manager.plan("1h", start, now)
+
+        # Assert
+        assert head.level is None and head.start == start
+        assert head.stop == start + timedelta(minutes=30)
+        assert body.level.name == "1h"
+        assert body.stop == tail.start
+        assert tail.level is None and tail.stop == now
+        assert now - tail.start < timedelta(hours=2, minutes=2)
+
+    def test_plan_recent_range_reads_raw(self):
+        """Test ranges newer than the watermark are not routed."""
+        # Arrange
+        manager = self.make_manager()
+        now = datetime.utcnow()
+
+        # Act
+        segments = manager.plan("1d", now - timedelta(hours=3), now)
+
+        # Assert
+        assert len(segments) == 1
+        assert segments[0].level is None
+
+    def test_ensure_rollups_creates_buckets_and_tasks(self):
+        """Test missing buckets and tasks are created and new buckets backfilled."""
+        # Arrange
+        manager = self.make_manager(ready=False)
+        client = manager.db_manager.client
+        client.buckets_api.return_value.find_bucket_by_name.return_value = None
+        client.tasks_api.return_value.find_tasks.return_value = []
+        manager.db_manager.query.return_value = []
+
+        # Act
+        manager.ensure_rollups(backfill_days=30)
+
+        # Assert
+        assert client.buckets_api.return_value.create_bucket.call_count == 3
+        assert client.tasks_api.return_value.create_task.call_count == 3
+        assert len(backfills(manager)) == 3
+        assert manager.ready
+
+    def test_ensure_rollups_backfills_changed_tasks(self):
+        """Test a task whose script changed is backfilled even though its bucket exists."""
+        # Arrange
+        manager = self.make_manager(ready=False)
+        client = manager.db_manager.client
+        client.tasks_api.return_value.find_tasks.return_value = [Mock(id="task", flux="old script")]
+        manager.db_manager.query.return_value = []
+
+        # Act
+        manager.ensure_rollups(backfill_days=30)
+
+        # Assert
+        client.buckets_api.return_value.create_bucket.assert_not_called()
+        assert client.tasks_api.return_value.update_task_request.call_count == 3
+        assert len(backfills(manager)) == 3
+
+    def test_plan_reads_raw_before_coverage(self):
+        """Test windows older than a level's first stored window read raw data."""
+        # Arrange
+        manager = self.make_manager()
+        now = datetime.utcnow()
+        start = datetime(now.year, now.month, now.day) - timedelta(days=10)
+        manager.coverage["1h"] = datetime_to_ns(start + timedelta(days=5, minutes=30))
+
+        # Act
+        head, body, _ = manager.plan("1h", start, now)
+
+        # Assert
+        assert head.level is None and head.start == start
+        assert body.start == start + timedelta(days=5, hours=1)
+
+    def test_candles_skip_levels_without_candle_fields(self):
+        """Test candle queries never route to a level that lacks OHLC fields."""
+        # Arrange
+        manager = self.make_manager()
+        manager.candle_coverage = {"1m": 0}
+        now = datetime.utcnow()
+
+        # Act
+        price_level = manager.select_level("1d")
+        candle_level = manager.select_level("1d", candles=True)
+
+        # Assert
+        assert price_level.name == "1d"
+        assert candle_level.name == "1m"
+        assert manager.plan("1h", now - timedelta(days=3), now, candles=True)[1].level.name == "1m"
+
+    def test_late_write_stops_routing_until_refreshed(self):
+        """Test a write older than the task horizon sends its windows to raw data until re-aggregated."""
+        # Arrange
+        manager = self.make_manager()
+        manager.settle_seconds = 0
+        now = datetime.utcnow()
+        start = datetime(now.year, now.month, now.day) - timedelta(days=10)
+        late_ns = datetime_to_ns(start + timedelta(days=3, minutes=10))
+
+        # Act
+        manager.mark_written(late_ns, late_ns)
+        dirty_body, dirty_tail = manager.plan("1h", start, now)
+        manager.refresh_dirty()
+        refreshed = manager.plan("1h", start, now)
+
+        # Assert
+        assert dirty_body.stop == start + timedelta(days=3)
+        assert dirty_tail.level is None and dirty_tail.start == dirty_body.stop
+        scripts = backfills(manager)
+        assert len(scripts) == 3
+        assert "stop: " in scripts[0] and f'to(bucket: "{manager.levels[0].bucket}"' in scripts[0]
+        assert refreshed[0].stop > start + timedelta(days=9)
+
+    def test_recent_write_is_left_to_tasks(self):
+        """Test writes in windows the tasks still revisit are not marked dirty."""
+        # Arrange
+        manager = self.make_manager()
+        now_ns = datetime_to_ns(datetime.utcnow())
+
+        # Act
+        manager.mark_written(now_ns, now_ns)
+        manager.refresh_dirty()
+
+        # Assert
+        manager.db_manager.query.assert_not_called()
@@ -0,0 +1,118 @@
+"""Unit tests for columnar stock series."""
+
+import numpy as np
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from app.models.series import CandleSeriesBuilder, StockSeries, StockSeriesBuilder, concat_series, format_timestamps
+
+
+def make_record(time, price, volume):
+    """Create a mock pivoted query record."""
+    return Mock(get_time=lambda: time, values={"price": price, "volume": volume})
+
+
+class TestStockSeries:
+    """Test cases for StockSeries and StockSeriesBuilder."""
+
+    def test_builder_decodes_typed_columns(self):
+        """Test records decode into int64/float64/int64 arrays."""
+        # Arrange
+        builder = StockSeriesBuilder(chunk_size=2)
+        times = [datetime(2024, 1, 1, 0, 0, i, tzinfo=timezone.utc) for i in range(3)]
+
+        # Act
+        for i, time in enumerate(times):
+            builder.add_record(make_record(time, 100.0 + i, 10 * i))
+        series = builder.build()
+
+        # Assert
+        assert len(series) == 3
+        assert series.timestamps.dtype == np.int64
+        assert series.prices.dtype == np.float64
+        assert series.volumes.dtype == np.int64
+        assert series.timestamps[0] == 1704067200 * 1_000_000_000
+        assert series.prices.tolist() == [100.0, 101.0, 102.0]
+        assert series.volumes.tolist() == [0, 10, 20]
+
+    def test_builder_defaults_missing_fields(self):
+        """Test records missing a field decode as zero."""
+        # Arrange
+        builder = StockSeriesBuilder()
+        builder.add_record(make_record(datetime(2024, 1, 1, tzinfo=timezone.utc), 5.0, None))
+
+        # Act
+        series = builder.build()
+
+        # Assert
+        assert series.volumes.tolist() == [0]
+
+    def test_to_data_points_matches_isoformat(self):
+        """Test serialization matches datetime.isoformat() output."""
+        # Arrange
+        time = datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+        builder = StockSeriesBuilder()
+        builder.add_record(make_record(time, 150.5, 1000))
+
+        # Act
+        data_points = builder.build().to_data_points()
+
+        # Assert
+        assert data_points == [{"timestamp": time.isoformat(), "price": 150.5, "volume": 1000}]
+
+    def test_to_columns_uses_epoch_milliseconds(self):
+        """Test the columnar representation carries epoch milliseconds."""
+        # Arrange
+        time = datetime(2024, 1, 1, 9, 30, tzinfo=timezone.utc)
+        builder = StockSeriesBuilder()
+        builder.add_record(make_record(time, 150.5, 1000))
+
+        # Act
+        columns = builder.build().to_columns()
+
+        # Assert
+        assert columns["t"].tolist() == [int(time.timestamp() * 1000)]
+        assert columns["p"].tolist() == [150.5]
+        assert columns["v"].tolist() == [1000]
+
+    def test_format_timestamps_sub_second(self):
+        """Test sub-second timestamps keep microsecond precision."""
+        # Arrange
+        time = datetime(2024, 1, 1, 9, 30, 0, 250000, tzinfo=timezone.utc)
+        timestamps = np.array([int(time.timestamp()) * 1_000_000_000 + 250_000_000])
+
+        # Act & Assert
+        assert format_timestamps(timestamps) == [time.isoformat()]
+
+    def test_empty_and_concat(self):
+        """Test empty series and concatenation."""
+        # Arrange
+        a = StockSeries([1, 2], [1.0, 2.0], [10, 20])
+        b = StockSeries([3], [3.0], [30])
+
+        # Act
+        combined = concat_series([StockSeries.empty(), a, b])
+
+        # Assert
+        assert combined.timestamps.tolist() == [1, 2, 3]
+        assert combined.nbytes == 3 * 8 * 3
+        assert StockSeries.empty().to_data_points() == []
+
+    def test_candle_builder_concatenates_chunks(self):
+        """Test candle records decode across chunk boundaries."""
+        # Arrange
+        builder = CandleSeriesBuilder(chunk_size=2)
+        times = [datetime(2024, 1, 1, 0, i, tzinfo=timezone.utc) for i in range(3)]
+
+        # Act
+        for i, time in enumerate(times):
+            builder.add_record(Mock(get_time=lambda time=time: time, values={
+                "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i, "close": 1.5 + i, "volume": 10 * i, "vwap": 1.2 + i
+            }))
+        candles = builder.build()
+
+        # Assert
+        assert len(candles) == 3
+        assert candles.opens.tolist() == [1.0, 2.0, 3.0]
+        assert candles.volumes.dtype == np.int64 and candles.volumes.tolist() == [0, 10, 20]
+        assert len(CandleSeriesBuilder().build()) == 0
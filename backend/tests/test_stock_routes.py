@@ -0,0 +1,249 @@
+"""Unit tests for the stock API routes."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.stock_routes import router
+from app.models.stock_data import TimeRangeQuery
+from app.services.stock_service import TimeRangeStream
+
+
+def tick_line(symbol="AAPL", price=1.0, volume=1, timestamp=5):
+    """Encode one tick as an NDJSON ingest line."""
+    return json.dumps({"symbol": symbol, "price": price, "volume": volume, "timestamp": timestamp})
+
+
+def points_stream(points, error=None):
+    """Build a service stream yielding ``points`` and then raising ``error``, if given."""
+    async def generate():
+        for point in points:
+            yield point
+        if error is not None:
+            raise error
+
+    return TimeRangeStream(TimeRangeQuery(symbol="AAPL", interval="1m"), generate(), "1m")
+
+
+class TestStockRoutes:
+    """Test cases for the stock API routes."""
+
+    @pytest.fixture
+    def mock_stock_service(self):
+        """Patch the service used by the routes."""
+        with patch("app.api.stock_routes.stock_service") as service:
+            yield service
+
+    @pytest.fixture
+    def client(self, mock_stock_service):
+        """Create a test client for an app serving only the stock routes."""
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_health_check_pings_database(self, client, mock_stock_service):
+        """Test the health check reports the database as down when the ping fails."""
+        # Arrange
+        mock_stock_service.is_database_connected_async = AsyncMock(return_value=False)
+        mock_stock_service.get_available_symbols_async = AsyncMock(return_value=["AAPL"])
+        mock_stock_service.batch_writer.failed_batches = 0
+        mock_stock_service.batch_writer.failed_items = 0
+
+        # Act
+        response = client.get("/api/v1/stocks/health")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["status"] == "unhealthy"
+        assert response.json()["database_connected"] is False
+
+    def test_health_check_healthy(self, client, mock_stock_service):
+        """Test the health check reports the symbol count when the database is up."""
+        # Arrange
+        mock_stock_service.is_database_connected_async = AsyncMock(return_value=True)
+        mock_stock_service.get_available_symbols_async = AsyncMock(return_value=["AAPL", "MSFT"])
+        mock_stock_service.batch_writer.failed_batches = 1
+        mock_stock_service.batch_writer.failed_items = 5000
+
+        # Act
+        response = client.get("/api/v1/stocks/health")
+
+        # Assert
+        assert response.json() == {
+            "status": "healthy",
+            "database_connected": True,
+            "available_symbols_count": 2,
+            "failed_write_batches": 1,
+            "failed_write_items": 5000
+        }
+
+    @pytest.mark.parametrize("path, extra", [
+        ("/api/v1/stocks/candles", {"page_size": 10}),
+        ("/api/v1/stocks/query/stream", {"cursor": "abc"}),
+        ("/api/v1/stocks/indicators", {"max_points": 100, "indicators": [{"name": "sma", "period": 3}]}),
+    ])
+    def test_query_only_fields_rejected_elsewhere(self, client, mock_stock_service, path, extra):
+        """Test downsampling and pagination fields get a 422 where they would be ignored."""
+        # Act
+        response = client.post(path, json={"symbol": "AAPL", "interval": "1m", **extra})
+
+        # Assert
+        assert response.status_code == 422
+        assert "Fields not supported by this query" in response.text
+
+    def test_query_accepts_pagination_fields(self, client, mock_stock_service):
+        """Test /query still takes max_points, page_size and cursor."""
+        # Arrange
+        mock_stock_service.query_data_by_time_range_async = AsyncMock(return_value={
+            "symbol": "AAPL", "data_points": [], "total_points": 0,
+            "time_range": {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00"}, "interval": "1m"
+        })
+
+        # Act
+        response = client.post(
+            "/api/v1/stocks/query",
+            json={"symbol": "AAPL", "max_points": 100, "page_size": 10, "cursor": "abc"}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        query = mock_stock_service.query_data_by_time_range_async.call_args[0][0]
+        assert (query.max_points, query.page_size, query.cursor) == (100, 10, "abc")
+
+    def test_stream_writes_chunks_of_ndjson(self, client, mock_stock_service):
+        """Test streamed points arrive as one NDJSON line each across several chunks."""
+        # Arrange
+        points = [{"timestamp": f"2024-01-01T00:0{i}:00+00:00", "price": float(i), "volume": i} for i in range(5)]
+        mock_stock_service.stream_data_by_time_range_async = AsyncMock(return_value=points_stream(points))
+
+        # Act
+        with patch("app.api.stock_routes.settings.query_stream_chunk_rows", 2):
+            response = client.post("/api/v1/stocks/query/stream", json={"symbol": "AAPL"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["x-interval"] == "1m"
+        assert [json.loads(line) for line in response.text.splitlines()] == points
+
+    def test_stream_empty_result(self, client, mock_stock_service):
+        """Test a query without rows streams an empty body."""
+        # Arrange
+        mock_stock_service.stream_data_by_time_range_async = AsyncMock(return_value=points_stream([]))
+
+        # Act
+        response = client.post("/api/v1/stocks/query/stream", json={"symbol": "AAPL"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_stream_error_before_first_chunk_returns_500(self, client, mock_stock_service):
+        """Test a failing query gets an error status rather than an empty 200."""
+        # Arrange
+        mock_stock_service.stream_data_by_time_range_async = AsyncMock(
+            return_value=points_stream([], RuntimeError("Failed to execute query: Database error"))
+        )
+
+        # Act
+        response = client.post("/api/v1/stocks/query/stream", json={"symbol": "AAPL"})
+
+        # Assert
+        assert response.status_code == 500
+        assert "Database error" in response.json()["detail"]
+
+    def test_stream_error_after_first_chunk_ends_with_error_line(self, client, mock_stock_service):
+        """Test a failure mid-stream is reported in a final NDJSON line."""
+        # Arrange
+        points = [{"timestamp": "2024-01-01T00:00:00+00:00", "price": 1.0, "volume": 1}] * 3
+        mock_stock_service.stream_data_by_time_range_async = AsyncMock(
+            return_value=points_stream(points, RuntimeError("Failed to execute query: Connection reset"))
+        )
+
+        # Act
+        with patch("app.api.stock_routes.settings.query_stream_chunk_rows", 2):
+            response = client.post("/api/v1/stocks/query/stream", json={"symbol": "AAPL"})
+
+        # Assert
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.status_code == 200
+        assert lines[:2] == points[:2]
+        assert lines[-1] == {"error": "Failed to query data: Failed to execute query: Connection reset"}
+
+    def test_ws_ingest_acknowledges_counts(self, client, mock_stock_service):
+        """Test each written chunk is acknowledged with its own and running counts."""
+        # Arrange
+        mock_stock_service.store_tick_columns_async = AsyncMock()
+
+        # Act
+        with patch("app.api.stock_routes.settings.ingest_chunk_size", 3):
+            with client.websocket_connect("/api/v1/stocks/ws/ingest?precision=s") as websocket:
+                websocket.send_text("\n".join([tick_line(), tick_line("MSFT"), "{not json"]))
+                first = websocket.receive_json()
+                websocket.send_bytes("\n".join([tick_line(), tick_line(), tick_line()]).encode())
+                second = websocket.receive_json()
+
+        # Assert
+        assert first == {"accepted": 2, "rejected": 1, "total_accepted": 2, "total_rejected": 1}
+        assert second == {"accepted": 3, "rejected": 0, "total_accepted": 5, "total_rejected": 1}
+        columns = mock_stock_service.store_tick_columns_async.await_args_list[0][0][0]
+        assert columns.symbols.tolist() == ["AAPL", "MSFT"]
+        assert columns.timestamps.tolist() == [5_000_000_000, 5_000_000_000]
+
+    def test_ws_ingest_counts_rejected_lines(self, client, mock_stock_service):
+        """Test a chunk of only invalid lines is acknowledged as rejected."""
+        # Arrange
+        mock_stock_service.store_tick_columns_async = AsyncMock()
+        lines = [tick_line(price=-1.0), tick_line(volume=10 ** 20), "{not json"]
+
+        # Act
+        with patch("app.api.stock_routes.settings.ingest_chunk_size", 3):
+            with client.websocket_connect("/api/v1/stocks/ws/ingest") as websocket:
+                websocket.send_text("\n".join(lines))
+                ack = websocket.receive_json()
+
+        # Assert
+        assert ack == {"accepted": 0, "rejected": 3, "total_accepted": 0, "total_rejected": 3}
+
+    def test_ws_ingest_write_failure_closes_with_internal_error(self, client, mock_stock_service):
+        """Test a failed InfluxDB write is reported and closes the socket with 1011."""
+        # Arrange
+        mock_stock_service.store_tick_columns_async = AsyncMock(
+            side_effect=RuntimeError("Failed to write records to InfluxDB: Connection refused")
+        )
+
+        # Act
+        with patch("app.api.stock_routes.settings.ingest_chunk_size", 1):
+            with client.websocket_connect("/api/v1/stocks/ws/ingest") as websocket:
+                websocket.send_text(tick_line())
+                error = websocket.receive_json()
+                with pytest.raises(WebSocketDisconnect) as disconnect:
+                    websocket.receive_json()
+
+        # Assert
+        assert error == {"error": "Failed to store data points: Failed to write records to InfluxDB: Connection refused"}
+        assert disconnect.value.code == 1011
+
+    def test_ws_ingest_rejects_unknown_precision(self, client, mock_stock_service):
+        """Test an unknown timestamp precision is refused before accepting the socket."""
+        # Act & Assert
+        with pytest.raises(WebSocketDisconnect) as disconnect:
+            with client.websocket_connect("/api/v1/stocks/ws/ingest?precision=minutes"):
+                pass
+        assert disconnect.value.code == 1008
+
+    def test_latest_rejects_invalid_symbol(self, client, mock_stock_service):
+        """Test path symbols are validated before reaching the service."""
+        # Arrange
+        mock_stock_service.query_latest_data_async = AsyncMock()
+
+        # Act
+        response = client.get("/api/v1/stocks/AAPL1/latest")
+
+        # Assert
+        assert response.status_code == 422
+        mock_stock_service.query_latest_data_async.assert_not_called()
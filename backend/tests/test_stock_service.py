@@ -2,10 +2,20 @@
 
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
+from app.core.batch_writer import WriteQueueFullError
+from app.services.query_cost import QueryCostGuard
 from app.services.stock_service import StockDataService
-from app.models.stock_data import StockDataPoint, TimeRangeQuery, StockDataResponse
+from app.models.stock_data import (
+    IndicatorQuery,
+    MultiSymbolQuery,
+    StockDataPoint,
+    StockDataQuery,
+    TimeRangeQuery,
+    StockDataResponse
+)
+from app.models.ticks import TickColumns
 
 
 class TestStockDataService:
@@ -18,14 +28,25 @@ class TestStockDataService:
         mock_manager.write_point = Mock()
         mock_manager.write_points = Mock()
         mock_manager.query = Mock()
+        mock_manager.query_stream = Mock()
         return mock_manager
 
     @pytest.fixture
-    def stock_service(self, mock_db_manager):
+    def mock_async_db_manager(self):
+        """Create a mock async database manager."""
+        mock_manager = Mock()
+        mock_manager.write_points = AsyncMock()
+        mock_manager.write_records = AsyncMock()
+        mock_manager.query = AsyncMock()
+        return mock_manager
+
+    @pytest.fixture
+    def stock_service(self, mock_db_manager, mock_async_db_manager):
         """Create a stock service instance with mocked dependencies."""
         with patch('app.services.stock_service.db_manager', mock_db_manager):
             service = StockDataService()
             service.db_manager = mock_db_manager
+            service.async_db_manager = mock_async_db_manager
             return service
 
     @pytest.fixture
@@ -41,7 +62,7 @@ class TestStockDataService:
     @pytest.fixture
     def sample_time_range_query(self):
         """Create a sample time range query."""
-        return TimeRangeQuery(
+        return StockDataQuery(
             symbol="AAPL",
             start_time=datetime.utcnow() - timedelta(days=1),
             end_time=datetime.utcnow(),
@@ -49,16 +70,31 @@ class TestStockDataService:
         )
 
     def test_store_data_point_success(self, stock_service, sample_data_point, mock_db_manager):
-        """Test successful storage of a single data point."""
+        """Test a single data point is queued and written by the batch writer."""
         # Act
         stock_service.store_data_point(sample_data_point)
+        stock_service.flush()
+
+        # Assert
+        mock_db_manager.write_points.assert_called_once()
+        points = mock_db_manager.write_points.call_args[0][0]
+        assert len(points) == 1
+        line = points[0].to_line_protocol()
+        assert line.startswith("stock_data,symbol=AAPL ")
+        assert "price=150.5" in line
+        assert "volume=1000i" in line
+
+    def test_store_data_point_batches_writes(self, stock_service, mock_db_manager):
+        """Test consecutive data points are coalesced into one write."""
+        # Act
+        for price in (150.0, 151.0, 152.0):
+            stock_service.store_data_point(StockDataPoint(symbol="AAPL", price=price, volume=10))
+        stock_service.flush()
 
         # Assert
-        mock_db_manager.write_point.assert_called_once()
-        call_args = mock_db_manager.write_point.call_args[0][0]
-        assert call_args.get_tag("symbol") == "AAPL"
-        assert call_args.get_field("price") == 150.50
-        assert call_args.get_field("volume") == 1000
+        written = sum(len(call[0][0]) for call in mock_db_manager.write_points.call_args_list)
+        assert written == 3
+        assert mock_db_manager.write_points.call_count < 3
 
     def test_store_data_batch_success(self, stock_service, mock_db_manager):
         """Test successful storage of multiple data points."""
@@ -75,24 +111,19 @@ class TestStockDataService:
         mock_db_manager.write_points.assert_called_once()
         points = mock_db_manager.write_points.call_args[0][0]
         assert len(points) == 2
-        assert points[0].get_tag("symbol") == "AAPL"
-        assert points[1].get_tag("symbol") == "GOOGL"
+        assert points[0].to_line_protocol().startswith("stock_data,symbol=AAPL ")
+        assert points[1].to_line_protocol().startswith("stock_data,symbol=GOOGL ")
 
     def test_query_data_by_time_range_success(self, stock_service, sample_time_range_query, mock_db_manager):
         """Test successful query of data by time range."""
         # Arrange
-        mock_result = [
+        mock_records = [
             Mock(
-                records=[
-                    Mock(
-                        get_time=lambda: datetime.utcnow(),
-                        get_value=lambda: 150.50,
-                        values={"volume": 1000}
-                    )
-                ]
+                get_time=lambda: datetime.utcnow(),
+                values={"price": 150.50, "volume": 1000}
             )
         ]
-        mock_db_manager.query.return_value = mock_result
+        mock_db_manager.query_stream.return_value = iter(mock_records)
 
         # Act
         result = stock_service.query_data_by_time_range(sample_time_range_query)
@@ -103,23 +134,106 @@ class TestStockDataService:
         assert result.interval == "1m"
         assert len(result.data_points) == 1
         assert result.data_points[0]["price"] == 150.50
+        assert result.data_points[0]["volume"] == 1000
+        mock_db_manager.query_stream.assert_called_once()
+
+    def test_query_data_by_time_range_reports_coarsened_interval(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test a query over the row limit runs at a wider interval and says so."""
+        # Arrange
+        stock_service.cost_guard.max_rows = 1000
+        mock_db_manager.query_stream.return_value = iter([])
+
+        # Act
+        result = stock_service.query_data_by_time_range(sample_time_range_query)
+
+        # Assert
+        assert result.interval == "5m"
+        assert result.requested_interval == "1m"
+        assert "every: 5m" in mock_db_manager.query_stream.call_args[0][0]
+
+    def test_stream_data_by_time_range_applies_cost_guard(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test streamed queries are coarsened like buffered ones."""
+        # Arrange
+        stock_service.cost_guard.max_rows = 1000
+        mock_db_manager.query_stream.return_value = iter([])
+
+        # Act
+        stream = stock_service.stream_data_by_time_range(sample_time_range_query)
+
+        # Assert
+        assert (stream.query.interval, stream.requested_interval) == ("5m", "1m")
+        assert "every: 5m" in mock_db_manager.query_stream.call_args[0][0]
+
+    def test_query_data_by_time_range_downsamples_to_max_points(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test max_points bounds the returned points."""
+        # Arrange
+        start = datetime(2024, 1, 1)
+        mock_db_manager.query_stream.return_value = iter([
+            Mock(get_time=lambda i=i: start + timedelta(minutes=i), values={"price": 100.0 + i % 7, "volume": 1})
+            for i in range(200)
+        ])
+        query = sample_time_range_query.model_copy(update={"max_points": 50})
+
+        # Act
+        result = stock_service.query_data_by_time_range(query)
+
+        # Assert
+        assert result.total_points == 50
+        assert sum(dp["volume"] for dp in result.data_points) == 200
+
+    def test_query_data_columns(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test the columnar payload carries parallel arrays instead of data points."""
+        # Arrange
+        time = datetime(2024, 1, 1)
+        mock_db_manager.query_stream.return_value = iter([
+            Mock(get_time=lambda: time, values={"price": 150.50, "volume": 1000})
+        ])
+
+        # Act
+        result = stock_service.query_data_columns(sample_time_range_query)
+
+        # Assert
+        assert result["symbol"] == "AAPL"
+        assert result["t"].tolist() == [1704067200000]
+        assert result["p"].tolist() == [150.50]
+        assert result["v"].tolist() == [1000]
+        assert result["total_points"] == 1
+        assert "data_points" not in result
+
+    def test_query_data_by_time_range_paginates_with_cursor(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test a page returns page_size points and a cursor that resumes after the last one."""
+        # Arrange
+        start = datetime(2024, 1, 1)
+        mock_db_manager.query_stream.return_value = iter([
+            Mock(get_time=lambda i=i: start + timedelta(minutes=i), values={"price": 100.0, "volume": 1})
+            for i in range(3)
+        ])
+        query = sample_time_range_query.model_copy(update={"page_size": 2})
+
+        # Act
+        first = stock_service.query_data_by_time_range(query)
+        mock_db_manager.query_stream.return_value = iter([])
+        second = stock_service.query_data_by_time_range(query.model_copy(update={"cursor": first.next_cursor}))
+
+        # Assert
+        assert first.total_points == 2
+        assert first.next_cursor is not None
+        assert "limit(n: 3)" in mock_db_manager.query_stream.call_args_list[0][0][0]
+        assert "range(start: 2024-01-01T00:01:00Z" in mock_db_manager.query_stream.call_args_list[1][0][0]
+        assert second.total_points == 0
+        assert second.next_cursor is None
 
     def test_query_latest_data_success(self, stock_service, mock_db_manager):
         """Test successful query of latest data."""
         # Arrange
         symbol = "AAPL"
-        mock_result = [
+        mock_records = [
             Mock(
-                records=[
-                    Mock(
-                        get_time=lambda: datetime.utcnow(),
-                        get_value=lambda: 150.50,
-                        values={"volume": 1000}
-                    )
-                ]
+                get_time=lambda: datetime.utcnow(),
+                values={"price": 150.50, "volume": 1000}
             )
         ]
-        mock_db_manager.query.return_value = mock_result
+        mock_db_manager.query_stream.return_value = iter(mock_records)
 
         # Act
         result = stock_service.query_latest_data(symbol)
@@ -129,15 +243,333 @@ class TestStockDataService:
         assert result.symbol == symbol
         assert len(result.data_points) == 1
 
+    def test_query_latest_data_unknown_symbol_is_not_buffered(self, stock_service, mock_db_manager):
+        """Test a symbol without ticks gets an empty answer from one query and no buffer."""
+        # Arrange
+        mock_db_manager.query_stream.return_value = iter([])
+
+        # Act
+        result = stock_service.query_latest_data("NOSUCH", limit=2)
+
+        # Assert
+        mock_db_manager.query_stream.assert_called_once()
+        assert result.total_points == 0
+        assert len(stock_service.tick_store._buffers) == 0
+
+    def test_build_latest_query_tails_before_pivot(self, stock_service):
+        """Test the latest query keeps only the last rows of each field before pivoting."""
+        # Act
+        flux = stock_service._build_latest_query("AAPL", 5)
+
+        # Assert
+        assert flux.index("tail(n: 5)") < flux.index("pivot(")
+
+    def test_query_latest_data_served_from_buffer(self, stock_service, mock_db_manager):
+        """Test latest data comes from the tick buffer after a single backfill."""
+        # Arrange
+        mock_db_manager.query_stream.return_value = iter([
+            Mock(get_time=lambda: datetime(2024, 1, 1), values={"price": 100.0, "volume": 1})
+        ])
+        stock_service.query_latest_data("AAPL", limit=2)
+
+        # Act
+        for price in (150.0, 151.0, 152.0):
+            stock_service.store_data_batch([StockDataPoint(symbol="AAPL", price=price, volume=10)])
+        result = stock_service.query_latest_data("AAPL", limit=2)
+
+        # Assert
+        assert mock_db_manager.query_stream.call_count == 1
+        assert [dp["price"] for dp in result.data_points] == [152.0, 151.0]
+
+    @pytest.mark.asyncio
+    async def test_store_data_batch_async_success(self, stock_service, mock_async_db_manager):
+        """Test async storage of multiple data points."""
+        # Arrange
+        data_points = [
+            StockDataPoint(symbol="AAPL", price=150.50, volume=1000),
+            StockDataPoint(symbol="GOOGL", price=2500.00, volume=500)
+        ]
+
+        # Act
+        await stock_service.store_data_batch_async(data_points)
+
+        # Assert
+        mock_async_db_manager.write_points.assert_awaited_once()
+        assert len(mock_async_db_manager.write_points.call_args[0][0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_store_tick_columns_async(self, stock_service, mock_async_db_manager):
+        """Test tick columns are written as line protocol and update the registry."""
+        # Arrange
+        columns = TickColumns(["AAPL", "MSFT", "AAPL"], [10, 20, 30], [1.0, 2.0, 3.0], [1, 2, 3])
+
+        # Act
+        await stock_service.store_tick_columns_async(columns)
+
+        # Assert
+        records = mock_async_db_manager.write_records.call_args[0][0]
+        assert records.count("\n") == 2
+        assert stock_service.symbol_registry.get("AAPL").point_count == 2
+        assert stock_service.symbol_registry.get("AAPL").last_ns == 30
+
+    @pytest.mark.asyncio
+    async def test_get_available_symbols_async_success(self, stock_service, mock_async_db_manager):
+        """Test async retrieval of available symbols."""
+        # Arrange
+        mock_async_db_manager.query.return_value = [
+            Mock(records=[Mock(values={"_value": "AAPL"}), Mock(values={"_value": "MSFT"})])
+        ]
+
+        # Act
+        symbols = await stock_service.get_available_symbols_async()
+
+        # Assert
+        mock_async_db_manager.query.assert_awaited_once()
+        assert sorted(symbols) == ["AAPL", "MSFT"]
+
+    def test_stream_data_by_time_range_is_lazy(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test streamed data points are decoded one record at a time."""
+        # Arrange
+        consumed = []
+
+        def records():
+            for price in (1.0, 2.0):
+                consumed.append(price)
+                yield Mock(get_time=lambda: datetime.utcnow(), values={"price": price, "volume": 1})
+
+        mock_db_manager.query_stream.return_value = records()
+
+        # Act
+        stream = stock_service.stream_data_by_time_range(sample_time_range_query).points
+        first = next(stream)
+
+        # Assert
+        assert first["price"] == 1.0
+        assert consumed == [1.0]
+        assert [dp["price"] for dp in stream] == [2.0]
+
+    @pytest.mark.asyncio
+    async def test_query_data_by_time_range_async_success(self, stock_service, sample_time_range_query, mock_async_db_manager):
+        """Test async time range query consumes the record stream."""
+        # Arrange
+        async def records(query):
+            yield Mock(get_time=lambda: datetime.utcnow(), values={"price": 10.0, "volume": 5})
+
+        mock_async_db_manager.query_stream = records
+
+        # Act
+        result = await stock_service.query_data_by_time_range_async(sample_time_range_query)
+
+        # Assert
+        assert result.total_points == 1
+        assert result.data_points[0]["volume"] == 5
+
+    @pytest.mark.asyncio
+    async def test_query_candles_async(self, stock_service, sample_time_range_query, mock_async_db_manager):
+        """Test candles decode from one query and are served from cache on repeat."""
+        # Arrange
+        calls = []
+
+        async def records(query):
+            calls.append(query)
+            yield Mock(
+                get_time=lambda: datetime(2024, 1, 1, 10, 0),
+                values={"open": 10.0, "high": 12.0, "low": 9.0, "close": 11.0, "volume": 30, "vwap": 10.5}
+            )
+
+        mock_async_db_manager.query_stream = records
+
+        # Act
+        first = await stock_service.query_candles_async(sample_time_range_query)
+        second = await stock_service.query_candles_async(sample_time_range_query)
+
+        # Assert
+        assert len(calls) == 1
+        assert "fn: first" in calls[0] and "vwap" in calls[0]
+        assert first.total_candles == 1
+        assert second.candles == [{
+            "timestamp": "2024-01-01T10:00:00+00:00",
+            "open": 10.0, "high": 12.0, "low": 9.0, "close": 11.0, "volume": 30, "vwap": 10.5
+        }]
+
+    def test_query_indicators_fetches_warmup(self, stock_service, mock_db_manager):
+        """Test indicators are computed over warm-up windows but only returned inside the range."""
+        # Arrange
+        start = datetime(2024, 1, 1, 10, 0)
+        mock_db_manager.query_stream.return_value = iter([
+            Mock(get_time=lambda i=i: start + timedelta(hours=i - 2), values={"price": 10.0 + i, "volume": 1})
+            for i in range(5)
+        ])
+        query = IndicatorQuery(
+            symbol="AAPL",
+            start_time=start,
+            end_time=start + timedelta(hours=3),
+            interval="1h",
+            indicators=[{"name": "sma", "period": 3}]
+        )
+
+        # Act
+        response = stock_service.query_indicators(query)
+
+        # Assert
+        assert "range(start: 2024-01-01T07:00:00Z" in mock_db_manager.query_stream.call_args[0][0]
+        assert response.timestamps == ["2024-01-01T11:00:00+00:00", "2024-01-01T12:00:00+00:00"]
+        assert response.indicators == {"sma_3": [12.0, 13.0]}
+
+    def test_query_indicators_cost_includes_warmup(self, stock_service, mock_db_manager):
+        """Test the warm-up windows count against the row limit of an indicator query."""
+        # Arrange
+        stock_service.cost_guard = QueryCostGuard(max_rows=110, policy="paginate")
+        mock_db_manager.query_stream.return_value = iter([])
+        start = datetime(2024, 1, 1, 10, 0)
+        query = IndicatorQuery(
+            symbol="AAPL",
+            start_time=start,
+            end_time=start + timedelta(days=1),
+            interval="1m",
+            indicators=[{"name": "sma", "period": 50}]
+        )
+
+        # Act
+        response = stock_service.query_indicators(query)
+
+        # Assert
+        assert "range(start: 2024-01-01T09:10:00Z" in mock_db_manager.query_stream.call_args[0][0]
+        assert response.next_start_time == datetime(2024, 1, 1, 10, 59)
+        assert response.time_range == {"start": start, "end": datetime(2024, 1, 1, 10, 59)}
+
+    def test_query_indicators_rechecks_cost_after_coarsening(self, stock_service, mock_db_manager):
+        """Test the warm-up rebuilt for a coarser interval is checked against the row limit again."""
+        # Arrange
+        stock_service.cost_guard = QueryCostGuard(max_rows=180, policy="coarsen")
+        mock_db_manager.query_stream.return_value = iter([])
+        start = datetime(2024, 1, 1)
+        query = IndicatorQuery(
+            symbol="AAPL",
+            start_time=start,
+            end_time=start + timedelta(hours=4),
+            interval="1m",
+            indicators=[{"name": "ema", "period": 50}]
+        )
+
+        # Act
+        response = stock_service.query_indicators(query)
+
+        # Assert
+        warm_start = mock_db_manager.query_stream.call_args[0][0].split("range(start: ")[1][:20]
+        warm_windows = (start + timedelta(hours=4) - datetime.strptime(warm_start, "%Y-%m-%dT%H:%M:%SZ")).total_seconds()
+        assert response.interval == "15m"
+        assert warm_windows / 900 + 1 <= 180
+
+    def test_query_multi_symbol_single_query(self, stock_service, mock_db_manager):
+        """Test several symbols are read with one grouped query and split per symbol."""
+        # Arrange
+        time = datetime(2024, 1, 1, 10, 0)
+        mock_db_manager.query_stream.return_value = iter([
+            Mock(get_time=lambda: time, values={"symbol": "AAPL", "price": 150.0, "volume": 10}),
+            Mock(get_time=lambda: time, values={"symbol": "MSFT", "price": 300.0, "volume": 20}),
+        ])
+        query = MultiSymbolQuery(symbols=["aapl", "msft", "tsla"], start_time=time, end_time=time, interval="1h")
+
+        # Act
+        response = stock_service.query_multi_symbol(query)
+
+        # Assert
+        mock_db_manager.query_stream.assert_called_once()
+        assert 'r["symbol"] == "AAPL" or r["symbol"] == "MSFT"' in mock_db_manager.query_stream.call_args[0][0]
+        assert [result.symbol for result in response.results] == ["AAPL", "MSFT", "TSLA"]
+        assert response.results[1].data_points[0]["price"] == 300.0
+        assert response.results[2].total_points == 0
+
+    def test_query_multi_symbol_cost_scales_with_symbols(self, stock_service, mock_db_manager):
+        """Test the row limit covers every symbol of a multi-symbol query."""
+        # Arrange
+        stock_service.cost_guard.max_rows = 1000
+        mock_db_manager.query_stream.return_value = iter([])
+        start = datetime(2024, 1, 1)
+        query = MultiSymbolQuery(symbols=["AAPL", "MSFT", "TSLA"], start_time=start, end_time=start + timedelta(days=1))
+
+        # Act
+        response = stock_service.query_multi_symbol(query)
+
+        # Assert
+        assert (response.interval, response.requested_interval) == ("5m", "1m")
+        assert "every: 5m" in mock_db_manager.query_stream.call_args[0][0]
+        assert all(result.interval == "5m" for result in response.results)
+
+    def test_query_multi_symbol_pattern_matched_against_registry(self, stock_service, mock_db_manager):
+        """Test a symbol pattern is matched in Python and never interpolated into Flux."""
+        # Arrange
+        mock_db_manager.query.return_value = [
+            Mock(records=[Mock(values={"_value": "AAPL"}), Mock(values={"_value": "AMZN"}), Mock(values={"_value": "MSFT"})])
+        ]
+        mock_db_manager.query_stream.return_value = iter([])
+        time = datetime(2024, 1, 1, 10, 0)
+        query = MultiSymbolQuery(symbol_pattern="^A(?=[AM])", start_time=time, end_time=time, interval="1h")
+
+        # Act
+        stock_service.query_multi_symbol(query)
+
+        # Assert
+        flux = mock_db_manager.query_stream.call_args[0][0]
+        assert 'r["symbol"] == "AAPL" or r["symbol"] == "AMZN"' in flux
+        assert "=~" not in flux and "(?=" not in flux
+
+    def test_query_multi_symbol_pattern_without_matches_skips_query(self, stock_service, mock_db_manager):
+        """Test a pattern matching no known symbol returns nothing without querying."""
+        # Arrange
+        mock_db_manager.query.return_value = [Mock(records=[Mock(values={"_value": "AAPL"})])]
+        query = MultiSymbolQuery(symbol_pattern='A\\/ or r._measurement != "x"', interval="1h")
+
+        # Act
+        response = stock_service.query_multi_symbol(query)
+
+        # Assert
+        mock_db_manager.query_stream.assert_not_called()
+        assert response.total_symbols == 0
+
+    def test_query_data_by_time_range_uses_cache(self, stock_service, sample_time_range_query, mock_db_manager):
+        """Test repeated queries are served from cache until the symbol is written."""
+        # Arrange
+        mock_db_manager.query_stream.side_effect = lambda query: iter([
+            Mock(get_time=lambda: datetime.utcnow(), values={"price": 150.50, "volume": 1000})
+        ])
+
+        # Act
+        stock_service.query_data_by_time_range(sample_time_range_query)
+        stock_service.query_data_by_time_range(sample_time_range_query)
+        stock_service.store_data_batch([StockDataPoint(symbol="AAPL", price=151.0, volume=10)])
+        stock_service.query_data_by_time_range(sample_time_range_query)
+
+        # Assert
+        assert mock_db_manager.query_stream.call_count == 2
+
+    def test_open_ended_query_fetches_only_tail(self, stock_service, mock_db_manager):
+        """Test a repeated open-ended query only reads windows after the sealed prefix."""
+        # Arrange
+        query = StockDataQuery(symbol="AAPL", interval="1h")
+        mock_db_manager.query_stream.side_effect = lambda flux: iter([])
+
+        # Act
+        stock_service.query_data_by_time_range(query)
+        stock_service.query_cache.clear()
+        stock_service.query_data_by_time_range(query)
+
+        # Assert
+        first, second = [call[0][0] for call in mock_db_manager.query_stream.call_args_list]
+        week_ago = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%dT%H")
+        assert f"range(start: {week_ago}:00:00Z" in first
+        assert week_ago not in second
+
     def test_get_available_symbols_success(self, stock_service, mock_db_manager):
         """Test successful retrieval of available symbols."""
         # Arrange
         mock_result = [
             Mock(
                 records=[
-                    Mock(values={"symbol": "AAPL"}),
-                    Mock(values={"symbol": "GOOGL"}),
-                    Mock(values={"symbol": "AAPL"})  # Duplicate
+                    Mock(values={"_value": "AAPL"}),
+                    Mock(values={"_value": "GOOGL"}),
+                    Mock(values={"_value": "AAPL"})  # Duplicate
                 ]
             )
         ]
@@ -150,20 +582,110 @@ class TestStockDataService:
         assert len(symbols) == 2
         assert "AAPL" in symbols
         assert "GOOGL" in symbols
+        assert "schema.tagValues" in mock_db_manager.query.call_args[0][0]
+
+    def test_query_merges_live_bar(self, stock_service, mock_db_manager):
+        """Test the current window of an open-ended query is served from the live bar."""
+        # Arrange
+        stock_service.live_bars.started_ns = 0
+        stock_service.batch_writer.submit = Mock()
+        now = datetime.utcnow()
+        stock_service.store_data_point(StockDataPoint(symbol="AAPL", price=10.0, volume=5, timestamp=now))
+        stock_service.store_data_point(StockDataPoint(symbol="AAPL", price=20.0, volume=7, timestamp=now))
+        mock_db_manager.query_stream.return_value = iter([])
+
+        # Act
+        response = stock_service.query_data_by_time_range(
+            StockDataQuery(symbol="AAPL", start_time=now - timedelta(hours=1), interval="1h")
+        )
+
+        # Assert
+        assert response.data_points[-1]["price"] == 15.0
+        assert response.data_points[-1]["volume"] == 12
+        assert stock_service.get_current_bar("AAPL", "1h").high == 20.0
+
+    def test_get_market_snapshot(self, stock_service, mock_db_manager):
+        """Test the snapshot is loaded with one query and then kept current by ingest."""
+        # Arrange
+        time = datetime(2024, 1, 1, 10, 0)
+
+        def record(symbol, field, value):
+            return Mock(values={"symbol": symbol}, get_field=lambda: field, get_value=lambda: value, get_time=lambda: time)
+
+        mock_db_manager.query.return_value = [Mock(records=[
+            record("AAPL", "price", 110.0),
+            record("AAPL", "volume", 5),
+            record("AAPL", "reference_price", 100.0),
+            record("MSFT", "price", 300.0),
+            record("MSFT", "volume", 1),
+            record("MSFT", "first_price", 250.0),
+        ])]
+        stock_service.batch_writer.submit = Mock()
+
+        # Act
+        first = stock_service.get_market_snapshot(3600)
+        stock_service.store_data_point(StockDataPoint(symbol="AAPL", price=120.0, volume=7))
+        second = stock_service.get_market_snapshot(3600)
+
+        # Assert
+        mock_db_manager.query.assert_called_once()
+        assert "last()" in mock_db_manager.query.call_args[0][0]
+        assert [(s.symbol, s.change, s.change_percent) for s in first.snapshots] == [("AAPL", 10.0, 10.0), ("MSFT", 50.0, 20.0)]
+        assert (second.snapshots[0].price, second.snapshots[0].volume, second.snapshots[0].change) == (120.0, 7, 20.0)
 
-    def test_store_data_point_database_error(self, stock_service, sample_data_point, mock_db_manager):
-        """Test handling of database error when storing data point."""
+    def test_get_available_symbols_uses_registry(self, stock_service, sample_data_point, mock_db_manager):
+        """Test symbols are loaded once and then maintained by ingest."""
         # Arrange
-        mock_db_manager.write_point.side_effect = Exception("Database error")
+        mock_db_manager.query.return_value = [Mock(records=[Mock(values={"_value": "MSFT"})])]
+        stock_service.get_available_symbols()
+        stock_service.batch_writer.submit = Mock()
+
+        # Act
+        stock_service.store_data_point(sample_data_point)
+        symbols = stock_service.get_available_symbols()
+
+        # Assert
+        mock_db_manager.query.assert_called_once()
+        assert symbols == ["AAPL", "MSFT"]
+        assert stock_service.get_symbol_metadata("TSLA") is None
+
+    def test_get_symbol_metadata_seeds_stored_stats(self, stock_service, mock_db_manager):
+        """Test metadata of a symbol is seeded once from the stored first, last and count."""
+        # Arrange
+        first, last = datetime(2024, 1, 1), datetime(2024, 1, 2)
+        stats_records = [
+            Mock(values={"result": "first"}, get_time=Mock(return_value=first)),
+            Mock(values={"result": "last"}, get_time=Mock(return_value=last)),
+            Mock(values={"result": "count"}, get_value=Mock(return_value=42)),
+        ]
+        mock_db_manager.query.side_effect = [
+            [Mock(records=[Mock(values={"_value": "MSFT"})])],
+            [Mock(records=stats_records)],
+        ]
+
+        # Act
+        metadata = stock_service.get_symbol_metadata("MSFT")
+        again = stock_service.get_symbol_metadata("MSFT")
+
+        # Assert
+        assert mock_db_manager.query.call_count == 2
+        assert 'yield(name: "count")' in mock_db_manager.query.call_args[0][0]
+        assert (metadata.first_timestamp, metadata.last_timestamp, metadata.point_count) == (first, last, 42)
+        assert again == metadata
+
+    def test_store_data_point_queue_full(self, stock_service, sample_data_point):
+        """Test backpressure when the write queue is full."""
+        # Arrange
+        stock_service.batch_writer.submit = Mock(side_effect=WriteQueueFullError("Write queue is full"))
 
         # Act & Assert
-        with pytest.raises(RuntimeError, match="Failed to write point to InfluxDB"):
+        with pytest.raises(WriteQueueFullError, match="Write queue is full"):
             stock_service.store_data_point(sample_data_point)
 
     def test_query_data_database_error(self, stock_service, sample_time_range_query, mock_db_manager):
         """Test handling of database error when querying data."""
         # Arrange
-        mock_db_manager.query.side_effect = Exception("Database error")
+        mock_db_manager.query_stream.side_effect = RuntimeError("Failed to execute query: Database error")
 
         # Act & Assert
         with pytest.raises(RuntimeError, match="Failed to execute query"):
@@ -178,6 +700,9 @@ class TestStockDataService:
         assert "AAPL" in query
         assert "1m" in query
         assert "aggregateWindow" in query
+        assert "fn: mean" in query
+        assert "fn: sum" in query
+        assert 'columnKey: ["_field"]' in query
 
     def test_build_flux_query_without_times(self, stock_service):
         """Test building Flux query without start and end times."""
@@ -192,6 +717,26 @@ class TestStockDataService:
         assert "1h" in query
         assert "aggregateWindow" in query
 
+    def test_build_flux_query_routes_to_rollup(self, stock_service):
+        """Test long coarse queries read old windows from the rollup bucket."""
+        # Arrange
+        stock_service.rollups.ready = True
+        stock_service.rollups.coverage = {level.name: 0 for level in stock_service.rollups.levels}
+        query_params = TimeRangeQuery(
+            symbol="AAPL",
+            start_time=datetime.utcnow() - timedelta(days=30),
+            end_time=datetime.utcnow(),
+            interval="1d"
+        )
+
+        # Act
+        query = stock_service._build_flux_query(query_params)
+
+        # Assert
+        assert 'from(bucket: "stock_data_1d")' in query
+        assert 'from(bucket: "stock_data")' in query
+        assert "r.price_sum / float(v: r.price_count)" in query
+
     def test_process_query_results_empty(self, stock_service):
         """Test processing empty query results."""
         # Act
@@ -0,0 +1,61 @@
+"""Unit tests for the symbol registry."""
+
+from app.services.symbol_registry import SymbolRegistry
+
+
+class TestSymbolRegistry:
+    """Test cases for SymbolRegistry."""
+
+    def test_needs_load_until_seeded(self):
+        """Test the registry asks to be seeded once and then not again."""
+        # Arrange
+        registry = SymbolRegistry(resync_seconds=60)
+
+        # Act
+        before = registry.needs_load
+        registry.load(["MSFT", "AAPL"])
+
+        # Assert
+        assert before is True
+        assert registry.needs_load is False
+        assert registry.symbols() == ["AAPL", "MSFT"]
+
+    def test_needs_load_after_resync_interval(self):
+        """Test the seed expires after the resync interval."""
+        # Arrange
+        registry = SymbolRegistry(resync_seconds=0)
+        registry.load(["AAPL"])
+
+        # Act & Assert
+        assert registry.needs_load is True
+
+    def test_record_tracks_stats(self):
+        """Test ingested ticks add symbols and update their stats."""
+        # Arrange
+        registry = SymbolRegistry(resync_seconds=60)
+        registry.load(["AAPL"])
+
+        # Act
+        for timestamp in (20, 10, 30):
+            registry.record("TSLA", timestamp)
+        stats = registry.get("TSLA")
+
+        # Assert
+        assert registry.symbols() == ["AAPL", "TSLA"]
+        assert (stats.first_ns, stats.last_ns, stats.point_count) == (10, 30, 3)
+        assert registry.get("AAPL").point_count == 0
+        assert len(registry) == 2
+
+    def test_seed_merges_stored_stats(self):
+        """Test seeding widens the timestamps and keeps the larger point count."""
+        # Arrange
+        registry = SymbolRegistry(resync_seconds=60)
+        registry.record_many("AAPL", 50, 60, 2)
+
+        # Act
+        registry.seed("AAPL", 10, 55, 40)
+        stats = registry.get("AAPL")
+
+        # Assert
+        assert (stats.first_ns, stats.last_ns, stats.point_count) == (10, 60, 40)
+        assert stats.seeded is True
@@ -0,0 +1,115 @@
+"""Unit tests for the latest-tick ring buffers."""
+
+from app.models.series import StockSeries
+from app.services.tick_buffer import LatestTickStore, TickRingBuffer
+
+
+class TestTickBuffer:
+    """Test cases for TickRingBuffer and LatestTickStore."""
+
+    def test_ring_buffer_keeps_newest_ticks(self):
+        """Test the oldest ticks are overwritten once full."""
+        # Arrange
+        buffer = TickRingBuffer(3)
+
+        # Act
+        for i in range(5):
+            buffer.append(i, float(i), i)
+        snapshot = buffer.snapshot()
+
+        # Assert
+        assert len(buffer) == 3
+        assert snapshot.timestamps.tolist() == [2, 3, 4]
+
+    def test_snapshot_sorts_out_of_order_ticks(self):
+        """Test late ticks are returned in timestamp order."""
+        # Arrange
+        buffer = TickRingBuffer(4)
+        for timestamp in (10, 30, 20):
+            buffer.append(timestamp, 1.0, 1)
+
+        # Act & Assert
+        assert buffer.snapshot().timestamps.tolist() == [10, 20, 30]
+
+    def test_historical_ticks_do_not_evict_recent_ones(self):
+        """Test ticks older than a full buffer are dropped, not kept by arrival."""
+        # Arrange
+        buffer = TickRingBuffer(3)
+        for timestamp in (100, 200, 300):
+            buffer.append(timestamp, 1.0, 1)
+
+        # Act
+        for timestamp in (1, 2, 250):
+            buffer.append(timestamp, 2.0, 1)
+        buffer.append(400, 3.0, 1)
+
+        # Assert
+        assert buffer.snapshot().timestamps.tolist() == [250, 300, 400]
+
+    def test_record_series_keeps_newest_by_timestamp(self):
+        """Test a historical batch does not push recent ticks out of the store."""
+        # Arrange
+        store = LatestTickStore(capacity=2, resync_seconds=60)
+        store.backfill("AAPL", StockSeries([500, 600], [5.0, 6.0], [1, 1]))
+
+        # Act
+        store.record_series("AAPL", StockSeries([30, 10, 20], [1.0, 1.0, 1.0], [1, 1, 1]))
+
+        # Assert
+        assert store.latest("AAPL", 2).timestamps.tolist() == [600, 500]
+
+    def test_latest_requires_backfill(self):
+        """Test a buffer is not served until it has been backfilled."""
+        # Arrange
+        store = LatestTickStore(capacity=10, resync_seconds=60)
+        store.record("AAPL", 5, 1.0, 1)
+
+        # Act & Assert
+        assert store.latest("AAPL", 5) is None
+        store.backfill("AAPL", StockSeries.empty())
+        assert store.latest("AAPL", 5).timestamps.tolist() == [5]
+
+    def test_backfill_merges_with_recorded_ticks(self):
+        """Test backfilled history merges with ticks recorded meanwhile."""
+        # Arrange
+        store = LatestTickStore(capacity=3, resync_seconds=60)
+        store.record("AAPL", 4, 40.0, 4)
+        store.record("AAPL", 3, 99.0, 3)
+
+        # Act
+        store.backfill("AAPL", StockSeries([1, 2, 3], [10.0, 20.0, 30.0], [1, 2, 3]))
+        latest = store.latest("AAPL", 3)
+
+        # Assert
+        assert latest.timestamps.tolist() == [4, 3, 2]
+        assert latest.prices.tolist() == [40.0, 99.0, 20.0]
+
+    def test_backfill_expires_after_resync_interval(self):
+        """Test backfills are redone after the resync interval."""
+        # Arrange
+        store = LatestTickStore(capacity=3, resync_seconds=0)
+        store.backfill("AAPL", StockSeries([1], [1.0], [1]))
+
+        # Act & Assert
+        assert store.latest("AAPL", 1) is None
+
+    def test_limit_beyond_capacity_is_not_served(self):
+        """Test limits larger than the buffer fall through to the database."""
+        # Arrange
+        store = LatestTickStore(capacity=3, resync_seconds=60)
+        store.backfill("AAPL", StockSeries([1], [1.0], [1]))
+
+        # Act & Assert
+        assert store.latest("AAPL", 4) is None
+
+    def test_empty_backfill_of_unknown_symbol_keeps_no_state(self):
+        """Test backfilling a symbol without ticks allocates no buffer."""
+        # Arrange
+        store = LatestTickStore(capacity=3, resync_seconds=60)
+
+        # Act
+        store.backfill("NOSUCH", StockSeries.empty())
+
+        # Assert
+        assert store.latest("NOSUCH", 1) is None
+        assert "NOSUCH" not in store._buffers and "NOSUCH" not in store._backfilled_at
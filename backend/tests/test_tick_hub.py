@@ -0,0 +1,79 @@
+"""Unit tests for the live tick pub/sub hub."""
+
+import pytest
+
+from app.models.series import StockSeries
+from app.services.tick_hub import TickHub, ticks_to_dicts
+
+
+class TestTickHub:
+    """Test cases for TickHub and Subscription."""
+
+    @pytest.mark.asyncio
+    async def test_publish_reaches_matching_subscribers(self):
+        """Test ticks go to subscribers of their symbol and to wildcard subscribers."""
+        # Arrange
+        hub = TickHub()
+        aapl = hub.subscribe(["AAPL"], max_size=10, policy="drop_oldest")
+        everything = hub.subscribe(None, max_size=10, policy="drop_oldest")
+
+        # Act
+        hub.publish("AAPL", 1, 150.0, 10)
+        hub.publish("MSFT", 2, 300.0, 20)
+
+        # Assert
+        assert [tick[0] for tick in await aapl.get(timeout=1)] == ["AAPL"]
+        assert [tick[0] for tick in await everything.get(timeout=1)] == ["AAPL", "MSFT"]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_bounds_queue(self):
+        """Test a slow subscriber keeps only the newest ticks."""
+        # Arrange
+        hub = TickHub()
+        subscription = hub.subscribe(["AAPL"], max_size=2, policy="drop_oldest")
+
+        # Act
+        hub.publish_series("AAPL", StockSeries([1, 2, 3], [1.0, 2.0, 3.0], [1, 1, 1]))
+
+        # Assert
+        assert [tick[1] for tick in await subscription.get(timeout=1)] == [2, 3]
+        assert subscription.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_keeps_latest_per_symbol(self):
+        """Test the coalesce policy delivers only the newest tick per symbol."""
+        # Arrange
+        hub = TickHub()
+        subscription = hub.subscribe(["AAPL", "MSFT"], max_size=10, policy="coalesce")
+
+        # Act
+        hub.publish("AAPL", 1, 1.0, 1)
+        hub.publish("MSFT", 2, 2.0, 1)
+        hub.publish("AAPL", 3, 3.0, 1)
+
+        # Assert
+        assert sorted(await subscription.get(timeout=1)) == [("AAPL", 3, 3.0, 1), ("MSFT", 2, 2.0, 1)]
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_delivery(self):
+        """Test an unsubscribed subscriber receives nothing."""
+        # Arrange
+        hub = TickHub()
+        subscription = hub.subscribe(["AAPL"], max_size=10, policy="drop_oldest")
+        hub.unsubscribe(subscription)
+
+        # Act
+        hub.publish("AAPL", 1, 1.0, 1)
+
+        # Assert
+        assert await subscription.get(timeout=0.01) == []
+
+    def test_ticks_to_dicts(self):
+        """Test ticks serialize like data points with a symbol."""
+        # Act
+        payload = ticks_to_dicts([("AAPL", 1_704_067_200_000_000_000, 150.5, 10)])
+
+        # Assert
+        assert payload == [
+            {"symbol": "AAPL", "timestamp": "2024-01-01T00:00:00+00:00", "price": 150.5, "volume": 10}
+        ]
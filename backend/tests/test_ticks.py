@@ -0,0 +1,83 @@
+"""Unit tests for columnar tick validation and encoding."""
+
+import pytest
+
+from app.models.ticks import TickColumns, validate_tick_columns
+
+
+class TestTickColumns:
+    """Test cases for validate_tick_columns and TickColumns."""
+
+    def test_validate_applies_data_point_rules(self):
+        """Test rows are checked, normalized and rejected like StockDataPoint."""
+        # Act
+        columns, rejected = validate_tick_columns(
+            ["aapl", "MSFT1", "msft", "goog", "tsla"],
+            [150.456, 10.0, 0.0, 20.0, 30.0],
+            [100, 1, 1, -5, 0],
+            [1, 2, 3, 4, 5],
+            precision="s"
+        )
+
+        # Assert
+        assert rejected.tolist() == [1, 2, 3]
+        assert columns.symbols.tolist() == ["AAPL", "TSLA"]
+        assert columns.prices.tolist() == [150.46, 30.0]
+        assert columns.timestamps.tolist() == [1_000_000_000, 5_000_000_000]
+
+    def test_validate_gives_missing_timestamps_distinct_values(self):
+        """Test rows without timestamps do not share one, even across batches."""
+        # Act
+        first, _ = validate_tick_columns(["AAPL"] * 3, [1.0, 2.0, 3.0], [1, 1, 1])
+        second, _ = validate_tick_columns(["AAPL"] * 3, [1.0, 2.0, 3.0], [1, 1, 1])
+
+        # Assert
+        timestamps = first.timestamps.tolist() + second.timestamps.tolist()
+        assert len(set(timestamps)) == 6
+        assert timestamps == sorted(timestamps)
+
+    def test_validate_rejects_mismatched_lengths(self):
+        """Test columns of different lengths are refused."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="Column lengths must match"):
+            validate_tick_columns(["AAPL"], [1.0, 2.0], [1])
+
+    def test_to_line_protocol(self):
+        """Test encoding matches the line protocol written for data points."""
+        # Arrange
+        columns = TickColumns(["AAPL", "MSFT"], [10, 20], [150.5, 300.0], [1000, 0])
+
+        # Act
+        encoded = columns.to_line_protocol()
+
+        # Assert
+        assert encoded == (
+            "stock_data,symbol=AAPL price=150.5,volume=1000i 10\n"
+            "stock_data,symbol=MSFT price=300.0,volume=0i 20"
+        )
+
+    def test_by_symbol_groups_in_arrival_order(self):
+        """Test rows are grouped per symbol without reordering."""
+        # Arrange
+        columns = TickColumns(["MSFT", "AAPL", "MSFT"], [30, 20, 10], [1.0, 2.0, 3.0], [1, 2, 3])
+
+        # Act
+        groups = {symbol: series.timestamps.tolist() for symbol, series in columns.by_symbol()}
+
+        # Assert
+        assert groups == {"AAPL": [20], "MSFT": [30, 10]}
+
+    def test_validate_rejects_int64_overflow(self):
+        """Test timestamps that would wrap when scaled and oversized volumes are rejected."""
+        # Act
+        columns, rejected = validate_tick_columns(
+            ["AAPL", "AAPL", "AAPL"],
+            [1.0, 1.0, 1.0],
+            [1, 10 ** 20, 1],
+            [5, 5, 2 * 10 ** 12],
+            precision="s"
+        )
+
+        # Assert
+        assert rejected.tolist() == [1, 2]
+        assert columns.timestamps.tolist() == [5_000_000_000]
@@ -0,0 +1,91 @@
+"""Unit tests for the incremental window cache."""
+
+from app.models.series import StockSeries
+from app.services.window_cache import WindowCache
+
+NS = 1_000_000_000
+MINUTE = 60 * NS
+
+
+def minute_series(start_minute, end_minute):
+    """Create one row per minute with window stops in (start, end]."""
+    stops = [m * MINUTE for m in range(start_minute + 1, end_minute + 1)]
+    return StockSeries(stops, [float(m) for m in range(len(stops))], [1] * len(stops))
+
+
+def make_cache():
+    """Create a cache with a 30 second settle lag."""
+    return WindowCache(max_bytes=1 << 20, settle_seconds=30, max_age_seconds=600, retention_seconds=86400)
+
+
+class TestWindowCache:
+    """Test cases for WindowCache."""
+
+    def test_first_read_fetches_everything(self):
+        """Test a cold lookup fetches from the requested start."""
+        # Arrange
+        cache = make_cache()
+
+        # Act
+        prefix, fetch_from = cache.lookup("AAPL", MINUTE, 0)
+
+        # Assert
+        assert len(prefix) == 0
+        assert fetch_from == 0
+
+    def test_second_read_fetches_only_tail(self):
+        """Test sealed windows are reused and only the tail is fetched."""
+        # Arrange
+        cache = make_cache()
+        now = 100 * MINUTE + 10 * NS
+        first = cache.store("AAPL", MINUTE, 0, 0, StockSeries.empty(), minute_series(0, 101), now)
+
+        # Act
+        prefix, fetch_from = cache.lookup("AAPL", MINUTE, 0)
+        later = now + 2 * MINUTE
+        result = cache.store("AAPL", MINUTE, 0, fetch_from, prefix, minute_series(99, 103), later)
+
+        # Assert
+        assert len(first) == 101
+        assert fetch_from == 99 * MINUTE
+        assert len(prefix) == 99
+        assert result.timestamps.tolist() == [m * MINUTE for m in range(1, 104)]
+
+    def test_lookup_trims_prefix_to_start(self):
+        """Test a later start only returns cached windows after it."""
+        # Arrange
+        cache = make_cache()
+        cache.store("AAPL", MINUTE, 0, 0, StockSeries.empty(), minute_series(0, 60), 60 * MINUTE + 31 * NS)
+
+        # Act
+        prefix, fetch_from = cache.lookup("AAPL", MINUTE, 30 * MINUTE)
+
+        # Assert
+        assert prefix.timestamps[0] == 31 * MINUTE
+        assert fetch_from == 60 * MINUTE
+
+    def test_late_write_unseals_windows(self):
+        """Test a write inside sealed windows forces them to be re-fetched."""
+        # Arrange
+        cache = make_cache()
+        cache.store("AAPL", MINUTE, 0, 0, StockSeries.empty(), minute_series(0, 60), 60 * MINUTE + 31 * NS)
+
+        # Act
+        cache.invalidate("AAPL", 40 * MINUTE + 5 * NS)
+        prefix, fetch_from = cache.lookup("AAPL", MINUTE, 0)
+
+        # Assert
+        assert fetch_from == 40 * MINUTE
+        assert prefix.timestamps[-1] == 40 * MINUTE
+
+    def test_live_write_keeps_sealed_windows(self):
+        """Test a write after the sealed boundary does not touch the cache."""
+        # Arrange
+        cache = make_cache()
+        cache.store("AAPL", MINUTE, 0, 0, StockSeries.empty(), minute_series(0, 60), 60 * MINUTE + 31 * NS)
+
+        # Act
+        cache.invalidate("AAPL", 60 * MINUTE + 20 * NS)
+
+        # Assert
+        assert cache.lookup("AAPL", MINUTE, 0)[1] == 60 * MINUTE
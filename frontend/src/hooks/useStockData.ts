@@ -1,6 +1,15 @@
+import { useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "react-query";
 import { stockApi } from "../services/api";
-import { StockDataPoint, StockDataBatch, TimeRangeQuery } from "../types/stock";
+import {
+  StockDataPoint,
+  StockDataBatch,
+  StockDataResponse,
+  TimeRangeQuery,
+} from "../types/stock";
+
+// Roughly the chart's width in pixels; the backend downsamples to this many points
+const CHART_MAX_POINTS = 1000;
 
 export const useStockData = () => {
   const queryClient = useQueryClient();
@@ -16,10 +25,44 @@ export const useStockData = () => {
     });
   };
 
-  // Query for latest data
+  // Query for latest data, kept current by pushed ticks; refetched when the
+  // tick stream (re)connects and slowly polled for writes that bypass the API
   const useLatestData = (symbol: string, limit: number = 100) => {
+    const queryKey = ["latestData", symbol, limit];
+
+    useEffect(() => {
+      if (!symbol) {
+        return;
+      }
+      return stockApi.subscribeTicks(
+        [symbol],
+        (tick) => {
+          queryClient.setQueryData<StockDataResponse | undefined>(
+            queryKey,
+            (current) => {
+              if (!current) {
+                return current;
+              }
+              const { timestamp, price, volume } = tick;
+              const dataPoints = [
+                { timestamp, price, volume },
+                ...current.data_points,
+              ].slice(0, limit);
+              return {
+                ...current,
+                data_points: dataPoints,
+                total_points: dataPoints.length,
+              };
+            }
+          );
+        },
+        () => queryClient.invalidateQueries(queryKey)
+      );
+      // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [symbol, limit]);
+
     return useQuery(
-      ["latestData", symbol, limit],
+      queryKey,
       async () => {
         const response = await stockApi.getLatestData(symbol, limit);
         if (response.error) {
@@ -29,7 +72,8 @@ export const useStockData = () => {
       },
       {
         enabled: !!symbol,
-        refetchInterval: 30000, // Refetch every 30 seconds
+        staleTime: Infinity,
+        refetchInterval: 60000, // Catch up on writes that bypass the tick stream
       }
     );
   };
@@ -39,7 +83,10 @@ export const useStockData = () => {
     return useQuery(
       ["timeRangeData", query],
       async () => {
-        const response = await stockApi.queryData(query);
+        const response = await stockApi.queryData({
+          max_points: CHART_MAX_POINTS,
+          ...query,
+        });
         if (response.error) {
           throw new Error(response.error);
         }
@@ -106,6 +106,24 @@ export const stockApi = {
     }
   },
 
+  // Subscribe to live ticks pushed as server-sent events; onOpen also fires
+  // after every automatic reconnect, when ticks may have been missed
+  subscribeTicks: (
+    symbols: string[],
+    onTick: (tick: StockDataPoint) => void,
+    onOpen?: () => void
+  ): (() => void) => {
+    const params = new URLSearchParams({ symbols: symbols.join(",") });
+    const source = new EventSource(
+      `${API_BASE_URL}/api/v1/stocks/stream/ticks?${params}`
+    );
+    source.onmessage = (event) => onTick(JSON.parse(event.data));
+    if (onOpen) {
+      source.onopen = () => onOpen();
+    }
+    return () => source.close();
+  },
+
   // Health check
   healthCheck: async (): Promise<ApiResponse<any>> => {
     try {
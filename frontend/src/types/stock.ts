@@ -14,6 +14,9 @@ export interface TimeRangeQuery {
   start_time?: string;
   end_time?: string;
   interval: string;
+  max_points?: number;
+  page_size?: number;
+  cursor?: string;
 }
 
 export interface StockDataResponse {
@@ -29,6 +32,9 @@ export interface StockDataResponse {
     end: string;
   };
   interval: string;
+  requested_interval?: string;
+  next_start_time?: string;
+  next_cursor?: string;
 }
 
 export interface ChartDataPoint {